@@ -1,24 +1,412 @@
+import asyncio
+import bisect
+import hashlib
+import logging
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
+    AsyncEngine,
     AsyncSession,
 )
 
 from settings import settings
+from shards.models import UserShard
+
+# asyncpg готовит каждый запрос как именованный prepared statement и хранит
+# их в LRU-кэше соединения: повторный запрос не проходит PREPARE заново
+CONNECT_ARGS = {
+    "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+}
 
 if settings.TESTING:
     async_engine = create_async_engine(
-        settings.DB_URL_testing, echo=False, poolclass=NullPool
+        settings.DB_URL_testing,
+        echo=False,
+        poolclass=NullPool,
+        connect_args=CONNECT_ARGS,
     )
 else:
     async_engine = create_async_engine(
         settings.DB_URL,
         pool_recycle=3600,
-        echo=True,
         future=True,
+        connect_args=CONNECT_ARGS,
     )
 
 async_session = async_sessionmaker(
     async_engine, class_=AsyncSession, expire_on_commit=False
 )
+
+# Запрос, выполнивший запись, дальше читает только с основного сервера
+_primary_only: ContextVar[bool] = ContextVar("primary_only", default=False)
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class Replica:
+    """
+    Реплика для чтения с отслеживанием доступности и отставания.
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        """
+        Инициализация реплики.
+        Args:
+            engine (AsyncEngine): Движок SQLAlchemy реплики.
+        """
+        self.engine = engine
+        self.session = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.down_until = 0.0
+        self.lag = 0.0
+        self.lag_checked_at = 0.0
+
+    @property
+    def usable(self) -> bool:
+        """Реплика не помечена недоступной и либо не отстаёт, либо пора
+        заново проверить её отставание."""
+        now = time.monotonic()
+        if now < self.down_until:
+            return False
+        return (
+            self.lag <= settings.REPLICA_MAX_STALENESS
+            or now - self.lag_checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL
+        )
+
+    def mark_down(self) -> None:
+        """Исключает реплику из чтения на REPLICA_RETRY_INTERVAL секунд."""
+        self.down_until = time.monotonic() + settings.REPLICA_RETRY_INTERVAL
+
+    async def open(self) -> Optional[AsyncSession]:
+        """
+        Открывает сессию на реплике, проверяя отставание не чаще
+        REPLICA_LAG_CHECK_INTERVAL секунд.
+        Returns:
+            Optional[AsyncSession]: Сессия или None, если реплика недоступна
+                или отстаёт больше REPLICA_MAX_STALENESS секунд.
+        """
+        session = self.session()
+        try:
+            connection = await session.connection()
+            now = time.monotonic()
+            if now - self.lag_checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL:
+                self.lag = float(await connection.scalar(REPLICA_LAG_QUERY) or 0)
+                self.lag_checked_at = now
+        except (OSError, DBAPIError) as e:
+            logging.warning("Реплика %s недоступна: %s", self.engine.url.host, e)
+            await session.close()
+            self.mark_down()
+            return None
+        if self.lag > settings.REPLICA_MAX_STALENESS:
+            await session.close()
+            return None
+        return session
+
+
+def create_replicas(urls: List[str]) -> List[Replica]:
+    """Создаёт реплики для чтения по списку DSN
+
+    Args:
+        urls (List[str]): DSN реплик
+
+    Returns:
+        List[Replica]: Реплики
+    """
+    return [
+        Replica(
+            create_async_engine(
+                url,
+                pool_recycle=3600,
+                future=True,
+                connect_args={
+                    **CONNECT_ARGS,
+                    "timeout": settings.REPLICA_CONNECT_TIMEOUT,
+                },
+            )
+        )
+        for url in urls
+    ]
+
+
+replicas: List[Replica] = (
+    [] if settings.TESTING else create_replicas(settings.POSTGRES_REPLICA_URLS)
+)
+
+
+class Shard:
+    """
+    Шард: основной сервер и его реплики для чтения.
+    """
+
+    def __init__(
+        self, index: int, engine: AsyncEngine, shard_replicas: List[Replica]
+    ):
+        """
+        Инициализация шарда.
+        Args:
+            index (int): Номер шарда.
+            engine (AsyncEngine): Движок SQLAlchemy основного сервера шарда.
+            shard_replicas (List[Replica]): Реплики шарда.
+        """
+        self.index = index
+        self.engine = engine
+        self.session = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        self.replicas = shard_replicas
+
+    async def open_replica(self) -> Optional[AsyncSession]:
+        """
+        Открывает сессию на случайной доступной реплике шарда.
+        Returns:
+            Optional[AsyncSession]: Сессия или None, если подходящей реплики нет.
+        """
+        for replica in random.sample(self.replicas, len(self.replicas)):
+            if replica.usable:
+                session = await replica.open()
+                if session is not None:
+                    return session
+        return None
+
+
+def create_shards() -> List[Shard]:
+    """Создаёт шарды: нулевой шард - основная БД, остальные из
+    POSTGRES_SHARD_URLS (DSN основного сервера и реплик через "|")
+
+    Returns:
+        List[Shard]: Шарды
+    """
+    created = [Shard(0, async_engine, replicas)]
+    if settings.TESTING:
+        return created
+    for index, urls in enumerate(settings.POSTGRES_SHARD_URLS, start=1):
+        primary, *replica_urls = urls.split("|")
+        engine = create_async_engine(
+            primary, pool_recycle=3600, future=True, connect_args=CONNECT_ARGS
+        )
+        created.append(Shard(index, engine, create_replicas(replica_urls)))
+    return created
+
+
+shards: List[Shard] = create_shards()
+
+# Пространство advisory lock для блокировки данных пользователя при переносе
+SHARD_LOCK_CLASS = 31
+
+
+class ShardRouter:
+    """
+    Маршрутизатор пользователей по шардам: согласованное хэширование
+    user_id с переопределением через таблицу-справочник user_shards
+    на нулевом шарде для перенесённых пользователей.
+
+    Кольцо строится по первым ring_size шардам: новые шарды не меняют
+    размещение существующих пользователей и получают их только через
+    справочник. Перед изменением ring_size существующих пользователей нужно
+    закрепить в справочнике (manage.py shards pin).
+    """
+
+    VIRTUAL_NODES = 64
+
+    def __init__(
+        self,
+        shard_list: List[Shard],
+        ring_size: Optional[int] = None,
+        cache_size: int = 100_000,
+    ):
+        """
+        Инициализация маршрутизатора.
+        Args:
+            shard_list (List[Shard]): Шарды.
+            ring_size (Optional[int]): Количество шардов на кольце, по
+                умолчанию все.
+            cache_size (int): Количество закэшированных записей справочника.
+        """
+        self.shards = shard_list
+        ring = sorted(
+            (self.__hash(f"shard-{shard.index}-{node}"), shard.index)
+            for shard in shard_list[:ring_size]
+            for node in range(self.VIRTUAL_NODES)
+        )
+        self._ring_keys = [key for key, _ in ring]
+        self._ring_shards = [index for _, index in ring]
+        self.cache_size = cache_size
+        self._directory: "OrderedDict[int, Tuple[Optional[int], float]]" = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def __hash(value: str) -> int:
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], "big")
+
+    def hashed(self, user_id: int) -> Shard:
+        """
+        Возвращает шард пользователя по кольцу согласованного хэширования.
+        Args:
+            user_id (int): Идентификатор пользователя.
+        Returns:
+            Shard: Шард.
+        """
+        position = bisect.bisect(self._ring_keys, self.__hash(str(user_id)))
+        return self.shards[self._ring_shards[position % len(self._ring_keys)]]
+
+    async def locate(self, user_id: int, fresh: bool = False) -> Shard:
+        """
+        Возвращает шард пользователя с учётом справочника user_shards.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            fresh (bool): Не использовать закэшированную запись справочника.
+        Returns:
+            Shard: Шард.
+        """
+        if len(self.shards) == 1:
+            return self.shards[0]
+        cached = self._directory.get(user_id)
+        now = time.monotonic()
+        expired = cached is None or now - cached[1] > settings.SHARD_DIRECTORY_CACHE_TTL
+        if fresh or expired:
+            async with self.shards[0].session() as session:
+                index = await session.scalar(
+                    select(UserShard.shard).where(UserShard.user_id == user_id)
+                )
+            cached = self._directory[user_id] = (index, now)
+            while len(self._directory) > self.cache_size:
+                self._directory.popitem(last=False)
+        self._directory.move_to_end(user_id)
+        if cached[0] is None:
+            return self.hashed(user_id)
+        return self.shards[cached[0]]
+
+    def forget(self, user_id: int) -> None:
+        """
+        Удаляет закэшированную запись справочника пользователя.
+        Args:
+            user_id (int): Идентификатор пользователя.
+        """
+        self._directory.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Удаляет все закэшированные записи справочника."""
+        self._directory.clear()
+
+
+shard_router = ShardRouter(
+    shards, settings.SHARD_RING_SIZE, settings.SHARD_DIRECTORY_CACHE_SIZE
+)
+
+
+@asynccontextmanager
+async def write_session(user_id: int) -> AsyncIterator[AsyncSession]:
+    """
+    Сессия на основном сервере шарда пользователя для записи. Последующие
+    чтения в рамках того же запроса тоже выполняются на основном сервере.
+
+    При нескольких шардах сессия удерживает разделяемую блокировку данных
+    пользователя и перепроверяет шард по справочнику, чтобы запись не попала
+    на шард, с которого пользователь переносится.
+    """
+    _primary_only.set(True)
+    shard = await shard_router.locate(user_id)
+    session = shard.session()
+    while len(shards) > 1:
+        await session.execute(
+            select(func.pg_advisory_xact_lock_shared(SHARD_LOCK_CLASS, user_id))
+        )
+        actual = await shard_router.locate(user_id, fresh=True)
+        if actual is shard:
+            break
+        await session.close()
+        shard = actual
+        session = shard.session()
+    async with session:
+        yield session
+
+
+@asynccontextmanager
+async def read_session(user_id: int) -> AsyncIterator[AsyncSession]:
+    """
+    Сессия для чтения на шарде пользователя: на случайной доступной реплике,
+    отстающей не больше REPLICA_MAX_STALENESS секунд, иначе на основном
+    сервере.
+    """
+    shard = await shard_router.locate(user_id)
+    session = None
+    if not _primary_only.get():
+        session = await shard.open_replica()
+    if session is None:
+        session = shard.session()
+    async with session:
+        yield session
+
+
+def all_engines() -> List[AsyncEngine]:
+    """Возвращает движки основных серверов и реплик всех шардов
+
+    Returns:
+        List[AsyncEngine]: Движки
+    """
+    engines = []
+    for shard in shards:
+        engines.append(shard.engine)
+        engines.extend(replica.engine for replica in shard.replicas)
+    return engines
+
+
+async def warm_up(connections: int) -> int:
+    """
+    Заранее открывает соединения пулов всех движков, чтобы первые запросы
+    воркера не ждали установки соединений. Недоступные серверы только
+    логируются.
+    Args:
+        connections (int): Количество соединений на движок, не больше
+            размера пула.
+    Returns:
+        int: Количество открытых соединений.
+    """
+
+    async def open_connections(engine: AsyncEngine) -> int:
+        count = min(connections, getattr(engine.pool, "size", lambda: 0)())
+        opened = await asyncio.gather(
+            *(engine.connect().start() for _ in range(count)), return_exceptions=True
+        )
+        errors = [elem for elem in opened if isinstance(elem, BaseException)]
+        if errors:
+            logging.warning(
+                "Не удалось открыть соединения с %s: %s", engine.url.host, errors[0]
+            )
+        for connection in opened:
+            if not isinstance(connection, BaseException):
+                await connection.close()
+        return len(opened) - len(errors)
+
+    results = await asyncio.gather(*(open_connections(e) for e in all_engines()))
+    return sum(results)
+
+
+async def dispose_engines() -> None:
+    """Закрывает соединения пулов всех движков при остановке воркера."""
+    await asyncio.gather(*(engine.dispose() for engine in all_engines()))
+
+
+def reset_after_fork() -> None:
+    """
+    Сбрасывает пулы, унаследованные от главного процесса gunicorn при
+    preload_app, не закрывая соединения родителя.
+    """
+    for engine in all_engines():
+        engine.sync_engine.dispose(close=False)
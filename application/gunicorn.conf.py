@@ -0,0 +1,19 @@
+import gc
+
+# Приложение импортируется один раз в главном процессе, воркеры получают
+# его модули через fork без повторного импорта
+preload_app = True
+
+
+def when_ready(server):
+    # Объекты, созданные при импорте, переносятся в постоянное поколение:
+    # сборщик мусора воркеров не пишет в их заголовки, и страницы памяти
+    # остаются общими с главным процессом (copy-on-write)
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from database import reset_after_fork
+
+    reset_after_fork()
@@ -1,7 +1,10 @@
 from typing import Optional, TYPE_CHECKING
-from datetime import datetime
+from datetime import date, datetime
+from sqlalchemy import DDL, event
 from sqlmodel import SQLModel, Field, Relationship, text
 
+from utils.storage import content_compression_sql, content_storage_params
+
 if TYPE_CHECKING:
     from resumes.models import Resume
 
@@ -9,23 +12,97 @@ if TYPE_CHECKING:
 class ResumeImprovementHistory(SQLModel, table=True):
     """
     ORM-модель истории улучшений резюме для хранения в базе данных.
+
+    Таблица секционирована по месяцам по created_at, поэтому created_at
+    входит в первичный ключ. Строки вне созданных секций попадают
+    в секцию по умолчанию.
+
     Attrs:
         id (int): Уникальный идентификатор улучшения резюме (Primary Key).
         resume_id (int): Идентификатор резюме.
         improved_content (str): Улучшение.
         created_at (datetime): Дата и время создания улучшения резюме
-        resume (Resume): Экземпляр резюме
+        resume (Resume): Экземпляр резюме, не загружается лениво
     """
 
     __tablename__ = "resume_improvement_history"
-    __table_args__ = {"extend_existing": True}
-    id: Optional[int] = Field(default=None, primary_key=True)
+    __table_args__ = {
+        "extend_existing": True,
+        "postgresql_partition_by": "RANGE (created_at)",
+    }
+    id: Optional[int] = Field(
+        default=None, primary_key=True, sa_column_kwargs={"autoincrement": True}
+    )
     resume_id: int = Field(
-        foreign_key="resumes.id"
+        foreign_key="resumes.id", ondelete="CASCADE", index=True
     )
     improved_content: str
     created_at: datetime = Field(
-        sa_column_kwargs={"server_default": text("TIMEZONE('utc', now())")}
+        primary_key=True,
+        sa_column_kwargs={"server_default": text("TIMEZONE('utc', now())")},
+    )
+
+    resume: "Resume" = Relationship(
+        back_populates="improvements", sa_relationship_kwargs={"lazy": "raise"}
     )
 
-    resume: "Resume" = Relationship(back_populates="improvements")
+
+HISTORY_PARTITION_PREFIX = f"{ResumeImprovementHistory.__tablename__}_p"
+HISTORY_DEFAULT_PARTITION = f"{ResumeImprovementHistory.__tablename__}_default"
+
+
+def history_partition_name(month: date) -> str:
+    """Возвращает имя месячной секции истории улучшений
+
+    Args:
+        month (date): Первый день месяца
+
+    Returns:
+        str: Имя секции
+    """
+    return f"{HISTORY_PARTITION_PREFIX}{month:%Y_%m}"
+
+
+def history_partition_month(name: str) -> date:
+    """Возвращает месяц месячной секции истории улучшений по её имени
+
+    Args:
+        name (str): Имя секции
+
+    Returns:
+        date: Первый день месяца
+    """
+    return datetime.strptime(name.removeprefix(HISTORY_PARTITION_PREFIX), "%Y_%m").date()
+
+
+def is_history_partition(name: str) -> bool:
+    """Проверяет, является ли таблица секцией истории улучшений
+
+    Args:
+        name (str): Имя таблицы
+
+    Returns:
+        bool: True, если таблица является секцией
+    """
+    return name.startswith(HISTORY_PARTITION_PREFIX) or name == HISTORY_DEFAULT_PARTITION
+
+
+# Метод сжатия наследуется секциями, а параметры хранения задаются у каждой
+event.listen(
+    ResumeImprovementHistory.__table__,
+    "after_create",
+    DDL(
+        content_compression_sql(
+            ResumeImprovementHistory.__tablename__, "improved_content"
+        )
+    ),
+)
+event.listen(
+    ResumeImprovementHistory.__table__,
+    "after_create",
+    DDL(
+        f"CREATE TABLE IF NOT EXISTS {HISTORY_DEFAULT_PARTITION} "
+        f"PARTITION OF {ResumeImprovementHistory.__tablename__} DEFAULT "
+        f"WITH ({content_storage_params()})"
+    ),
+)
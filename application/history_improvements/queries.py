@@ -0,0 +1,39 @@
+"""
+Заранее построенные запросы к истории улучшений резюме: строятся один раз
+на модуль или на набор полей, значения передаются через bindparam.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import Select, bindparam, desc, select
+
+from history_improvements.models import ResumeImprovementHistory
+
+
+@lru_cache(maxsize=256)
+def history_by_resume(
+    fields: Tuple[str, ...] = (), created_after: bool = False
+) -> Select:
+    """Запрос истории улучшений резюме, начиная с новых
+
+    Args:
+        fields (Tuple[str, ...]): Имена столбцов, по умолчанию ORM-объекты
+        created_after (bool): Ограничить записи параметром created_after,
+            чтобы не просматривать более ранние секции
+
+    Returns:
+        Select: Запрос с параметрами resume_id и created_after
+    """
+    table = ResumeImprovementHistory.__table__
+    if fields:
+        query = select(*(table.c[field] for field in fields))
+    else:
+        query = select(ResumeImprovementHistory)
+    # Порядок тот же, что у политики хранения: записи с одинаковым временем
+    # создания упорядочены по идентификатору
+    query = query.where(table.c.resume_id == bindparam("resume_id")).order_by(
+        desc(table.c.created_at), desc(table.c.id)
+    )
+    if created_after:
+        query = query.where(table.c.created_at >= bindparam("created_after"))
+    return query
@@ -1,11 +1,37 @@
 # repositories/resumes.py
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from sqlalchemy import select, desc
+from datetime import date, datetime
+from typing import Dict, Optional, List
+from sqlalchemy import (
+    Integer,
+    String,
+    column,
+    delete,
+    desc,
+    func,
+    insert,
+    select,
+    text,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 
-from database import async_session
-from history_improvements.models import ResumeImprovementHistory
+from database import read_session, shards, write_session
+from history_improvements.models import (
+    HISTORY_DEFAULT_PARTITION,
+    HISTORY_PARTITION_PREFIX,
+    ResumeImprovementHistory,
+)
+from history_improvements.queries import history_by_resume
+from outbox.models import RESUME_IMPROVED, outbox_event
+from notifications.repositories import notify_change, notify_changes
 from resumes.models import Resume
+from resumes.queries import RESUME_METADATA_BY_USER_FOR_UPDATE
+from similarity.repositories import compute_signatures, save_signatures
+from user_stats.repositories import bump_user_stats
+from utils.storage import content_storage_params
+from versions.models import VERSION_SOURCE_IMPROVE, ResumeVersion
 
 
 class ResumeImprovementHistoryAbstractRepository(ABC):
@@ -14,31 +40,162 @@ class ResumeImprovementHistoryAbstractRepository(ABC):
 
     Определяет интерфейс для CRUD-операций с историей улучшений резюме:
     - добавление записи;
+    - получение истории резюме;
+    - удаление устаревших записей;
+    - управление месячными секциями.
     """
 
     @abstractmethod
     async def add_one(
-        self, resume_id: int, improved_text: str
+        self, resume_id: int, user_id: int, improved_text: str, stats: dict
     ) -> ResumeImprovementHistory:
         """
         Добавляет запись об улучшении резюме.
         Args:
             resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
             improved_text (str): Текст улучшенного резюме.
+            stats (dict): Статистика улучшенного содержания.
         Returns:
             ResumeImprovementHistory: Созданная запись истории.
         """
         raise NotImplementedError
-    
+
+    @abstractmethod
+    async def add_many(
+        self, user_id: int, improvements: Dict[int, str], stats: Dict[int, dict]
+    ) -> List[ResumeImprovementHistory]:
+        """
+        Изменяет несколько резюме пользователя и добавляет записи об их
+        улучшении в одной транзакции многострочными запросами.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            improvements (Dict[int, str]): Текст улучшенного резюме по
+                идентификаторам резюме.
+            stats (Dict[int, dict]): Статистика улучшенного содержания по
+                идентификаторам резюме.
+        Returns:
+            List[ResumeImprovementHistory]: Созданные записи истории для
+                резюме, которые ещё существуют.
+        """
+        raise NotImplementedError
+
     @abstractmethod
-    async def get_all_by_resume_id(self, resume_id: int) -> List[ResumeImprovementHistory]:
+    async def get_all_by_resume_id(
+        self, resume_id: int, user_id: int, created_after: Optional[datetime] = None
+    ) -> List[ResumeImprovementHistory]:
         """
         Получает всю историю улучшений резюме Пользователя
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            created_after (Optional[datetime]): Нижняя граница даты создания
+                (UTC), позволяющая PostgreSQL отбросить более старые секции.
         Returns:
             list[ResumeImprovementHistory]: Список улучшений резюме.
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_all_rows_by_resume_id(
+        self,
+        resume_id: int,
+        user_id: int,
+        fields: List[str],
+        created_after: Optional[datetime] = None,
+    ) -> List[dict]:
+        """
+        Получает указанные поля истории улучшений резюме без создания
+        ORM-объектов.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена столбцов.
+            created_after (Optional[datetime]): Нижняя граница даты создания
+                (UTC).
+        Returns:
+            List[dict]: Список полей улучшений.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_resume_ids_after(
+        self, resume_id: int, limit: int, shard: int
+    ) -> List[int]:
+        """
+        Получает идентификаторы резюме на шарде, следующие за resume_id.
+        Args:
+            resume_id (int): Идентификатор, после которого начинается выборка.
+            limit (int): Количество идентификаторов.
+            shard (int): Номер шарда.
+        Returns:
+            List[int]: Отсортированный список идентификаторов резюме.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_expired_batch(
+        self,
+        resume_ids: List[int],
+        keep_last: Optional[int],
+        older_than: Optional[datetime],
+        batch_size: int,
+        shard: int,
+    ) -> int:
+        """
+        Удаляет на шарде пачку улучшений, не попадающих под политику хранения.
+        Запись сохраняется, если она входит в keep_last последних улучшений
+        резюме или создана не раньше older_than.
+        Args:
+            resume_ids (List[int]): Идентификаторы обрабатываемых резюме.
+            keep_last (Optional[int]): Количество последних улучшений резюме,
+                которые нужно сохранить.
+            older_than (Optional[datetime]): Граница по дате создания (UTC).
+            batch_size (int): Размер пачки.
+            shard (int): Номер шарда.
+        Returns:
+            int: Количество удалённых улучшений.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_partitions(self, shard: int) -> List[str]:
+        """
+        Получает имена месячных секций истории улучшений на шарде.
+        Args:
+            shard (int): Номер шарда.
+        Returns:
+            List[str]: Отсортированный список имён секций.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create_partition(
+        self, name: str, start: date, end: date, shard: int
+    ) -> None:
+        """
+        Создаёт на шарде месячную секцию, перенося в неё строки из секции
+        по умолчанию.
+        Args:
+            name (str): Имя секции.
+            start (date): Начало диапазона (включительно).
+            end (date): Конец диапазона (не включительно).
+            shard (int): Номер шарда.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def drop_partition(self, name: str, shard: int) -> int:
+        """
+        Отсоединяет и удаляет месячную секцию на шарде.
+        Args:
+            name (str): Имя секции.
+            shard (int): Номер шарда.
+        Returns:
+            int: Количество удалённых улучшений.
+        """
+        raise NotImplementedError
+
 
 class ResumeImprovementHistoryPostgreSQLRepository(
     ResumeImprovementHistoryAbstractRepository
@@ -49,29 +206,291 @@ class ResumeImprovementHistoryPostgreSQLRepository(
     """
 
     @staticmethod
-    async def add_one(resume_id: int, improved_content: str) -> ResumeImprovementHistory:
-        async with async_session() as session:
-            query = select(Resume).where(
-                Resume.id == resume_id
+    async def add_one(
+        resume_id: int, user_id: int, improved_content: str, stats: dict
+    ) -> ResumeImprovementHistory:
+        (signature,) = await compute_signatures([improved_content])
+        async with write_session(user_id) as session:
+            result = await session.execute(
+                RESUME_METADATA_BY_USER_FOR_UPDATE,
+                {"resume_id": resume_id, "user_id": user_id},
             )
-            result = await session.execute(query)
             resume = result.scalar_one_or_none()
             if not resume:
                 return None
             resume.content = improved_content
+            for key, value in stats.items():
+                setattr(resume, key, value)
+            resume.last_version += 1
+            session.add(
+                ResumeVersion(
+                    resume_id=resume.id,
+                    version=resume.last_version,
+                    parent_version=resume.version,
+                    content=improved_content,
+                    source=VERSION_SOURCE_IMPROVE,
+                )
+            )
+            resume.version = resume.last_version
+            resume.improvements_count += 1
             history = ResumeImprovementHistory(
                 resume_id=resume.id, improved_content=improved_content
             )
             session.add(history)
+            await save_signatures(session, {resume.id: signature})
+            await bump_user_stats(session, user_id, improvements=1, improved=True)
+            await session.flush()
+            event = outbox_event(
+                RESUME_IMPROVED,
+                user_id,
+                resume.id,
+                history_id=history.id,
+                version=resume.version,
+            )
+            session.add(event)
+            await notify_change(session, event)
             await session.commit()
             await session.refresh(history)
             return history
+
+    @staticmethod
+    async def add_many(
+        user_id: int, improvements: Dict[int, str], stats: Dict[int, dict]
+    ) -> List[ResumeImprovementHistory]:
+        if not improvements:
+            return []
+        signatures = dict(
+            zip(improvements, await compute_signatures(list(improvements.values())))
+        )
+        async with write_session(user_id) as session:
+            improved = values(
+                column("id", Integer),
+                column("content", String),
+                column("word_count", Integer),
+                column("char_count", Integer),
+                column("reading_time", Integer),
+                column("headings", ARRAY(String)),
+                name="improved",
+            ).data(
+                [
+                    (
+                        resume_id,
+                        content,
+                        stats[resume_id]["word_count"],
+                        stats[resume_id]["char_count"],
+                        stats[resume_id]["reading_time"],
+                        stats[resume_id]["headings"],
+                    )
+                    for resume_id, content in improvements.items()
+                ]
+            )
+            # Текущие версии до изменения: RETURNING видит уже новые значения
+            current = (
+                select(Resume.id, Resume.version)
+                .where(Resume.id.in_(list(improvements)), Resume.user_id == user_id)
+                .with_for_update()
+                .cte("current")
+            )
+            query = (
+                update(Resume)
+                .where(
+                    Resume.id == current.c.id,
+                    Resume.id == improved.c.id,
+                    Resume.deleted_at.is_(None),
+                )
+                .values(
+                    content=improved.c.content,
+                    word_count=improved.c.word_count,
+                    char_count=improved.c.char_count,
+                    reading_time=improved.c.reading_time,
+                    headings=improved.c.headings,
+                    version=Resume.last_version + 1,
+                    last_version=Resume.last_version + 1,
+                    improvements_count=Resume.improvements_count + 1,
+                )
+                .returning(Resume.id, Resume.version, current.c.version)
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.execute(query)
+            updated = result.all()
+            if not updated:
+                return []
+            await session.execute(
+                insert(ResumeVersion),
+                [
+                    {
+                        "resume_id": resume_id,
+                        "version": version,
+                        "parent_version": parent_version,
+                        "content": improvements[resume_id],
+                        "source": VERSION_SOURCE_IMPROVE,
+                    }
+                    for resume_id, version, parent_version in updated
+                ],
+            )
+            result = await session.scalars(
+                insert(ResumeImprovementHistory).returning(ResumeImprovementHistory),
+                [
+                    {"resume_id": resume_id, "improved_content": improvements[resume_id]}
+                    for resume_id, _, _ in updated
+                ],
+            )
+            history = result.all()
+            await save_signatures(
+                session,
+                {resume_id: signatures[resume_id] for resume_id, _, _ in updated},
+            )
+            await bump_user_stats(
+                session, user_id, improvements=len(updated), improved=True
+            )
+            versions = {resume_id: version for resume_id, version, _ in updated}
+            events = [
+                outbox_event(
+                    RESUME_IMPROVED,
+                    user_id,
+                    elem.resume_id,
+                    history_id=elem.id,
+                    version=versions[elem.resume_id],
+                )
+                for elem in history
+            ]
+            session.add_all(events)
+            await notify_changes(session, events)
+            await session.commit()
+            return history
         
     @staticmethod
-    async def get_all_by_resume_id(resume_id: int) -> List[ResumeImprovementHistory]:
-        async with async_session() as session:
-            query = select(ResumeImprovementHistory).where(
-                ResumeImprovementHistory.resume_id == resume_id
-            ).order_by(desc(ResumeImprovementHistory.created_at))
+    async def get_all_by_resume_id(
+        resume_id: int, user_id: int, created_after: Optional[datetime] = None
+    ) -> List[ResumeImprovementHistory]:
+        query = history_by_resume((), created_after is not None)
+        params = {"resume_id": resume_id, "created_after": created_after}
+        async with read_session(user_id) as session:
+            result = await session.execute(query, params)
+            return result.scalars().all()
+
+    @staticmethod
+    async def get_all_rows_by_resume_id(
+        resume_id: int,
+        user_id: int,
+        fields: List[str],
+        created_after: Optional[datetime] = None,
+    ) -> List[dict]:
+        query = history_by_resume(tuple(fields), created_after is not None)
+        params = {"resume_id": resume_id, "created_after": created_after}
+        async with read_session(user_id) as session:
+            result = await session.execute(query, params)
+            keys = list(result.keys())
+            return [dict(zip(keys, row)) for row in result]
+
+    @staticmethod
+    async def get_resume_ids_after(resume_id: int, limit: int, shard: int) -> List[int]:
+        async with shards[shard].session() as session:
+            query = (
+                select(Resume.id)
+                .where(Resume.id > resume_id)
+                .order_by(Resume.id)
+                .limit(limit)
+            )
             result = await session.execute(query)
             return result.scalars().all()
+
+    @staticmethod
+    async def delete_expired_batch(
+        resume_ids: List[int],
+        keep_last: Optional[int],
+        older_than: Optional[datetime],
+        batch_size: int,
+        shard: int,
+    ) -> int:
+        async with shards[shard].session() as session:
+            ranked = (
+                select(
+                    ResumeImprovementHistory.id,
+                    ResumeImprovementHistory.created_at,
+                    func.row_number()
+                    .over(
+                        partition_by=ResumeImprovementHistory.resume_id,
+                        order_by=(
+                            desc(ResumeImprovementHistory.created_at),
+                            desc(ResumeImprovementHistory.id),
+                        ),
+                    )
+                    .label("position"),
+                )
+                .where(ResumeImprovementHistory.resume_id.in_(resume_ids))
+                .subquery()
+            )
+            expired = select(ranked.c.id)
+            if keep_last is not None:
+                expired = expired.where(ranked.c.position > keep_last)
+            if older_than is not None:
+                expired = expired.where(ranked.c.created_at < older_than)
+            query = delete(ResumeImprovementHistory).where(
+                ResumeImprovementHistory.id.in_(
+                    expired.limit(batch_size).scalar_subquery()
+                )
+            ).execution_options(synchronize_session=False)
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount
+
+    @staticmethod
+    async def get_partitions(shard: int) -> List[str]:
+        async with shards[shard].session() as session:
+            query = text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:parent AS regclass) "
+                "AND child.relname LIKE :prefix ORDER BY child.relname"
+            )
+            result = await session.execute(
+                query,
+                {
+                    "parent": ResumeImprovementHistory.__tablename__,
+                    "prefix": f"{HISTORY_PARTITION_PREFIX}%",
+                },
+            )
+            return result.scalars().all()
+
+    @staticmethod
+    async def create_partition(name: str, start: date, end: date, shard: int) -> None:
+        table = ResumeImprovementHistory.__tablename__
+        bounds = {
+            "start": datetime(start.year, start.month, start.day),
+            "end": datetime(end.year, end.month, end.day),
+        }
+        async with shards[shard].session() as session:
+            await session.execute(
+                text(
+                    f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS "
+                    "INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMPRESSION) "
+                    f"WITH ({content_storage_params()})"
+                )
+            )
+            await session.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {HISTORY_DEFAULT_PARTITION} "
+                    "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+            await session.execute(
+                text(
+                    f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                )
+            )
+            await session.commit()
+
+    @staticmethod
+    async def drop_partition(name: str, shard: int) -> int:
+        table = ResumeImprovementHistory.__tablename__
+        async with shards[shard].session() as session:
+            result = await session.execute(text(f"SELECT count(*) FROM {name}"))
+            deleted = result.scalar_one()
+            await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            await session.execute(text(f"DROP TABLE {name}"))
+            await session.commit()
+            return deleted
@@ -1,13 +1,25 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 
 from base_dependiences import get_current_user
 from history_improvements.dependiences import history_improvement_resume_service
 from history_improvements.services import ResumeImprovementHistoryService
-from history_improvements.schemes import ResumeImprovementResponseScheme
+from history_improvements.schemes import (
+    ResumeImprovementBatchResultScheme,
+    ResumeImprovementBatchScheme,
+    ResumeImprovementResponseScheme,
+    ResumeImprovementStatus,
+)
+from idempotency.dependiences import idempotency_service
+from idempotency.services import IdempotencyService
+from rate_limits.dependiences import enforce_rate_limit
 from resumes.dependiences import resumes_service
 from resumes.services import ResumeService
+from settings import settings
+from utils.compression import compression_level
+from utils.executors import run_in_executor
 from utils.improve_service import ImproveClient
 
 router = APIRouter(
@@ -17,15 +29,23 @@ router = APIRouter(
 )
 
 
-@router.post("/{resume_id}/improve", response_model=ResumeImprovementResponseScheme)
+@router.post(
+    "/{resume_id}/improve",
+    response_model=ResumeImprovementResponseScheme,
+)
 async def improve_resume(
     resume_id: int,
     request: Request,
+    response: Response,
     resume_service: ResumeService = Depends(resumes_service),
     history_improvement_service: ResumeImprovementHistoryService = Depends(
         history_improvement_resume_service
     ),
     improve_client: ImproveClient = Depends(ImproveClient),
+    idempotency: IdempotencyService = Depends(idempotency_service),
+    idempotency_key: Optional[str] = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
     time_zone: str = "UTC"
 ):
     """
@@ -34,18 +54,26 @@ async def improve_resume(
     Функция выполняет следующие шаги:
     1. Получает резюме по идентификатору и пользователю.
     2. Проверяет, существует ли резюме.
-    3. Добавляет к тексту резюме строку " [Improved]" как заглушку улучшения.
+    3. Добавляет к тексту резюме строку " [Improved]" как заглушку улучшения
+       в пуле improve, не блокируя цикл событий.
     4. Сохраняет результат в историю улучшений резюме.
     5. Возвращает объект с информацией об улучшенном резюме.
 
+    Повторный запрос с тем же заголовком Idempotency-Key не вызывает
+    улучшение повторно, а возвращает сохранённый ответ, не списывая токены
+    группы improve.
+
     Args:
         resume_id (int): Идентификатор резюме, которое нужно улучшить.
         request (Request): Объект FastAPI Request, используется для извлечения
             user_id.
+        response (Response): Объект FastAPI Response для заголовков ответа.
         resume_service (ResumeService): Сервис для работы с резюме.
         history_improvement_resume_service (ResumeImprovementHistoryService):
             Сервис для сохранения истории улучшений.
         improve_client (ImproveClient): Клиент для улучшения содержания текста
+        idempotency (IdempotencyService): Сервис идемпотентности.
+        idempotency_key (Optional[str]): Ключ идемпотентности.
         time_zone (str): Часовой пояс
     Returns:
         ResumeImprovementResponseScheme: Объект с улучшенным текстом резюме и
@@ -56,17 +84,119 @@ async def improve_resume(
             (код 404).
     """
     user_id = request.state.user_id
-    resume = await resume_service.get_one_by_user_id(resume_id, user_id)
-    if not resume:
-        raise HTTPException(status_code=404, detail="Резюме не найдено")
-    improved_content = improve_client.improve_resume(resume.content)
-    return await history_improvement_service.add_one(
-        resume.id, 
-        improved_content,
-        time_zone
+
+    async def improve():
+        await enforce_rate_limit(request, "improve")
+        # Улучшенный текст заменяет содержание, поэтому оно читается на
+        # основном сервере: на отстающей реплике оно может быть устаревшим
+        resume = await resume_service.get_one_by_user_id(
+            resume_id, user_id, primary=True
+        )
+        if not resume:
+            raise HTTPException(status_code=404, detail="Резюме не найдено")
+        improved_content = await run_in_executor(
+            "improve", improve_client.improve_resume, resume.content
+        )
+        history = await history_improvement_service.add_one(
+            resume.id,
+            user_id,
+            improved_content,
+            time_zone
+        )
+        if history is None:
+            # Резюме удалено, пока выполнялось улучшение
+            raise HTTPException(status_code=404, detail="Резюме не найдено")
+        return history
+
+    result, replayed = await idempotency.execute(
+        idempotency_key,
+        user_id,
+        f"improve_resume:{resume_id}",
+        {"time_zone": time_zone},
+        improve,
+        ResumeImprovementResponseScheme,
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
+
+
+@router.post("/improve", response_model=List[ResumeImprovementBatchResultScheme])
+async def improve_resumes_batch(
+    batch: ResumeImprovementBatchScheme,
+    request: Request,
+    resume_service: ResumeService = Depends(resumes_service),
+    history_improvement_service: ResumeImprovementHistoryService = Depends(
+        history_improvement_resume_service
+    ),
+    improve_client: ImproveClient = Depends(ImproveClient),
+    time_zone: str = "UTC"
+):
+    """
+    Улучшение нескольких резюме одним запросом.
+
+    Функция выполняет следующие шаги:
+    1. Получает содержание всех резюме пользователя одним запросом к БД.
+    2. Улучшает найденные резюме параллельно с ограничением
+       IMPROVE_BATCH_CONCURRENCY.
+    3. Сохраняет улучшенные тексты и историю улучшений одной транзакцией.
+    4. Возвращает результат для каждого резюме в порядке запроса.
+
+    Каждое резюме списывает один токен группы improve, поэтому пакет не может
+    быть больше ёмкости её корзины.
+
+    Args:
+        batch (ResumeImprovementBatchScheme): Идентификаторы резюме.
+        request (Request): Объект FastAPI Request, используется для извлечения
+            user_id.
+        resume_service (ResumeService): Сервис для работы с резюме.
+        history_improvement_resume_service (ResumeImprovementHistoryService):
+            Сервис для сохранения истории улучшений.
+        improve_client (ImproveClient): Клиент для улучшения содержания текста
+        time_zone (str): Часовой пояс
+    Returns:
+        List[ResumeImprovementBatchResultScheme]: Результаты улучшения резюме.
+    Raises:
+        HTTPException: Если резюме в пакете больше ёмкости корзины improve
+            (код 422).
+    """
+    user_id = request.state.user_id
+    resume_ids = list(dict.fromkeys(batch.ids))
+    capacity, _ = settings.RATE_LIMITS["improve"]
+    if len(resume_ids) > capacity:
+        # Такой пакет не пройдёт ограничение частоты никогда
+        raise HTTPException(
+            status_code=422,
+            detail=f"Можно улучшить не больше {capacity} резюме за запрос",
+        )
+    await enforce_rate_limit(request, "improve", len(resume_ids))
+    resumes, _ = await resume_service.get_batch_by_user_id(
+        resume_ids, user_id, ["id", "content"], primary=True
+    )
+    history, failed = await history_improvement_service.improve_many(
+        resumes, user_id, improve_client.improve_resume, time_zone
     )
+    results = []
+    for resume_id in resume_ids:
+        if resume_id in history:
+            status = ResumeImprovementStatus.improved
+        elif resume_id in failed:
+            status = ResumeImprovementStatus.failed
+        else:
+            status = ResumeImprovementStatus.not_found
+        results.append(
+            ResumeImprovementBatchResultScheme(
+                resume_id=resume_id, status=status, improvement=history.get(resume_id)
+            )
+        )
+    return results
+
 
-@router.get("/{resume_id}/history_improvements", response_model=List[ResumeImprovementResponseScheme])
+@router.get(
+    "/{resume_id}/history_improvements",
+    response_model=List[ResumeImprovementResponseScheme],
+    dependencies=[compression_level(settings.COMPRESSION_LIST_LEVEL)],
+)
 async def get_history_improvements_resume(
     resume_id: int,
     request: Request,
@@ -82,8 +212,9 @@ async def get_history_improvements_resume(
     Функция выполняет следующие шаги:
     1. Получает резюме по идентификатору и пользователю.
     2. Проверяет, существует ли резюме.
-    3. Получает список улучшений резюме.
-    5. Возвращает список улучшений резюме.
+    3. Получает список улучшений резюме: только поля схемы ответа, без
+       создания ORM-объектов и повторной валидации.
+    4. Возвращает список улучшений резюме.
 
     Args:
         resume_id (int): Идентификатор резюме, которое нужно улучшить.
@@ -102,10 +233,15 @@ async def get_history_improvements_resume(
             (код 404).
     """
     user_id = request.state.user_id
-    resume = await resume_service.get_one_by_user_id(resume_id, user_id)
+    resume = await resume_service.get_one_row_by_user_id(
+        resume_id, user_id, ["created_at"]
+    )
     if not resume:
         raise HTTPException(status_code=404, detail="Резюме не найдено")
-    return await history_improvement_service.get_all_by_resume_id(
-        resume.id,
-        time_zone
+    history = await history_improvement_service.get_all_rows_by_resume_id(
+        resume_id,
+        user_id,
+        time_zone,
+        resume["created_at"],
     )
+    return ORJSONResponse(history)
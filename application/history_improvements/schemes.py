@@ -1,6 +1,10 @@
 from datetime import datetime
+from enum import Enum
+from typing import List, Optional
 
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
+
+from settings import settings
 
 
 class ResumeImprovementResponseScheme(SQLModel):
@@ -13,3 +17,25 @@ class ResumeImprovementResponseScheme(SQLModel):
 
     class Config:
         from_attributes = True
+
+
+class ResumeImprovementBatchScheme(SQLModel):
+    """Схема запроса на улучшение нескольких резюме."""
+
+    ids: List[int] = Field(min_length=1, max_length=settings.RESUMES_BATCH_MAX_IDS)
+
+
+class ResumeImprovementStatus(str, Enum):
+    """Результат улучшения резюме в пакетном запросе."""
+
+    improved = "improved"
+    not_found = "not_found"
+    failed = "failed"
+
+
+class ResumeImprovementBatchResultScheme(SQLModel):
+    """Схема результата улучшения одного резюме в пакетном запросе."""
+
+    resume_id: int
+    status: ResumeImprovementStatus
+    improvement: Optional[ResumeImprovementResponseScheme] = None
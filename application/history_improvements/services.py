@@ -1,18 +1,53 @@
-from datetime import timezone, datetime
-from typing import List
+import asyncio
+import logging
+from datetime import date, timezone, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
+from database import shards
 from history_improvements.repositories import ResumeImprovementHistoryAbstractRepository
-from history_improvements.models import ResumeImprovementHistory
+from history_improvements.schemes import ResumeImprovementResponseScheme
+from history_improvements.models import (
+    ResumeImprovementHistory,
+    history_partition_month,
+    history_partition_name,
+)
 from resumes.services import ResumeService
-from resumes.models import Resume
+from resumes.models import RESUME_CONTENT_MAX_LENGTH, Resume
+from resumes.stats import text_stats
+from settings import settings
+from utils.executors import run_in_executor
+
+
+class ImprovedResumeTooLargeError(Exception):
+    """Улучшенное резюме длиннее RESUME_CONTENT_MAX_LENGTH."""
+
+
+def check_improved_length(content: str) -> str:
+    """Проверяет длину улучшенного резюме до записи в БД
+
+    Args:
+        content (str): Текст улучшенного резюме
+
+    Returns:
+        str: Тот же текст
+
+    Raises:
+        ImprovedResumeTooLargeError: Если текст длиннее
+            RESUME_CONTENT_MAX_LENGTH
+    """
+    if len(content) > RESUME_CONTENT_MAX_LENGTH:
+        raise ImprovedResumeTooLargeError
+    return content
 
 
 class ResumeImprovementHistoryService:
     """
     Сервис для работы с историей улучшений резюме.
     Инкапсулирует бизнес-логику:
-    - добавление истории улучшения резюме.
+    - добавление истории улучшения резюме;
+    - применение политики хранения истории;
+    - создание месячных секций истории заранее.
 
     Внешние зависимости: ResumesAbstractRepository.
     """
@@ -31,35 +66,250 @@ class ResumeImprovementHistoryService:
         self.repo: ResumeImprovementHistoryAbstractRepository = repo
 
     async def add_one(
-        self, resume_id: int, improve_content: str, time_zone: str
-    ) -> ResumeImprovementHistory:
+        self, resume_id: int, user_id: int, improve_content: str, time_zone: str
+    ) -> Optional[ResumeImprovementHistory]:
         """
         Изменяет резюме и добавляет запись об улучшении резюме.
         Args:
             resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
             improve_content (str): Текст улучшенного резюме.
             time_zone (str): Часовой пояс
         Returns:
-            ResumeHistory: Созданная запись.
+            Optional[ResumeHistory]: Созданная запись или None, если резюме
+                удалено до сохранения улучшения.
+        Raises:
+            ImprovedResumeTooLargeError: Если улучшенное резюме длиннее
+                RESUME_CONTENT_MAX_LENGTH.
         """
-        history = await self.repo.add_one(resume_id, improve_content)
+        check_improved_length(improve_content)
+        history = await self.repo.add_one(
+            resume_id, user_id, improve_content, text_stats(improve_content)
+        )
+        if history is None:
+            return None
         history.created_at = self.__update_timezone(history, time_zone)
         return history
     
-    async def get_all_by_resume_id(self, resume_id: int, time_zone: str) -> List[ResumeImprovementHistory]:
+    async def improve_many(
+        self,
+        resumes: List[dict],
+        user_id: int,
+        improve: Callable[[str], str],
+        time_zone: str,
+    ) -> Tuple[Dict[int, ResumeImprovementHistory], List[int]]:
+        """
+        Улучшает несколько резюме: вызовы improve выполняются параллельно
+        в пуле improve, не больше IMPROVE_BATCH_CONCURRENCY одновременно, а результаты
+        сохраняются одной транзакцией. Резюме, улучшенный текст которых
+        длиннее RESUME_CONTENT_MAX_LENGTH, считаются неулучшенными.
+        Args:
+            resumes (List[dict]): Идентификаторы и содержание резюме.
+            user_id (int): Идентификатор пользователя.
+            improve (Callable[[str], str]): Функция улучшения содержания.
+            time_zone (str): Часовой пояс
+        Returns:
+            Tuple[Dict[int, ResumeImprovementHistory], List[int]]: Созданные
+                записи по идентификаторам резюме и идентификаторы резюме,
+                улучшить которые не удалось.
+        """
+        semaphore = asyncio.Semaphore(settings.IMPROVE_BATCH_CONCURRENCY)
+
+        async def improve_one(content: str) -> str:
+            async with semaphore:
+                improved = await run_in_executor("improve", improve, content)
+            return check_improved_length(improved)
+
+        results = await asyncio.gather(
+            *(improve_one(resume["content"]) for resume in resumes),
+            return_exceptions=True,
+        )
+        improvements = {}
+        failed = []
+        for resume, result in zip(resumes, results):
+            if isinstance(result, Exception):
+                logging.error("Не удалось улучшить резюме %s: %s", resume["id"], result)
+                failed.append(resume["id"])
+            else:
+                improvements[resume["id"]] = result
+        stats = {
+            resume_id: text_stats(content) for resume_id, content in improvements.items()
+        }
+        history = await self.repo.add_many(user_id, improvements, stats)
+        for elem in history:
+            elem.created_at = self.__update_timezone(elem, time_zone)
+        return {elem.resume_id: elem for elem in history}, failed
+
+    async def get_all_by_resume_id(
+        self,
+        resume_id: int,
+        user_id: int,
+        time_zone: str,
+        created_after: Optional[datetime] = None,
+    ) -> List[ResumeImprovementHistory]:
         """
         Получает список всех улучшений резюме.
         Args:
             resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
             time_zone (str): Часовой пояс
+            created_after (Optional[datetime]): Дата создания резюме (UTC):
+                улучшения не могут быть старше, поэтому более ранние секции
+                не просматриваются.
         Returns:
             List[ResumeImprovementHistory]: Список улучшений.
         """
-        history = await self.repo.get_all_by_resume_id(resume_id)
+        history = await self.repo.get_all_by_resume_id(
+            resume_id, user_id, created_after
+        )
         for elem in history:
             elem.created_at = self.__update_timezone(elem, time_zone)
         return history
     
+    async def get_all_rows_by_resume_id(
+        self,
+        resume_id: int,
+        user_id: int,
+        time_zone: str,
+        created_after: Optional[datetime] = None,
+    ) -> List[dict]:
+        """
+        Получает поля всех улучшений резюме для отдачи без повторной валидации.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            time_zone (str): Часовой пояс
+            created_after (Optional[datetime]): Дата создания резюме (UTC).
+        Returns:
+            List[dict]: Список полей улучшений.
+        """
+        history = await self.repo.get_all_rows_by_resume_id(
+            resume_id,
+            user_id,
+            list(ResumeImprovementResponseScheme.model_fields),
+            created_after,
+        )
+        user_tz = ZoneInfo(time_zone)
+        for elem in history:
+            elem["created_at"] = (
+                elem["created_at"].replace(tzinfo=timezone.utc).astimezone(user_tz)
+            )
+        return history
+
+    async def apply_retention(
+        self,
+        keep_last: Optional[int],
+        max_age_days: Optional[int],
+        batch_size: int,
+        pause: float,
+    ) -> int:
+        """
+        Удаляет пачками улучшения, не попадающие под политику хранения:
+        запись сохраняется, если она входит в keep_last последних улучшений
+        резюме или моложе max_age_days дней. Если задан только срок хранения,
+        целиком устаревшие месячные секции удаляются без построчного DELETE.
+        Args:
+            keep_last (Optional[int]): Количество последних улучшений резюме.
+            max_age_days (Optional[int]): Срок хранения в днях.
+            batch_size (int): Размер пачки.
+            pause (float): Пауза между пачками в секундах.
+        Returns:
+            int: Количество удалённых улучшений.
+        """
+        if keep_last is None and max_age_days is None:
+            return 0
+        older_than = None
+        if max_age_days is not None:
+            older_than = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+                days=max_age_days
+            )
+        deleted = 0
+        for shard in shards:
+            deleted += await self.__apply_retention_on_shard(
+                shard.index, keep_last, older_than, batch_size, pause
+            )
+        return deleted
+
+    async def __apply_retention_on_shard(
+        self,
+        shard: int,
+        keep_last: Optional[int],
+        older_than: Optional[datetime],
+        batch_size: int,
+        pause: float,
+    ) -> int:
+        """Применяет политику хранения истории на одном шарде
+
+        Args:
+            shard (int): Номер шарда
+            keep_last (Optional[int]): Количество последних улучшений резюме
+            older_than (Optional[datetime]): Граница срока хранения (UTC)
+            batch_size (int): Размер пачки
+            pause (float): Пауза между пачками в секундах
+
+        Returns:
+            int: Количество удалённых улучшений
+        """
+        deleted = 0
+        if older_than is not None and keep_last is None:
+            for name in await self.repo.get_partitions(shard):
+                month_end = self.__next_month(history_partition_month(name))
+                if month_end <= older_than.date():
+                    deleted += await self.repo.drop_partition(name, shard)
+        last_resume_id = 0
+        while True:
+            resume_ids = await self.repo.get_resume_ids_after(
+                last_resume_id, batch_size, shard
+            )
+            if not resume_ids:
+                return deleted
+            while True:
+                batch = await self.repo.delete_expired_batch(
+                    resume_ids, keep_last, older_than, batch_size, shard
+                )
+                deleted += batch
+                if batch < batch_size:
+                    break
+                await asyncio.sleep(pause)
+            last_resume_id = resume_ids[-1]
+            await asyncio.sleep(pause)
+
+    async def create_partitions(self, months_ahead: int) -> List[str]:
+        """
+        Создаёт на всех шардах месячные секции истории с текущего месяца
+        на months_ahead месяцев вперёд.
+        Args:
+            months_ahead (int): Количество месяцев вперёд.
+        Returns:
+            List[str]: Имена созданных секций.
+        """
+        created = []
+        for shard in shards:
+            existing = set(await self.repo.get_partitions(shard.index))
+            month = datetime.now(timezone.utc).date().replace(day=1)
+            for _ in range(months_ahead + 1):
+                next_month = self.__next_month(month)
+                name = history_partition_name(month)
+                if name not in existing:
+                    await self.repo.create_partition(
+                        name, month, next_month, shard.index
+                    )
+                    created.append(name)
+                month = next_month
+        return created
+
+    @staticmethod
+    def __next_month(month: date) -> date:
+        """Возвращает первый день следующего месяца
+
+        Args:
+            month (date): Первый день месяца
+
+        Returns:
+            date: Первый день следующего месяца
+        """
+        return (month + timedelta(days=32)).replace(day=1)
+
     def __update_timezone(self, history: ResumeImprovementHistory, time_zone: str) -> datetime:
         """Изменяет часовой пояс
 
@@ -0,0 +1,6 @@
+from idempotency.repositories import IdempotencyKeysPostgreSQLRepository
+from idempotency.services import IdempotencyService
+
+
+def idempotency_service():
+    return IdempotencyService(IdempotencyKeysPostgreSQLRepository)
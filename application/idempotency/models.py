@@ -0,0 +1,37 @@
+from typing import Optional
+from datetime import datetime
+from sqlmodel import SQLModel, Field, text
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """
+    ORM-модель ключа идемпотентности для хранения в базе данных.
+    Attrs:
+        user_id (int): Идентификатор пользователя.
+        scope (str): Операция, к которой относится ключ.
+        key (str): Значение заголовка Idempotency-Key.
+        fingerprint (str): Хэш тела запроса.
+        response_body (Optional[str]): Сохранённый ответ в формате JSON,
+            None пока запрос выполняется.
+        created_at (datetime): Дата и время создания ключа.
+        expires_at (datetime): Дата и время истечения ключа.
+        locked_until (Optional[datetime]): Срок аренды ключа выполняющимся
+            запросом. Если запрос упал, не сохранив ответ, после этого срока
+            ключ захватывает повторный запрос.
+        owner (Optional[str]): Токен запроса, владеющего арендой ключа.
+            Ответ сохраняет и ключ освобождает только этот запрос.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = {"extend_existing": True}
+    user_id: int = Field(primary_key=True)
+    scope: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    fingerprint: str
+    response_body: Optional[str] = None
+    created_at: datetime = Field(
+        sa_column_kwargs={"server_default": text("TIMEZONE('utc', now())")}
+    )
+    expires_at: datetime
+    locked_until: Optional[datetime] = None
+    owner: Optional[str] = None
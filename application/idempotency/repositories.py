@@ -0,0 +1,282 @@
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Optional, Tuple
+from sqlalchemy import select, delete, update, func, or_, tuple_, DateTime
+from sqlalchemy.dialects.postgresql import insert
+
+from database import async_session
+from idempotency.models import IdempotencyKey
+
+
+class IdempotencyKeysAbstractRepository(ABC):
+    """
+    Абстрактный репозиторий для работы с ключами идемпотентности.
+
+    Определяет интерфейс операций с ключами:
+    - захват ключа;
+    - получение ключа;
+    - продление аренды ключа;
+    - сохранение ответа;
+    - освобождение ключа;
+    - удаление истёкших ключей.
+    """
+
+    @abstractmethod
+    async def acquire(
+        self,
+        user_id: int,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        ttl: int,
+        lease: float,
+        owner: str,
+    ) -> Tuple[Optional[IdempotencyKey], bool]:
+        """
+        Захватывает ключ идемпотентности или возвращает уже существующий.
+        Ключ без ответа с истёкшей арендой захватывается заново.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            scope (str): Операция, к которой относится ключ.
+            key (str): Ключ идемпотентности.
+            fingerprint (str): Хэш тела запроса.
+            ttl (int): Время жизни ключа в секундах.
+            lease (float): Срок аренды ключа выполняющимся запросом в секундах.
+            owner (str): Токен захватывающего запроса.
+        Returns:
+            Tuple[Optional[IdempotencyKey], bool]: Запись ключа и признак того,
+                что ключ был создан этим вызовом.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_one(
+        self, user_id: int, scope: str, key: str
+    ) -> Optional[IdempotencyKey]:
+        """
+        Получает ключ идемпотентности.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            scope (str): Операция, к которой относится ключ.
+            key (str): Ключ идемпотентности.
+        Returns:
+            Optional[IdempotencyKey]: Запись ключа или None.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def renew(
+        self, user_id: int, scope: str, key: str, owner: str, lease: float
+    ) -> bool:
+        """
+        Продлевает аренду ключа выполняющимся запросом.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            scope (str): Операция, к которой относится ключ.
+            key (str): Ключ идемпотентности.
+            owner (str): Токен запроса, захватившего ключ.
+            lease (float): Срок аренды от текущего момента в секундах.
+        Returns:
+            bool: False, если ключ захвачен другим запросом или уже завершён.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete(
+        self, user_id: int, scope: str, key: str, owner: str, response_body: str
+    ) -> None:
+        """
+        Сохраняет ответ на запрос с ключом идемпотентности, если ключ всё ещё
+        принадлежит запросу.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            scope (str): Операция, к которой относится ключ.
+            key (str): Ключ идемпотентности.
+            owner (str): Токен запроса, захватившего ключ.
+            response_body (str): Ответ в формате JSON.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, user_id: int, scope: str, key: str, owner: str) -> None:
+        """
+        Освобождает ключ идемпотентности, если запрос завершился ошибкой,
+        а ключ всё ещё принадлежит ему.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            scope (str): Операция, к которой относится ключ.
+            key (str): Ключ идемпотентности.
+            owner (str): Токен запроса, захватившего ключ.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_expired_batch(self, batch_size: int) -> int:
+        """
+        Удаляет пачку истёкших ключей идемпотентности.
+        Args:
+            batch_size (int): Размер пачки.
+        Returns:
+            int: Количество удалённых ключей.
+        """
+        raise NotImplementedError
+
+
+class IdempotencyKeysPostgreSQLRepository(IdempotencyKeysAbstractRepository):
+    """
+    Реализация репозитория ключей идемпотентности с использованием
+    PostgreSQL (SQLModel + AsyncSession).
+    """
+
+    @staticmethod
+    async def acquire(
+        user_id: int,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        ttl: int,
+        lease: float,
+        owner: str,
+    ) -> Tuple[Optional[IdempotencyKey], bool]:
+        async with async_session() as session:
+            now = func.timezone("utc", func.now(), type_=DateTime)
+            await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.expires_at < now,
+                )
+            )
+            query = (
+                insert(IdempotencyKey)
+                .values(
+                    user_id=user_id,
+                    scope=scope,
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=ttl),
+                    locked_until=now + timedelta(seconds=lease),
+                    owner=owner,
+                )
+                .on_conflict_do_nothing()
+                .returning(IdempotencyKey)
+            )
+            result = await session.execute(query)
+            record = result.scalar_one_or_none()
+            if record is None:
+                # Запрос, захвативший ключ, упал или завис, не сохранив ответ
+                query = (
+                    update(IdempotencyKey)
+                    .where(
+                        IdempotencyKey.user_id == user_id,
+                        IdempotencyKey.scope == scope,
+                        IdempotencyKey.key == key,
+                        IdempotencyKey.fingerprint == fingerprint,
+                        IdempotencyKey.response_body.is_(None),
+                        or_(
+                            IdempotencyKey.locked_until.is_(None),
+                            IdempotencyKey.locked_until < now,
+                        ),
+                    )
+                    .values(locked_until=now + timedelta(seconds=lease), owner=owner)
+                    .returning(IdempotencyKey)
+                    .execution_options(synchronize_session=False)
+                )
+                result = await session.execute(query)
+                record = result.scalar_one_or_none()
+            created = record is not None
+            if not created:
+                query = select(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.key == key,
+                )
+                result = await session.execute(query)
+                record = result.scalar_one_or_none()
+            await session.commit()
+            return record, created
+
+    @staticmethod
+    async def get_one(user_id: int, scope: str, key: str) -> Optional[IdempotencyKey]:
+        async with async_session() as session:
+            query = select(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+            )
+            result = await session.execute(query)
+            return result.scalar_one_or_none()
+
+    @staticmethod
+    async def renew(
+        user_id: int, scope: str, key: str, owner: str, lease: float
+    ) -> bool:
+        async with async_session() as session:
+            now = func.timezone("utc", func.now(), type_=DateTime)
+            query = (
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.owner == owner,
+                    IdempotencyKey.response_body.is_(None),
+                )
+                .values(locked_until=now + timedelta(seconds=lease))
+            )
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount > 0
+
+    @staticmethod
+    async def complete(
+        user_id: int, scope: str, key: str, owner: str, response_body: str
+    ) -> None:
+        async with async_session() as session:
+            query = (
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.owner == owner,
+                    IdempotencyKey.response_body.is_(None),
+                )
+                .values(response_body=response_body)
+            )
+            await session.execute(query)
+            await session.commit()
+
+    @staticmethod
+    async def release(user_id: int, scope: str, key: str, owner: str) -> None:
+        async with async_session() as session:
+            query = delete(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.owner == owner,
+                IdempotencyKey.response_body.is_(None),
+            )
+            await session.execute(query)
+            await session.commit()
+
+    @staticmethod
+    async def delete_expired_batch(batch_size: int) -> int:
+        async with async_session() as session:
+            expired = (
+                select(IdempotencyKey.user_id, IdempotencyKey.scope, IdempotencyKey.key)
+                .where(
+                    IdempotencyKey.expires_at
+                    < func.timezone("utc", func.now(), type_=DateTime)
+                )
+                .limit(batch_size)
+            )
+            query = delete(IdempotencyKey).where(
+                tuple_(
+                    IdempotencyKey.user_id, IdempotencyKey.scope, IdempotencyKey.key
+                ).in_(expired)
+            ).execution_options(synchronize_session=False)
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount
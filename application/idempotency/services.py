@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from sqlmodel import SQLModel
+
+from idempotency.repositories import IdempotencyKeysAbstractRepository
+from settings import settings
+from utils.scheduler import PeriodicTask
+
+# Блокировки ключей, выполняющихся в текущем процессе: повторные запросы
+# ждут на блокировке, а не опрашивают базу данных.
+_local_locks: "WeakValueDictionary[Tuple[int, str, str], asyncio.Lock]" = (
+    WeakValueDictionary()
+)
+
+
+class IdempotencyConflictError(Exception):
+    """Ключ идемпотентности уже использован с другим телом запроса."""
+
+
+class IdempotencyInProgressError(Exception):
+    """Запрос с этим ключом идемпотентности всё ещё выполняется."""
+
+
+class IdempotencyService:
+    """
+    Сервис идемпотентного выполнения запросов.
+    Инкапсулирует бизнес-логику:
+    - однократное выполнение запроса с заголовком Idempotency-Key;
+    - повтор сохранённого ответа для дубликатов;
+    - ожидание завершения параллельного дубликата;
+    - удаление истёкших ключей.
+
+    Внешние зависимости: IdempotencyKeysAbstractRepository.
+    """
+
+    def __init__(self, repo: IdempotencyKeysAbstractRepository):
+        """
+        Инициализация сервиса идемпотентности.
+        Args:
+            repo (IdempotencyKeysAbstractRepository): Репозиторий для работы с БД.
+        """
+        self.repo: IdempotencyKeysAbstractRepository = repo
+
+    async def execute(
+        self,
+        key: Optional[str],
+        user_id: int,
+        scope: str,
+        payload: Any,
+        handler: Callable[[], Awaitable[Any]],
+        scheme: type[SQLModel],
+    ) -> Tuple[Any, bool]:
+        """
+        Выполняет обработчик не более одного раза для ключа идемпотентности.
+        Args:
+            key (Optional[str]): Ключ идемпотентности, None если заголовок
+                не передан.
+            user_id (int): Идентификатор пользователя.
+            scope (str): Операция, к которой относится ключ.
+            payload (Any): Параметры запроса, из которых считается отпечаток.
+            handler (Callable[[], Awaitable[Any]]): Обработчик запроса.
+            scheme (type[SQLModel]): Схема ответа для сохранения результата.
+        Returns:
+            Tuple[Any, bool]: Ответ и признак того, что он повторён из
+                сохранённого.
+        Raises:
+            IdempotencyConflictError: Если ключ использован с другим запросом.
+            IdempotencyInProgressError: Если дубликат не дождался завершения
+                первого запроса. Если первый запрос упал, не освободив ключ,
+                ключ захватывается заново после IDEMPOTENCY_LEASE_TIMEOUT.
+        """
+        if key is None:
+            return await handler(), False
+        fingerprint = self.__fingerprint(payload)
+        owner = uuid.uuid4().hex
+        lock_key = (user_id, scope, key)
+        lock = _local_locks.get(lock_key)
+        if lock is None:
+            lock = _local_locks[lock_key] = asyncio.Lock()
+        async with lock:
+            deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+            while True:
+                record, created = await self.repo.acquire(
+                    user_id,
+                    scope,
+                    key,
+                    fingerprint,
+                    settings.IDEMPOTENCY_KEY_TTL,
+                    settings.IDEMPOTENCY_LEASE_TIMEOUT,
+                    owner,
+                )
+                if created:
+                    break
+                if record is not None and record.fingerprint != fingerprint:
+                    raise IdempotencyConflictError
+                if record is not None and record.response_body is not None:
+                    return json.loads(record.response_body), True
+                if time.monotonic() >= deadline:
+                    raise IdempotencyInProgressError
+                await asyncio.sleep(settings.IDEMPOTENCY_POLL_INTERVAL)
+
+            async def renew_lease():
+                renewed = await self.repo.renew(
+                    user_id, scope, key, owner, settings.IDEMPOTENCY_LEASE_TIMEOUT
+                )
+                if not renewed:
+                    logging.warning(
+                        "Аренда ключа идемпотентности %s потеряна", lock_key
+                    )
+
+            # Аренда продлевается, пока обработчик выполняется, поэтому
+            # долгий запрос не теряет ключ. Если аренда всё же перехвачена,
+            # ответ и освобождение этого запроса к ключу не применяются
+            renewal = PeriodicTask(renew_lease, settings.IDEMPOTENCY_LEASE_TIMEOUT / 3)
+            renewal.start()
+            try:
+                result = await handler()
+            except BaseException:
+                await renewal.stop()
+                await self.repo.release(user_id, scope, key, owner)
+                raise
+            await renewal.stop()
+            response_body = scheme.model_validate(result).model_dump_json()
+            await self.repo.complete(user_id, scope, key, owner, response_body)
+            return result, False
+
+    async def purge_expired(self, batch_size: int, pause: float) -> int:
+        """
+        Удаляет пачками истёкшие ключи идемпотентности.
+        Args:
+            batch_size (int): Размер пачки.
+            pause (float): Пауза между пачками в секундах.
+        Returns:
+            int: Количество удалённых ключей.
+        """
+        deleted = 0
+        while True:
+            batch = await self.repo.delete_expired_batch(batch_size)
+            deleted += batch
+            if batch < batch_size:
+                return deleted
+            await asyncio.sleep(pause)
+
+    @staticmethod
+    def __fingerprint(payload: Any) -> str:
+        """Считает отпечаток параметров запроса
+
+        Args:
+            payload (Any): Параметры запроса
+
+        Returns:
+            str: SHA-256 от параметров запроса
+        """
+        data = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
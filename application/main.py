@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 import os
 import logging
@@ -9,10 +10,31 @@ from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from history_improvements.routers import router as history_improvements_router
+from history_improvements.services import ImprovedResumeTooLargeError
+from idempotency.services import IdempotencyConflictError, IdempotencyInProgressError
+from monitoring.routers import router as monitoring_router
+from notifications.routers import router as notifications_router
+from notifications.services import change_listener
+from outbox.relay import run_relay
+from rate_limits.middleware import RateLimitHeadersMiddleware, rate_limit_headers
+from rate_limits.routers import router as rate_limits_router
+from rate_limits.services import RateLimitExceededError
 from resumes.routers import router as resumes_router
 from settings import settings
 from utils.auth_service import AuthClient
+from utils.compression import CompressionMiddleware
+from utils.executors import ExecutorOverloadedError, run_in_executor
+from utils.lifecycle import shutdown, startup
+from utils.limits import BodySizeLimitMiddleware
+from utils.logs import RequestIdMiddleware
+from utils.loop_monitor import loop_monitor
+from utils.maintenance import run_maintenance
+from utils.scheduler import PeriodicTask
 from utils.tokens import JWTTokenService
+from similarity.routers import router as similarity_router
+from user_stats.routers import router as user_stats_router
+from versions.routers import router as versions_router
+from versions.services import ResumeVersionTooLargeError
 
 if not settings.TESTING:
     from uvicorn.workers import UvicornWorker
@@ -39,17 +61,26 @@ class AuthorizationMiddleware(BaseHTTPMiddleware):
                     content={"detail": "Доступ запрещен"},
                 )
             try:
-                auth_client = AuthClient()
-                public_key = await auth_client.get_public_key()
+                public_key = await AuthClient().get_public_key()
             except RuntimeError as e:
                 logging.error(e)
                 return JSONResponse(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     content={"detail": "Сервис временно не доступен"},
                 )
-            decode_token = JWTTokenService.decode_jwt_token(
-                access_token.replace("Bearer ", ""), public_key
-            )
+            try:
+                decode_token = await run_in_executor(
+                    "auth",
+                    JWTTokenService.decode_jwt_token,
+                    access_token.replace("Bearer ", ""),
+                    public_key,
+                )
+            except ExecutorOverloadedError:
+                return JSONResponse(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    content={"detail": "Сервис временно не доступен"},
+                    headers={"Retry-After": "1"},
+                )
             if decode_token is None or decode_token.get("type") != "access":
                 return JSONResponse(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -60,8 +91,30 @@ class AuthorizationMiddleware(BaseHTTPMiddleware):
         return response
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await startup()
+    tasks = []
+    if settings.MAINTENANCE_INTERVAL:
+        tasks.append(PeriodicTask(run_maintenance, settings.MAINTENANCE_INTERVAL))
+    if settings.OUTBOX_RELAY_SINK:
+        tasks.append(PeriodicTask(run_relay, settings.OUTBOX_RELAY_INTERVAL))
+    for task in tasks:
+        task.start()
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    yield
+    if settings.LOOP_MONITOR_ENABLED:
+        await loop_monitor.stop()
+    await change_listener.stop()
+    for task in tasks:
+        await task.stop()
+    await shutdown()
+
+
 app = FastAPI(
-    openapi_url="/api/v1/resumes/openapi.json"
+    openapi_url="/api/v1/resumes/openapi.json",
+    lifespan=lifespan,
 )
 
 if not settings.TESTING:
@@ -84,5 +137,82 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    level=settings.COMPRESSION_LEVEL,
+    cache_size=settings.COMPRESSION_CACHE_SIZE,
+    executor_min_size=settings.COMPRESSION_EXECUTOR_MIN_SIZE,
+)
+
+app.add_middleware(RateLimitHeadersMiddleware)
+
+app.add_middleware(BodySizeLimitMiddleware, max_size=settings.MAX_REQUEST_BODY_SIZE)
+
+app.add_middleware(RequestIdMiddleware)
+
+
+@app.exception_handler(IdempotencyConflictError)
+async def idempotency_conflict_handler(request: Request, exc: IdempotencyConflictError):
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": "Ключ идемпотентности уже использован с другим запросом"},
+    )
+
+
+@app.exception_handler(ImprovedResumeTooLargeError)
+async def improved_resume_too_large_handler(
+    request: Request, exc: ImprovedResumeTooLargeError
+):
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": "Улучшенное резюме превышает допустимый размер"},
+    )
+
+
+@app.exception_handler(ResumeVersionTooLargeError)
+async def resume_version_too_large_handler(
+    request: Request, exc: ResumeVersionTooLargeError
+):
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": "Версия резюме превышает допустимый размер"},
+    )
+
+
+@app.exception_handler(RateLimitExceededError)
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceededError):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Слишком много запросов"},
+        headers=rate_limit_headers(exc.decision),
+    )
+
+
+@app.exception_handler(ExecutorOverloadedError)
+async def executor_overloaded_handler(request: Request, exc: ExecutorOverloadedError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Сервис временно не доступен"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(IdempotencyInProgressError)
+async def idempotency_in_progress_handler(
+    request: Request, exc: IdempotencyInProgressError
+):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Запрос с этим ключом идемпотентности ещё выполняется"},
+    )
+
+
 app.include_router(resumes_router)
 app.include_router(history_improvements_router)
+app.include_router(versions_router)
+app.include_router(similarity_router)
+app.include_router(user_stats_router)
+app.include_router(rate_limits_router)
+app.include_router(monitoring_router)
+app.include_router(notifications_router)
@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import json
+
+from outbox.dependiences import outbox_service
+from outbox.relay import run_relay
+from resumes.dependiences import resumes_service
+from settings import settings
+from shards.dependiences import shards_service
+from similarity.dependiences import similarity_service
+from user_stats.dependiences import user_stats_service
+from utils.benchmark import benchmark_statements, benchmark_storage
+from utils.lifecycle import import_report
+from utils.maintenance import create_partitions, run_maintenance
+
+
+def maintenance(args: argparse.Namespace) -> None:
+    report = asyncio.run(
+        run_maintenance(
+            keep_last=args.keep_last,
+            max_age_days=args.max_age_days,
+            batch_size=args.batch_size,
+            versions_keep_last=args.versions_keep_last,
+        )
+    )
+    print(json.dumps(report, ensure_ascii=False))
+
+
+def partitions(args: argparse.Namespace) -> None:
+    created = asyncio.run(create_partitions(args.months_ahead))
+    print(json.dumps(created))
+
+
+def shards_move(args: argparse.Namespace) -> None:
+    moved = asyncio.run(shards_service().move_user(args.user_id, args.shard))
+    print(json.dumps(moved))
+
+
+def shards_pin(args: argparse.Namespace) -> None:
+    pinned = asyncio.run(shards_service().pin_users())
+    print(json.dumps(pinned))
+
+
+def shards_init_sequences(args: argparse.Namespace) -> None:
+    starts = asyncio.run(shards_service().init_sequences())
+    print(json.dumps(starts))
+
+
+def outbox_relay(args: argparse.Namespace) -> None:
+    published = asyncio.run(run_relay(args.sink))
+    print(json.dumps({"published": published}))
+
+
+async def read_events(consumer: str, limit: int, ack: bool) -> None:
+    service = outbox_service()
+    events = await service.read(consumer, limit)
+    for event in events:
+        print(json.dumps(event, ensure_ascii=False, default=str))
+    if ack:
+        await service.ack(consumer, events)
+
+
+def outbox_read(args: argparse.Namespace) -> None:
+    asyncio.run(read_events(args.consumer, args.limit, args.ack))
+
+
+def resumes_backfill_stats(args: argparse.Namespace) -> None:
+    updated = asyncio.run(
+        resumes_service().backfill_stats(
+            args.batch_size or settings.MAINTENANCE_BATCH_SIZE,
+            settings.MAINTENANCE_BATCH_PAUSE,
+        )
+    )
+    print(json.dumps({"updated": updated}))
+
+
+def similarity_backfill(args: argparse.Namespace) -> None:
+    signed = asyncio.run(
+        similarity_service().backfill(
+            args.batch_size or settings.MAINTENANCE_BATCH_SIZE,
+            settings.MAINTENANCE_BATCH_PAUSE,
+        )
+    )
+    print(json.dumps({"signed": signed}))
+
+
+def stats_reconcile(args: argparse.Namespace) -> None:
+    fixed = asyncio.run(
+        user_stats_service().reconcile(
+            args.batch_size or settings.MAINTENANCE_BATCH_SIZE,
+            settings.MAINTENANCE_BATCH_PAUSE,
+        )
+    )
+    print(json.dumps({"fixed": fixed}))
+
+
+def imports(args: argparse.Namespace) -> None:
+    for elem in import_report(args.module, args.top):
+        print(json.dumps(elem, ensure_ascii=False))
+
+
+def benchmark_statements_command(args: argparse.Namespace) -> None:
+    for elem in asyncio.run(benchmark_statements(args.iterations)):
+        print(json.dumps(elem))
+
+
+def benchmark_storage_command(args: argparse.Namespace) -> None:
+    for elem in asyncio.run(benchmark_storage(args.rows, args.iterations)):
+        print(json.dumps(elem))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Служебные команды сервиса резюме")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_maintenance = commands.add_parser(
+        "maintenance",
+        help="Очистка истории улучшений, удалённых резюме и ключей идемпотентности",
+    )
+    parser_maintenance.add_argument("--keep-last", type=int)
+    parser_maintenance.add_argument("--max-age-days", type=int)
+    parser_maintenance.add_argument("--batch-size", type=int)
+    parser_maintenance.add_argument("--versions-keep-last", type=int)
+    parser_maintenance.set_defaults(handler=maintenance)
+
+    parser_partitions = commands.add_parser(
+        "partitions", help="Создание месячных секций истории улучшений заранее"
+    )
+    parser_partitions.add_argument("--months-ahead", type=int)
+    parser_partitions.set_defaults(handler=partitions)
+
+    parser_shards = commands.add_parser("shards", help="Управление шардами")
+    shards_commands = parser_shards.add_subparsers(dest="shards_command", required=True)
+    parser_move = shards_commands.add_parser(
+        "move", help="Онлайн-перенос данных пользователя на другой шард"
+    )
+    parser_move.add_argument("--user-id", type=int, required=True)
+    parser_move.add_argument("--shard", type=int, required=True)
+    parser_move.set_defaults(handler=shards_move)
+    parser_pin = shards_commands.add_parser(
+        "pin", help="Закрепление пользователей в справочнике перед изменением кольца"
+    )
+    parser_pin.set_defaults(handler=shards_pin)
+    parser_sequences = shards_commands.add_parser(
+        "init-sequences",
+        help="Настройка непересекающихся идентификаторов на шардах",
+    )
+    parser_sequences.set_defaults(handler=shards_init_sequences)
+
+    parser_outbox = commands.add_parser("outbox", help="События изменений резюме")
+    outbox_commands = parser_outbox.add_subparsers(dest="outbox_command", required=True)
+    parser_relay = outbox_commands.add_parser(
+        "relay", help="Публикация новых событий в приёмник"
+    )
+    parser_relay.add_argument("--sink", help='"ndjson:<путь>" или "notify:<канал>"')
+    parser_relay.set_defaults(handler=outbox_relay)
+    parser_read = outbox_commands.add_parser(
+        "read", help="Чтение событий потребителем в формате NDJSON"
+    )
+    parser_read.add_argument("--consumer", required=True)
+    parser_read.add_argument("--limit", type=int, default=100)
+    parser_read.add_argument(
+        "--ack", action="store_true", help="Сдвинуть смещение за прочитанные события"
+    )
+    parser_read.set_defaults(handler=outbox_read)
+
+    parser_resumes = commands.add_parser("resumes", help="Обслуживание резюме")
+    resumes_commands = parser_resumes.add_subparsers(
+        dest="resumes_command", required=True
+    )
+    parser_backfill_stats = resumes_commands.add_parser(
+        "backfill-stats",
+        help="Расчёт статистики содержания резюме, созданных до её появления",
+    )
+    parser_backfill_stats.add_argument("--batch-size", type=int)
+    parser_backfill_stats.set_defaults(handler=resumes_backfill_stats)
+
+    parser_similarity = commands.add_parser("similarity", help="Поиск похожих резюме")
+    similarity_commands = parser_similarity.add_subparsers(
+        dest="similarity_command", required=True
+    )
+    parser_backfill = similarity_commands.add_parser(
+        "backfill", help="Расчёт сигнатур резюме, созданных до их появления"
+    )
+    parser_backfill.add_argument("--batch-size", type=int)
+    parser_backfill.set_defaults(handler=similarity_backfill)
+
+    parser_stats = commands.add_parser("stats", help="Счётчики пользователей")
+    stats_commands = parser_stats.add_subparsers(dest="stats_command", required=True)
+    parser_reconcile = stats_commands.add_parser(
+        "reconcile", help="Пересчёт счётчиков пользователей с нуля"
+    )
+    parser_reconcile.add_argument("--batch-size", type=int)
+    parser_reconcile.set_defaults(handler=stats_reconcile)
+
+    parser_imports = commands.add_parser(
+        "imports", help="Отчёт о самых долгих импортах при запуске воркера"
+    )
+    parser_imports.add_argument("--module", default="main")
+    parser_imports.add_argument("--top", type=int, default=20)
+    parser_imports.set_defaults(handler=imports)
+
+    parser_benchmark = commands.add_parser("benchmark", help="Замеры производительности")
+    benchmark_commands = parser_benchmark.add_subparsers(
+        dest="benchmark_command", required=True
+    )
+    parser_statements = benchmark_commands.add_parser(
+        "statements", help="Накладные расходы на поиск резюме по первичному ключу"
+    )
+    parser_statements.add_argument("--iterations", type=int, default=2000)
+    parser_statements.set_defaults(handler=benchmark_statements_command)
+    parser_storage = benchmark_commands.add_parser(
+        "storage", help="Списки и метаданные резюме до и после настройки хранения"
+    )
+    parser_storage.add_argument("--rows", type=int, default=20000)
+    parser_storage.add_argument("--iterations", type=int, default=500)
+    parser_storage.set_defaults(handler=benchmark_storage_command)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,14 @@ from sqlmodel import SQLModel
 
 from resumes.models import *
 from history_improvements.models import *
+from history_improvements.models import is_history_partition
+from idempotency.models import *
+from outbox.models import *
+from rate_limits.models import *
+from similarity.models import *
+from user_stats.models import *
+from shards.models import *
+from versions.models import *
 from settings import settings
 
 # this is the Alembic Config object, which provides
@@ -34,6 +42,13 @@ target_metadata = SQLModel.metadata
 # ... etc.
 
 
+def include_name(name, type_, parent_names):
+    # Секции истории улучшений создаются вне метаданных моделей
+    if type_ == "table":
+        return not is_history_partition(name)
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -52,7 +67,8 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
-        version_table="resumes_alembic_version"
+        version_table="resumes_alembic_version",
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -66,21 +82,29 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
-
-    with connectable.connect() as connection:
-        context.configure(
-            connection=connection, 
-            target_metadata=target_metadata,
-            version_table="resumes_alembic_version"
+    # Схема одинакова на всех шардах, миграции применяются к каждому
+    urls = [config.get_main_option("sqlalchemy.url")] + [
+        shard.split("|")[0] + "?async_fallback=True"
+        for shard in settings.POSTGRES_SHARD_URLS
+    ]
+    for url in urls:
+        connectable = engine_from_config(
+            config.get_section(config.config_ini_section, {}),
+            prefix="sqlalchemy.",
+            poolclass=pool.NullPool,
+            url=url,
         )
 
-        with context.begin_transaction():
-            context.run_migrations()
+        with connectable.connect() as connection:
+            context.configure(
+                connection=connection, 
+                target_metadata=target_metadata,
+                version_table="resumes_alembic_version",
+                include_name=include_name,
+            )
+
+            with context.begin_transaction():
+                context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,84 @@
+"""cascade resume deletion to improvement history
+
+Revision ID: 38fe1f09d9b4
+Revises: be0b873e9d84
+Create Date: 2025-09-18 14:03:27.560931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '38fe1f09d9b4'
+down_revision: Union[str, None] = 'be0b873e9d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('resumes', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.drop_constraint(
+        'resume_improvement_history_resume_id_fkey',
+        'resume_improvement_history',
+        type_='foreignkey',
+    )
+    # NOT VALID не проверяет существующие строки под блокировкой
+    # ACCESS EXCLUSIVE, которая держится до конца транзакции миграции
+    op.create_foreign_key(
+        'resume_improvement_history_resume_id_fkey',
+        'resume_improvement_history',
+        'resumes',
+        ['resume_id'],
+        ['id'],
+        ondelete='CASCADE',
+        postgresql_not_valid=True,
+    )
+    with op.get_context().autocommit_block():
+        # Транзакция с ADD CONSTRAINT уже зафиксирована, VALIDATE в своей
+        # транзакции берёт SHARE UPDATE EXCLUSIVE и не блокирует запись
+        op.execute(
+            'ALTER TABLE resume_improvement_history '
+            'VALIDATE CONSTRAINT resume_improvement_history_resume_id_fkey'
+        )
+        op.create_index(
+            op.f('ix_resume_improvement_history_resume_id'),
+            'resume_improvement_history',
+            ['resume_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_resumes_deleted_at',
+            'resumes',
+            ['deleted_at'],
+            unique=False,
+            postgresql_where=sa.text('deleted_at IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resumes_deleted_at', table_name='resumes')
+    op.drop_index(
+        op.f('ix_resume_improvement_history_resume_id'),
+        table_name='resume_improvement_history',
+    )
+    op.drop_constraint(
+        'resume_improvement_history_resume_id_fkey',
+        'resume_improvement_history',
+        type_='foreignkey',
+    )
+    op.create_foreign_key(
+        'resume_improvement_history_resume_id_fkey',
+        'resume_improvement_history',
+        'resumes',
+        ['resume_id'],
+        ['id'],
+    )
+    op.drop_column('resumes', 'deleted_at')
@@ -0,0 +1,67 @@
+"""resume length constraints
+
+Revision ID: 44d263640687
+Revises: 64e812f56094
+Create Date: 2026-10-19 11:28:23.606327
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '44d263640687'
+down_revision: Union[str, None] = '64e812f56094'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Ограничения по столбцам: (имя, столбец, наибольшая длина). Длины заданы
+# в миграции, а не берутся из настроек: схема не зависит от окружения
+CONSTRAINTS = (
+    ('ck_resumes_title_length', 'title', 255),
+    ('ck_resumes_content_length', 'content', 100000),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующие строки не изменяются: при нарушении ограничения миграция
+    # останавливается до изменения схемы со списком резюме, которые нужно
+    # исправить вручную
+    connection = op.get_bind()
+    for name, column, length in CONSTRAINTS:
+        violating = connection.execute(
+            sa.text(
+                f'SELECT id FROM resumes WHERE char_length({column}) > :length '
+                'ORDER BY id'
+            ),
+            {'length': length},
+        ).scalars().all()
+        if violating:
+            raise RuntimeError(
+                f'Столбец resumes.{column} длиннее {length} символов у резюме: '
+                f'{", ".join(map(str, violating))}. Исправьте строки и повторите '
+                'миграцию'
+            )
+    # NOT VALID не сканирует таблицу под блокировкой ACCESS EXCLUSIVE,
+    # которая держится до конца транзакции миграции. Новые и изменяемые
+    # строки проверяются сразу
+    for name, column, length in CONSTRAINTS:
+        op.execute(
+            f'ALTER TABLE resumes ADD CONSTRAINT {name} '
+            f'CHECK (char_length({column}) <= {length}) NOT VALID'
+        )
+    with op.get_context().autocommit_block():
+        # VALIDATE в своей транзакции берёт SHARE UPDATE EXCLUSIVE и не
+        # блокирует запись
+        for name, _, _ in CONSTRAINTS:
+            op.execute(f'ALTER TABLE resumes VALIDATE CONSTRAINT {name}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, _, _ in CONSTRAINTS:
+        op.drop_constraint(name, 'resumes', type_='check')
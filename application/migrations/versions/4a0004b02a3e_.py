@@ -0,0 +1,121 @@
+"""partition improvement history by month
+
+Revision ID: 4a0004b02a3e
+Revises: 38fe1f09d9b4
+Create Date: 2025-09-24 11:47:05.309114
+
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a0004b02a3e'
+down_revision: Union[str, None] = '38fe1f09d9b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+
+
+def next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('resume_improvement_history', 'resume_improvement_history_old')
+    op.execute(
+        'ALTER TABLE resume_improvement_history_old RENAME CONSTRAINT '
+        'resume_improvement_history_pkey TO resume_improvement_history_old_pkey'
+    )
+    op.execute(
+        'ALTER TABLE resume_improvement_history_old RENAME CONSTRAINT '
+        'resume_improvement_history_resume_id_fkey '
+        'TO resume_improvement_history_old_resume_id_fkey'
+    )
+    op.execute(
+        'ALTER INDEX ix_resume_improvement_history_resume_id '
+        'RENAME TO ix_resume_improvement_history_old_resume_id'
+    )
+    op.create_table('resume_improvement_history',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('resume_improvement_history_id_seq'::regclass)"), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('improved_content', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text("TIMEZONE('utc', now())"), nullable=False),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], name='resume_improvement_history_resume_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index(op.f('ix_resume_improvement_history_resume_id'), 'resume_improvement_history', ['resume_id'], unique=False)
+    op.execute(
+        'CREATE TABLE resume_improvement_history_default '
+        'PARTITION OF resume_improvement_history DEFAULT'
+    )
+    first = op.get_bind().scalar(
+        sa.text('SELECT min(created_at) FROM resume_improvement_history_old')
+    )
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    month = first.date().replace(day=1) if first else current
+    for _ in range(PARTITIONS_AHEAD):
+        current = next_month(current)
+    while month <= current:
+        op.execute(
+            f'CREATE TABLE resume_improvement_history_p{month:%Y_%m} '
+            'PARTITION OF resume_improvement_history '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        )
+        month = next_month(month)
+    op.execute(
+        'INSERT INTO resume_improvement_history '
+        '(id, resume_id, improved_content, created_at) '
+        'SELECT id, resume_id, improved_content, created_at '
+        'FROM resume_improvement_history_old'
+    )
+    op.execute(
+        'ALTER SEQUENCE resume_improvement_history_id_seq '
+        'OWNED BY resume_improvement_history.id'
+    )
+    op.drop_table('resume_improvement_history_old')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('resume_improvement_history', 'resume_improvement_history_old')
+    op.execute(
+        'ALTER INDEX ix_resume_improvement_history_resume_id '
+        'RENAME TO ix_resume_improvement_history_old_resume_id'
+    )
+    op.execute(
+        'ALTER TABLE resume_improvement_history_old RENAME CONSTRAINT '
+        'resume_improvement_history_pkey TO resume_improvement_history_old_pkey'
+    )
+    op.execute(
+        'ALTER TABLE resume_improvement_history_old RENAME CONSTRAINT '
+        'resume_improvement_history_resume_id_fkey '
+        'TO resume_improvement_history_old_resume_id_fkey'
+    )
+    op.create_table('resume_improvement_history',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('resume_improvement_history_id_seq'::regclass)"), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('improved_content', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text("TIMEZONE('utc', now())"), nullable=False),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], name='resume_improvement_history_resume_id_fkey', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resume_improvement_history_resume_id'), 'resume_improvement_history', ['resume_id'], unique=False)
+    op.execute(
+        'INSERT INTO resume_improvement_history '
+        '(id, resume_id, improved_content, created_at) '
+        'SELECT id, resume_id, improved_content, created_at '
+        'FROM resume_improvement_history_old'
+    )
+    op.execute(
+        'ALTER SEQUENCE resume_improvement_history_id_seq '
+        'OWNED BY resume_improvement_history.id'
+    )
+    op.drop_table('resume_improvement_history_old')
@@ -0,0 +1,65 @@
+"""content compression and storage
+
+Revision ID: dc333a914e85
+Revises: 973deeea7b94
+Create Date: 2026-10-19 11:52:46.138031
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'dc333a914e85'
+down_revision: Union[str, None] = '973deeea7b94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONTENT_COLUMNS = {
+    'resumes': 'content',
+    'resume_improvement_history': 'improved_content',
+}
+TOAST_TUPLE_TARGET = 256
+
+
+def set_compression(table: str, column: str, method: str) -> None:
+    # Сервер без поддержки lz4 оставляет pglz
+    op.execute(
+        'DO $$ BEGIN '
+        f'ALTER TABLE {table} ALTER COLUMN {column} SET COMPRESSION {method}; '
+        'EXCEPTION WHEN feature_not_supported THEN '
+        f"RAISE NOTICE 'Сжатие {method} не поддерживается'; "
+        'END $$'
+    )
+
+
+def history_partitions() -> list:
+    return op.get_bind().scalars(
+        sa.text(
+            'SELECT inhrelid::regclass::text FROM pg_inherits '
+            "WHERE inhparent = 'resume_improvement_history'::regclass"
+        )
+    ).all()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Метод сжатия и параметры хранения применяются к новым и изменённым
+    # строкам, существующие строки не перезаписываются
+    for table, column in CONTENT_COLUMNS.items():
+        set_compression(table, column, 'lz4')
+    # У секционированной таблицы параметры хранения задаются у секций
+    for table in ['resumes', *history_partitions()]:
+        op.execute(
+            f'ALTER TABLE {table} SET (toast_tuple_target = {TOAST_TUPLE_TARGET})'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ['resumes', *history_partitions()]:
+        op.execute(f'ALTER TABLE {table} RESET (toast_tuple_target)')
+    for table, column in CONTENT_COLUMNS.items():
+        set_compression(table, column, 'default')
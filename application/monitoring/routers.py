@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+
+from base_dependiences import get_current_user
+from monitoring.schemes import WorkerMetricsScheme
+from notifications.services import change_listener
+from utils.executors import executors
+from utils.loop_monitor import loop_monitor
+
+router = APIRouter(
+    prefix="/api/v1/monitoring",
+    tags=["Monitoring"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/worker", response_model=WorkerMetricsScheme)
+async def get_worker_metrics():
+    """
+    Получить метрики воркера: гистограмму задержки цикла событий,
+    состояние пулов для блокирующих вызовов и слушателя уведомлений.
+
+    Returns:
+        WorkerMetricsScheme: Метрики воркера с момента запуска.
+    """
+    return ORJSONResponse(
+        {
+            "loop_lag": loop_monitor.histogram.snapshot(),
+            "executors": {
+                name: executor.metrics() for name, executor in executors.items()
+            },
+            "changes": change_listener.metrics(),
+        }
+    )
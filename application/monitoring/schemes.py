@@ -0,0 +1,40 @@
+from typing import Dict
+
+from sqlmodel import SQLModel
+
+
+class LoopLagScheme(SQLModel):
+    """Схема гистограммы задержки цикла событий."""
+
+    buckets_ms: Dict[str, int]
+    count: int
+    sum_ms: float
+    max_ms: float
+
+
+class ExecutorMetricsScheme(SQLModel):
+    """Схема состояния пула потоков или процессов."""
+
+    kind: str
+    max_workers: int
+    queue_size: int
+    in_flight: int
+    completed: int
+    rejected: int
+
+
+class ChangeListenerMetricsScheme(SQLModel):
+    """Схема состояния слушателя уведомлений об изменениях."""
+
+    subscribers: int
+    connected: int
+    delivered: int
+    overflows: int
+
+
+class WorkerMetricsScheme(SQLModel):
+    """Схема метрик воркера."""
+
+    loop_lag: LoopLagScheme
+    executors: Dict[str, ExecutorMetricsScheme]
+    changes: ChangeListenerMetricsScheme
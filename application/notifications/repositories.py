@@ -0,0 +1,67 @@
+from typing import List
+
+import orjson
+from sqlalchemy import String, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from outbox.models import OutboxEvent
+from settings import settings
+
+
+def change_payload(event: OutboxEvent) -> dict:
+    """Уведомление об изменении для подписчиков пользователя
+
+    Args:
+        event (OutboxEvent): Событие изменения резюме
+
+    Returns:
+        dict: Тип события, идентификаторы пользователя и резюме и данные события
+    """
+    return {
+        "type": event.event_type,
+        "user_id": event.user_id,
+        "resume_id": event.resume_id,
+        **event.payload,
+    }
+
+
+async def notify_change(session: AsyncSession, event: OutboxEvent) -> None:
+    """Отправляет NOTIFY об изменении в переданной сессии: уведомление
+    доставляется слушателям только после фиксации транзакции изменения
+
+    Args:
+        session (AsyncSession): Сессия, записывающая изменение
+        event (OutboxEvent): Событие изменения резюме
+    """
+    await session.execute(
+        select(
+            func.pg_notify(
+                settings.CHANGES_CHANNEL, orjson.dumps(change_payload(event)).decode()
+            )
+        )
+    )
+
+
+async def notify_changes(session: AsyncSession, events: List[OutboxEvent]) -> None:
+    """Отправляет NOTIFY о каждом изменении пачки одним запросом в
+    переданной сессии
+
+    Args:
+        session (AsyncSession): Сессия, записывающая изменения
+        events (List[OutboxEvent]): События изменения резюме
+    """
+    if not events:
+        return
+    payloads = select(
+        func.unnest(
+            bindparam(
+                "payloads",
+                [orjson.dumps(change_payload(event)).decode() for event in events],
+                type_=ARRAY(String),
+            )
+        ).column_valued("payload")
+    ).subquery()
+    await session.execute(
+        select(func.pg_notify(settings.CHANGES_CHANNEL, payloads.c.payload))
+    )
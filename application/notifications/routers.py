@@ -0,0 +1,64 @@
+from typing import AsyncIterator
+
+import orjson
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from base_dependiences import get_current_user
+from notifications.services import change_listener
+from settings import settings
+
+router = APIRouter(
+    prefix="/api/v1/changes",
+    tags=["Changes"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+async def change_stream(user_id: int) -> AsyncIterator[bytes]:
+    """Поток Server-Sent Events с уведомлениями пользователя и комментариями
+    ping каждые CHANGES_HEARTBEAT_INTERVAL секунд без событий, чтобы прокси
+    не закрывали простаивающее соединение
+
+    Args:
+        user_id (int): Идентификатор пользователя
+
+    Yields:
+        bytes: Сообщения text/event-stream
+    """
+    async with change_listener.subscribe(user_id) as subscriber:
+        yield f"retry: {int(settings.CHANGES_RECONNECT_INTERVAL * 1000)}\n\n".encode()
+        while True:
+            event = await subscriber.get(settings.CHANGES_HEARTBEAT_INTERVAL)
+            if event is None:
+                yield b": ping\n\n"
+                continue
+            yield (
+                f"event: {event['type']}\n".encode()
+                + b"data: "
+                + orjson.dumps(event)
+                + b"\n\n"
+            )
+
+
+@router.get("/stream")
+async def stream_changes(request: Request):
+    """
+    Поток уведомлений об изменениях резюме пользователя (Server-Sent Events)
+    вместо периодического опроса списков и истории.
+
+    События: resume.created, resume.updated, resume.deleted, resume.improved,
+    resume.reverted. Событие resync означает, что часть уведомлений потеряна
+    (клиент не успевал читать или прерывалось соединение с БД) и данные
+    нужно перечитать.
+
+    Args:
+        request (Request): Объект FastAPI Request для извлечения user_id.
+    Returns:
+        StreamingResponse: Поток text/event-stream.
+    """
+    return StreamingResponse(
+        change_stream(request.state.user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+import orjson
+
+from database import Shard, shards
+from settings import settings
+
+# Событие, после которого клиент должен перечитать данные: часть уведомлений
+# могла быть потеряна из-за переполнения очереди или переподключения
+RESYNC_EVENT = {"type": "resync"}
+
+
+class ChangeSubscriber:
+    """
+    Подписчик на уведомления об изменениях резюме пользователя с
+    ограниченной очередью.
+    """
+
+    def __init__(self, user_id: int, queue_size: int):
+        """
+        Инициализация подписчика.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            queue_size (int): Максимальное количество недоставленных событий.
+        """
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.overflows = 0
+
+    def push(self, event: dict) -> bool:
+        """
+        Кладёт событие в очередь. Если клиент не успевает читать и очередь
+        заполнена, недоставленные события отбрасываются и заменяются
+        событием resync, чтобы медленный клиент не накапливал память.
+        Args:
+            event (dict): Событие.
+        Returns:
+            bool: False, если очередь была переполнена.
+        """
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+            self.overflows += 1
+            return False
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """
+        Ждёт следующее событие.
+        Args:
+            timeout (float): Время ожидания в секундах.
+        Returns:
+            Optional[dict]: Событие или None, если за timeout событий не было.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ChangeListener:
+    """
+    Слушатель канала LISTEN/NOTIFY с уведомлениями об изменениях резюме.
+
+    Воркер держит одно соединение на основной сервер каждого шарда
+    независимо от количества подписчиков и раздаёт уведомления подписчикам
+    пользователя. Соединения открываются при первой подписке и
+    восстанавливаются после обрыва, подписчики при этом получают resync.
+    """
+
+    def __init__(self, channel: str):
+        """
+        Инициализация слушателя.
+        Args:
+            channel (str): Канал LISTEN/NOTIFY.
+        """
+        self.channel = channel
+        self.subscribers: Dict[int, Set[ChangeSubscriber]] = {}
+        self.connected = 0
+        self.delivered = 0
+        self.overflows = 0
+        self._tasks: List[asyncio.Task] = []
+        self._ready: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Запускает прослушивание канала на всех шардах, если оно ещё не
+        запущено."""
+        if self._tasks:
+            return
+        self._ready = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self.__listen(shard), name=f"listen-{shard.index}")
+            for shard in shards
+        ]
+
+    async def stop(self) -> None:
+        """Останавливает прослушивание и закрывает соединения."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """
+        Ждёт, пока слушатель подключится ко всем шардам.
+        Args:
+            timeout (float): Время ожидания в секундах.
+        Returns:
+            bool: True, если слушатель подключён.
+        """
+        if self._ready is None:
+            return False
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[ChangeSubscriber]:
+        """
+        Подписывает на уведомления пользователя до выхода из контекста.
+        Args:
+            user_id (int): Идентификатор пользователя.
+        """
+        self.start()
+        subscriber = ChangeSubscriber(user_id, settings.CHANGES_QUEUE_SIZE)
+        self.subscribers.setdefault(user_id, set()).add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            user_subscribers = self.subscribers[user_id]
+            user_subscribers.discard(subscriber)
+            if not user_subscribers:
+                del self.subscribers[user_id]
+
+    def metrics(self) -> dict:
+        """Количество подписчиков, подключённых шардов, доставленных событий
+        и переполнений очередей подписчиков"""
+        return {
+            "subscribers": sum(len(elem) for elem in self.subscribers.values()),
+            "connected": self.connected,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+    def broadcast(self, event: dict) -> None:
+        """
+        Раздаёт событие подписчикам пользователя события, а событие без
+        пользователя - всем подписчикам.
+        Args:
+            event (dict): Событие.
+        """
+        user_id = event.get("user_id")
+        if user_id is None:
+            targets = [elem for group in self.subscribers.values() for elem in group]
+        else:
+            targets = self.subscribers.get(user_id, ())
+        for subscriber in targets:
+            if subscriber.push(event):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+
+    def __on_notification(
+        self, connection, pid: int, channel: str, payload: str
+    ) -> None:
+        try:
+            event = orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            logging.warning("Некорректное уведомление в канале %s: %s", channel, payload)
+            return
+        self.broadcast(event)
+
+    async def __listen(self, shard: Shard) -> None:
+        """Держит соединение LISTEN с основным сервером шарда, переподключаясь
+        после обрыва"""
+        reconnect = False
+        while True:
+            connection = None
+            try:
+                connection = await shard.engine.connect()
+                raw = (await connection.get_raw_connection()).driver_connection
+                lost = asyncio.Event()
+                raw.add_termination_listener(lambda _: lost.set())
+                await raw.add_listener(self.channel, self.__on_notification)
+                self.connected += 1
+                if self.connected == len(shards):
+                    self._ready.set()
+                if reconnect:
+                    # Уведомления, отправленные во время обрыва, потеряны
+                    self.broadcast(RESYNC_EVENT)
+                try:
+                    await lost.wait()
+                finally:
+                    self.connected -= 1
+                    self._ready.clear()
+                logging.warning("Соединение LISTEN с шардом %s потеряно", shard.index)
+            except Exception as e:
+                logging.warning(
+                    "Не удалось подписаться на уведомления шарда %s: %s", shard.index, e
+                )
+            finally:
+                if connection is not None:
+                    # Соединение с LISTEN не возвращается в пул
+                    await connection.invalidate()
+                    await connection.close()
+            reconnect = True
+            await asyncio.sleep(settings.CHANGES_RECONNECT_INTERVAL)
+
+
+# Одно соединение LISTEN на шард для всех подписчиков воркера
+change_listener = ChangeListener(settings.CHANGES_CHANNEL)
@@ -0,0 +1,6 @@
+from outbox.repositories import OutboxPostgreSQLRepository
+from outbox.services import OutboxService
+
+
+def outbox_service():
+    return OutboxService(OutboxPostgreSQLRepository)
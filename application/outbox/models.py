@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Column, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import SQLModel, Field, text
+
+RESUME_CREATED = "resume.created"
+RESUME_UPDATED = "resume.updated"
+RESUME_DELETED = "resume.deleted"
+RESUME_IMPROVED = "resume.improved"
+RESUME_REVERTED = "resume.reverted"
+
+
+class OutboxEvent(SQLModel, table=True):
+    """
+    ORM-модель события изменения резюме, записываемого в той же транзакции,
+    что и само изменение.
+
+    Порядок событий задаётся парой (transaction_id, id): события читаются
+    только из транзакций младше горизонта pg_snapshot_xmin, поэтому
+    транзакция, завершившаяся позже, не может оказаться позади
+    прочитанного смещения.
+
+    Attrs:
+        id (int): Идентификатор события (Primary Key).
+        transaction_id (int): Идентификатор транзакции, записавшей событие.
+        event_type (str): Тип события.
+        user_id (int): Идентификатор пользователя.
+        resume_id (int): Идентификатор резюме.
+        payload (dict): Данные события.
+        created_at (datetime): Дата и время создания события.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index("ix_outbox_events_position", "transaction_id", "id"),
+        {"extend_existing": True},
+    )
+    id: Optional[int] = Field(
+        default=None, sa_column=Column(BigInteger, primary_key=True)
+    )
+    transaction_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(
+            BigInteger,
+            nullable=False,
+            server_default=text("pg_current_xact_id()::text::bigint"),
+        ),
+    )
+    event_type: str
+    user_id: int
+    resume_id: int
+    payload: dict = Field(default_factory=dict, sa_type=JSONB)
+    created_at: datetime = Field(
+        sa_column_kwargs={"server_default": text("TIMEZONE('utc', now())")},
+        index=True,
+    )
+
+
+class OutboxOffset(SQLModel, table=True):
+    """
+    ORM-модель смещения потребителя событий на шарде.
+    Attrs:
+        consumer (str): Имя потребителя (Primary Key).
+        shard (int): Номер шарда (Primary Key).
+        transaction_id (int): Транзакция последнего обработанного события.
+        event_id (int): Идентификатор последнего обработанного события.
+    """
+
+    __tablename__ = "outbox_offsets"
+    __table_args__ = {"extend_existing": True}
+    consumer: str = Field(primary_key=True)
+    shard: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    transaction_id: int = Field(sa_type=BigInteger)
+    event_id: int = Field(sa_type=BigInteger)
+
+
+def outbox_event(
+    event_type: str, user_id: int, resume_id: int, **payload
+) -> OutboxEvent:
+    """Создаёт событие для записи в той же сессии, что и изменение
+
+    Args:
+        event_type (str): Тип события
+        user_id (int): Идентификатор пользователя
+        resume_id (int): Идентификатор резюме
+        **payload: Данные события
+
+    Returns:
+        OutboxEvent: Событие
+    """
+    return OutboxEvent(
+        event_type=event_type, user_id=user_id, resume_id=resume_id, payload=payload
+    )
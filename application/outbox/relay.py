@@ -0,0 +1,37 @@
+import logging
+from typing import Optional
+
+from outbox.dependiences import outbox_service
+from outbox.sinks import create_sink
+from settings import settings
+from utils.maintenance import maintenance_lock
+
+# Ключ advisory lock, чтобы события ретранслировал один воркер
+OUTBOX_RELAY_LOCK_ID = 7_310_429
+
+# Имя потребителя, под которым хранится смещение ретранслятора
+OUTBOX_RELAY_CONSUMER = "relay"
+
+
+async def run_relay(sink_url: Optional[str] = None) -> int:
+    """Публикует новые события изменений резюме в приёмник.
+
+    Args:
+        sink_url (Optional[str]): Приёмник вида "ndjson:<путь>" или
+            "notify:<канал>", по умолчанию OUTBOX_RELAY_SINK.
+
+    Returns:
+        int: Количество опубликованных событий.
+    """
+    sink_url = sink_url or settings.OUTBOX_RELAY_SINK
+    async with maintenance_lock(OUTBOX_RELAY_LOCK_ID) as locked:
+        if not locked:
+            return 0
+        published = await outbox_service().relay(
+            create_sink(sink_url),
+            f"{OUTBOX_RELAY_CONSUMER}:{sink_url}",
+            settings.OUTBOX_BATCH_SIZE,
+        )
+    if published:
+        logging.info("Опубликовано событий изменений резюме: %s", published)
+    return published
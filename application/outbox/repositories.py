@@ -0,0 +1,157 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Tuple
+from sqlalchemy import BigInteger, Text, cast, delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from database import shards
+from outbox.models import OutboxEvent, OutboxOffset
+
+
+class OutboxAbstractRepository(ABC):
+    """
+    Абстрактный репозиторий для работы с событиями изменений резюме.
+
+    Определяет интерфейс операций:
+    - чтение событий после смещения;
+    - чтение и сохранение смещений потребителя;
+    - удаление устаревших событий.
+    """
+
+    @abstractmethod
+    async def get_events_after(
+        self, shard: int, position: Tuple[int, int], limit: int
+    ) -> List[dict]:
+        """
+        Получает события шарда из завершённых транзакций после смещения.
+        Args:
+            shard (int): Номер шарда.
+            position (Tuple[int, int]): Смещение (transaction_id, id).
+            limit (int): Количество событий.
+        Returns:
+            List[dict]: События в порядке (transaction_id, id).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_offsets(self, consumer: str) -> Dict[int, Tuple[int, int]]:
+        """
+        Получает смещения потребителя.
+        Args:
+            consumer (str): Имя потребителя.
+        Returns:
+            Dict[int, Tuple[int, int]]: Смещение по номерам шардов.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_offsets(
+        self, consumer: str, offsets: Dict[int, Tuple[int, int]]
+    ) -> None:
+        """
+        Сохраняет смещения потребителя.
+        Args:
+            consumer (str): Имя потребителя.
+            offsets (Dict[int, Tuple[int, int]]): Смещение по номерам шардов.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_expired_batch(
+        self, shard: int, older_than: datetime, batch_size: int
+    ) -> int:
+        """
+        Удаляет пачку событий шарда, созданных раньше older_than.
+        Args:
+            shard (int): Номер шарда.
+            older_than (datetime): Граница по дате создания (UTC).
+            batch_size (int): Размер пачки.
+        Returns:
+            int: Количество удалённых событий.
+        """
+        raise NotImplementedError
+
+
+class OutboxPostgreSQLRepository(OutboxAbstractRepository):
+    """
+    Реализация репозитория событий изменений резюме с использованием
+    PostgreSQL (SQLModel + AsyncSession). Смещения потребителей хранятся
+    на нулевом шарде.
+    """
+
+    @staticmethod
+    async def get_events_after(
+        shard: int, position: Tuple[int, int], limit: int
+    ) -> List[dict]:
+        horizon = cast(
+            cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger
+        )
+        async with shards[shard].session() as session:
+            query = (
+                select(OutboxEvent.__table__)
+                .where(
+                    tuple_(OutboxEvent.transaction_id, OutboxEvent.id)
+                    > tuple_(*position),
+                    OutboxEvent.transaction_id < horizon,
+                )
+                .order_by(OutboxEvent.transaction_id, OutboxEvent.id)
+                .limit(limit)
+            )
+            result = await session.execute(query)
+            keys = list(result.keys())
+            return [dict(zip(keys, row)) for row in result]
+
+    @staticmethod
+    async def get_offsets(consumer: str) -> Dict[int, Tuple[int, int]]:
+        async with shards[0].session() as session:
+            query = select(
+                OutboxOffset.shard, OutboxOffset.transaction_id, OutboxOffset.event_id
+            ).where(OutboxOffset.consumer == consumer)
+            result = await session.execute(query)
+            return {
+                shard: (transaction_id, event_id)
+                for shard, transaction_id, event_id in result
+            }
+
+    @staticmethod
+    async def save_offsets(consumer: str, offsets: Dict[int, Tuple[int, int]]) -> None:
+        if not offsets:
+            return
+        async with shards[0].session() as session:
+            query = insert(OutboxOffset).values(
+                [
+                    {
+                        "consumer": consumer,
+                        "shard": shard,
+                        "transaction_id": transaction_id,
+                        "event_id": event_id,
+                    }
+                    for shard, (transaction_id, event_id) in offsets.items()
+                ]
+            )
+            query = query.on_conflict_do_update(
+                index_elements=[OutboxOffset.consumer, OutboxOffset.shard],
+                set_={
+                    "transaction_id": query.excluded.transaction_id,
+                    "event_id": query.excluded.event_id,
+                },
+            )
+            await session.execute(query)
+            await session.commit()
+
+    @staticmethod
+    async def delete_expired_batch(
+        shard: int, older_than: datetime, batch_size: int
+    ) -> int:
+        async with shards[shard].session() as session:
+            expired = (
+                select(OutboxEvent.id)
+                .where(OutboxEvent.created_at < older_than)
+                .limit(batch_size)
+            )
+            query = delete(OutboxEvent).where(
+                OutboxEvent.id.in_(expired.scalar_subquery())
+            ).execution_options(synchronize_session=False)
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from database import shards
+from outbox.repositories import OutboxAbstractRepository
+from outbox.sinks import OutboxSink
+
+
+class OutboxService:
+    """
+    Сервис событий изменений резюме.
+    Инкапсулирует бизнес-логику:
+    - чтение событий потребителем начиная с сохранённого смещения;
+    - подтверждение обработки событий;
+    - ретрансляцию событий в приёмник;
+    - удаление устаревших событий.
+
+    Внешние зависимости: OutboxAbstractRepository.
+    """
+
+    def __init__(self, repo: OutboxAbstractRepository):
+        """
+        Инициализация сервиса событий.
+        Args:
+            repo (OutboxAbstractRepository): Репозиторий для работы с БД.
+        """
+        self.repo: OutboxAbstractRepository = repo
+
+    async def read(self, consumer: str, limit: int) -> List[dict]:
+        """
+        Получает необработанные потребителем события со всех шардов.
+        Смещение не сдвигается до вызова ack, поэтому доставка
+        выполняется не менее одного раза.
+        Args:
+            consumer (str): Имя потребителя.
+            limit (int): Максимальное количество событий с шарда.
+        Returns:
+            List[dict]: События с номером шарда в поле shard.
+        """
+        offsets = await self.repo.get_offsets(consumer)
+        events = []
+        for shard in shards:
+            position = offsets.get(shard.index, (0, 0))
+            for event in await self.repo.get_events_after(shard.index, position, limit):
+                event["shard"] = shard.index
+                events.append(event)
+        return events
+
+    async def ack(self, consumer: str, events: List[dict]) -> None:
+        """
+        Сдвигает смещения потребителя за обработанные события.
+        Args:
+            consumer (str): Имя потребителя.
+            events (List[dict]): События, полученные методом read.
+        """
+        offsets = {}
+        for event in events:
+            position = (event["transaction_id"], event["id"])
+            shard = event["shard"]
+            offsets[shard] = max(offsets.get(shard, position), position)
+        await self.repo.save_offsets(consumer, offsets)
+
+    async def relay(self, sink: OutboxSink, consumer: str, batch_size: int) -> int:
+        """
+        Публикует пачки новых событий в приёмник, пока они есть.
+        Args:
+            sink (OutboxSink): Приёмник событий.
+            consumer (str): Имя потребителя, под которым хранится смещение
+                ретранслятора.
+            batch_size (int): Размер пачки с шарда.
+        Returns:
+            int: Количество опубликованных событий.
+        """
+        published = 0
+        while True:
+            events = await self.read(consumer, batch_size)
+            if not events:
+                return published
+            await sink.publish(events)
+            await self.ack(consumer, events)
+            published += len(events)
+
+    async def purge_expired(
+        self, retention_days: int, batch_size: int, pause: float
+    ) -> int:
+        """
+        Удаляет пачками события старше retention_days дней.
+        Args:
+            retention_days (int): Срок хранения событий в днях.
+            batch_size (int): Размер пачки.
+            pause (float): Пауза между пачками в секундах.
+        Returns:
+            int: Количество удалённых событий.
+        """
+        older_than = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(
+            days=retention_days
+        )
+        deleted = 0
+        for shard in shards:
+            while True:
+                batch = await self.repo.delete_expired_batch(
+                    shard.index, older_than, batch_size
+                )
+                deleted += batch
+                if batch < batch_size:
+                    break
+                await asyncio.sleep(pause)
+        return deleted
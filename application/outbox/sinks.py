@@ -0,0 +1,90 @@
+import asyncio
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List
+
+import orjson
+from sqlalchemy import func, select
+
+from database import shards
+
+
+class OutboxSink(ABC):
+    """
+    Приёмник, в который ретранслятор публикует события изменений резюме.
+    """
+
+    @abstractmethod
+    async def publish(self, events: List[dict]) -> None:
+        """
+        Публикует пачку событий. Ошибка публикации оставляет смещение
+        ретранслятора на месте, и пачка будет опубликована повторно.
+        Args:
+            events (List[dict]): События в порядке публикации.
+        """
+        raise NotImplementedError
+
+
+class NDJSONFileSink(OutboxSink):
+    """
+    Дописывает события в файл, по одному JSON-объекту на строку.
+    """
+
+    def __init__(self, path: str):
+        """
+        Инициализация приёмника.
+        Args:
+            path (str): Путь к файлу.
+        """
+        self.path = Path(path)
+
+    async def publish(self, events: List[dict]) -> None:
+        data = b"".join(orjson.dumps(event) + b"\n" for event in events)
+        await asyncio.to_thread(self.__append, data)
+
+    def __append(self, data: bytes) -> None:
+        with self.path.open("ab") as file:
+            file.write(data)
+
+
+class PostgresNotifySink(OutboxSink):
+    """
+    Публикует события через NOTIFY на нулевом шарде. Уведомления
+    доставляются слушателям одной транзакцией после фиксации.
+    """
+
+    def __init__(self, channel: str):
+        """
+        Инициализация приёмника.
+        Args:
+            channel (str): Канал LISTEN/NOTIFY.
+        """
+        self.channel = channel
+
+    async def publish(self, events: List[dict]) -> None:
+        async with shards[0].session() as session:
+            for event in events:
+                await session.execute(
+                    select(func.pg_notify(self.channel, orjson.dumps(event).decode()))
+                )
+            await session.commit()
+
+
+def create_sink(url: str) -> OutboxSink:
+    """Создаёт приёмник по строке вида "ndjson:<путь>" или "notify:<канал>"
+
+    Args:
+        url (str): Описание приёмника
+
+    Raises:
+        ValueError: Если тип приёмника неизвестен
+
+    Returns:
+        OutboxSink: Приёмник событий
+    """
+    kind, _, target = url.partition(":")
+    if kind == "ndjson":
+        return NDJSONFileSink(target)
+    if kind == "notify":
+        return PostgresNotifySink(target)
+    raise ValueError(f"Неизвестный приёмник событий: {url}")
@@ -0,0 +1,46 @@
+from fastapi import Depends, Request
+
+from rate_limits.repositories import RateLimitsPostgreSQLRepository
+from rate_limits.services import RateLimitService
+
+# Корзины в памяти хранятся между запросами, поэтому сервис один на воркер
+_service = RateLimitService(RateLimitsPostgreSQLRepository)
+
+# Ключ в request.state с результатом проверки для заголовков RateLimit-*
+RATE_LIMIT_STATE = "rate_limit"
+
+
+def rate_limit_service() -> RateLimitService:
+    return _service
+
+
+async def enforce_rate_limit(request: Request, group: str, cost: int = 1) -> None:
+    """Списывает токены пользователя запроса и сохраняет результат для
+    заголовков ответа
+
+    Args:
+        request (Request): Запрос с user_id в request.state
+        group (str): Группа маршрутов из RATE_LIMITS
+        cost (int): Стоимость запроса в токенах
+
+    Raises:
+        RateLimitExceededError: Если токенов недостаточно
+    """
+    decision = await _service.take(request.state.user_id, group, cost)
+    setattr(request.state, RATE_LIMIT_STATE, decision)
+
+
+def rate_limit(group: str):
+    """Зависимость маршрута, ограничивающая частоту запросов пользователя
+
+    Args:
+        group (str): Группа маршрутов из RATE_LIMITS
+
+    Returns:
+        Зависимость FastAPI
+    """
+
+    async def dependency(request: Request) -> None:
+        await enforce_rate_limit(request, group)
+
+    return Depends(dependency)
@@ -0,0 +1,58 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from rate_limits.dependiences import RATE_LIMIT_STATE
+from rate_limits.services import RateLimitDecision
+
+
+def rate_limit_headers(decision: RateLimitDecision) -> dict:
+    """Заголовки RateLimit-* для результата проверки
+
+    Args:
+        decision (RateLimitDecision): Результат проверки
+
+    Returns:
+        dict: Заголовки ответа
+    """
+    headers = {
+        "RateLimit-Policy": f"{decision.limit};w={decision.period:g}",
+        "RateLimit-Limit": str(decision.limit),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(decision.reset),
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(decision.retry_after)
+    return headers
+
+
+class RateLimitHeadersMiddleware:
+    """
+    ASGI middleware, добавляющее заголовки RateLimit-* к ответам маршрутов
+    с ограничением частоты запросов. Результат проверки сохраняет
+    зависимость rate_limit в request.state, поэтому заголовки попадают и
+    в ответы, которые маршрут возвращает сам (ORJSONResponse).
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Инициализация middleware.
+        Args:
+            app (ASGIApp): ASGI-приложение.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+
+        async def send_with_headers(message: Message) -> None:
+            decision = state.get(RATE_LIMIT_STATE)
+            if message["type"] == "http.response.start" and decision is not None:
+                headers = MutableHeaders(scope=message)
+                for name, value in rate_limit_headers(decision).items():
+                    headers.setdefault(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlmodel import SQLModel, Field
+
+
+class RateLimitBucket(SQLModel, table=True):
+    """
+    ORM-модель корзины токенов пользователя, общей для всех воркеров
+    (RATE_LIMIT_BACKEND=postgres). Хранится на нулевом шарде.
+    Attrs:
+        user_id (int): Идентификатор пользователя (Primary Key).
+        group (str): Группа маршрутов (Primary Key).
+        tokens (float): Количество токенов на момент updated_at.
+        updated_at (datetime): Дата и время последнего списания.
+    """
+
+    __tablename__ = "rate_limit_buckets"
+    __table_args__ = {"extend_existing": True}
+    user_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    group: str = Field(primary_key=True, max_length=32)
+    tokens: float
+    updated_at: datetime
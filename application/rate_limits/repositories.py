@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+from sqlalchemy import DateTime, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from database import async_session
+from rate_limits.models import RateLimitBucket
+
+
+class RateLimitsAbstractRepository(ABC):
+    """
+    Абстрактный репозиторий для работы с общими корзинами токенов.
+
+    Определяет интерфейс операций:
+    - списание токенов из корзины пользователя.
+    """
+
+    @abstractmethod
+    async def take(
+        self, user_id: int, group: str, capacity: int, rate: float, cost: int
+    ) -> Tuple[bool, float]:
+        """
+        Пополняет корзину по прошедшему времени и списывает токены, если их
+        достаточно.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            group (str): Группа маршрутов.
+            capacity (int): Ёмкость корзины.
+            rate (float): Скорость пополнения, токенов в секунду.
+            cost (int): Количество списываемых токенов.
+        Returns:
+            Tuple[bool, float]: Признак того, что токены списаны, и остаток
+                токенов в корзине.
+        """
+        raise NotImplementedError
+
+
+class RateLimitsPostgreSQLRepository(RateLimitsAbstractRepository):
+    """
+    Реализация репозитория корзин токенов с использованием
+    PostgreSQL (SQLModel + AsyncSession).
+    """
+
+    @staticmethod
+    async def take(
+        user_id: int, group: str, capacity: int, rate: float, cost: int
+    ) -> Tuple[bool, float]:
+        now = func.timezone("utc", func.now(), type_=DateTime)
+        table = RateLimitBucket.__table__
+        refilled = func.least(
+            capacity,
+            table.c.tokens
+            + func.extract("epoch", now - table.c.updated_at) * rate,
+        )
+        query = (
+            insert(RateLimitBucket)
+            .values(user_id=user_id, group=group, tokens=capacity - cost, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=[RateLimitBucket.user_id, RateLimitBucket.group],
+                set_={"tokens": refilled - cost, "updated_at": now},
+                where=refilled >= cost,
+            )
+            .returning(RateLimitBucket.tokens)
+        )
+        async with async_session() as session:
+            tokens = await session.scalar(query)
+            if tokens is not None:
+                await session.commit()
+                return True, tokens
+            tokens = await session.scalar(
+                select(refilled).where(
+                    RateLimitBucket.user_id == user_id, RateLimitBucket.group == group
+                )
+            )
+            return False, tokens
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+
+from base_dependiences import get_current_user
+from rate_limits.dependiences import rate_limit_service
+from rate_limits.schemes import RateLimitMetricsScheme
+from rate_limits.services import RateLimitService
+from settings import settings
+
+router = APIRouter(
+    prefix="/api/v1/rate-limits",
+    tags=["Rate limits"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/metrics", response_model=RateLimitMetricsScheme)
+async def get_rate_limit_metrics(
+    service: RateLimitService = Depends(rate_limit_service),
+):
+    """
+    Получить счётчики ограничения частоты запросов воркера: количество
+    разрешённых и отклонённых запросов и ошибок общего хранилища корзин
+    по группам маршрутов.
+
+    Args:
+        service (RateLimitService): Сервис ограничения частоты запросов.
+    Returns:
+        RateLimitMetricsScheme: Счётчики воркера с момента запуска.
+    """
+    return ORJSONResponse(
+        {"backend": settings.RATE_LIMIT_BACKEND, "groups": service.metrics}
+    )
@@ -0,0 +1,18 @@
+from typing import Dict
+
+from sqlmodel import SQLModel
+
+
+class RateLimitGroupMetricsScheme(SQLModel):
+    """Схема счётчиков проверок группы маршрутов."""
+
+    allowed: int
+    limited: int
+    errors: int
+
+
+class RateLimitMetricsScheme(SQLModel):
+    """Схема счётчиков ограничения частоты запросов воркера."""
+
+    backend: str
+    groups: Dict[str, RateLimitGroupMetricsScheme]
@@ -0,0 +1,142 @@
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from rate_limits.repositories import RateLimitsAbstractRepository
+from settings import settings
+
+RATE_LIMIT_BACKEND_MEMORY = "memory"
+RATE_LIMIT_BACKEND_POSTGRES = "postgres"
+
+
+class RateLimitDecision(NamedTuple):
+    """Результат проверки ограничения частоты запросов."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+    retry_after: int
+    period: float
+
+
+class RateLimitExceededError(Exception):
+    """Пользователь исчерпал токены группы маршрутов."""
+
+    def __init__(self, decision: RateLimitDecision):
+        super().__init__(decision)
+        self.decision = decision
+
+
+class RateLimitService:
+    """
+    Сервис ограничения частоты запросов пользователя алгоритмом token bucket.
+    Инкапсулирует бизнес-логику:
+    - корзина токенов на пользователя и группу маршрутов: ёмкость и период
+      полного пополнения задаются RATE_LIMITS;
+    - хранение корзин в памяти воркера или, при RATE_LIMIT_BACKEND=postgres,
+      в общей для всех воркеров таблице;
+    - счётчики разрешённых и отклонённых запросов.
+
+    Внешние зависимости: RateLimitsAbstractRepository.
+    """
+
+    def __init__(self, repo: RateLimitsAbstractRepository):
+        """
+        Инициализация сервиса ограничения частоты запросов.
+        Args:
+            repo (RateLimitsAbstractRepository): Репозиторий для работы с БД.
+        """
+        self.repo: RateLimitsAbstractRepository = repo
+        self._buckets: "OrderedDict[Tuple[int, str], Tuple[float, float]]" = (
+            OrderedDict()
+        )
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+    async def take(self, user_id: int, group: str, cost: int = 1) -> RateLimitDecision:
+        """
+        Списывает токены из корзины пользователя.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            group (str): Группа маршрутов из RATE_LIMITS.
+            cost (int): Стоимость запроса в токенах.
+        Returns:
+            RateLimitDecision: Результат проверки.
+        Raises:
+            RateLimitExceededError: Если токенов недостаточно.
+        """
+        capacity, period = settings.RATE_LIMITS[group]
+        rate = capacity / period
+        if cost > capacity:
+            allowed, tokens = False, None
+        elif settings.RATE_LIMIT_BACKEND == RATE_LIMIT_BACKEND_POSTGRES:
+            try:
+                allowed, tokens = await self.repo.take(
+                    user_id, group, capacity, rate, cost
+                )
+            except Exception as e:
+                logging.warning("Общие ограничения частоты недоступны: %s", e)
+                self.__count(group, "errors")
+                allowed, tokens = self.__take_local(user_id, group, capacity, rate, cost)
+        else:
+            allowed, tokens = self.__take_local(user_id, group, capacity, rate, cost)
+        if tokens is None:
+            tokens = capacity
+        decision = RateLimitDecision(
+            allowed=allowed,
+            limit=capacity,
+            remaining=max(math.floor(tokens), 0),
+            reset=math.ceil((capacity - tokens) / rate),
+            retry_after=0 if allowed else math.ceil(max(cost - tokens, 0) / rate) or 1,
+            period=period,
+        )
+        self.__count(group, "allowed" if allowed else "limited")
+        if not allowed:
+            raise RateLimitExceededError(decision)
+        return decision
+
+    def reset(self) -> None:
+        """Очищает корзины в памяти воркера и счётчики."""
+        self._buckets.clear()
+        self.metrics.clear()
+
+    def __take_local(
+        self, user_id: int, group: str, capacity: int, rate: float, cost: int
+    ) -> Tuple[bool, float]:
+        """Списывает токены из корзины в памяти воркера
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            group (str): Группа маршрутов
+            capacity (int): Ёмкость корзины
+            rate (float): Скорость пополнения, токенов в секунду
+            cost (int): Стоимость запроса в токенах
+
+        Returns:
+            Tuple[bool, float]: Признак того, что токены списаны, и остаток
+        """
+        key = (user_id, group)
+        now = time.monotonic()
+        bucket: Optional[Tuple[float, float]] = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(capacity)
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            self._buckets.move_to_end(key)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        # Вытесняются давно не использованные корзины: они, скорее всего,
+        # уже полные, и новая корзина ничем от них не отличается
+        while len(self._buckets) > settings.RATE_LIMIT_MEMORY_MAX_KEYS:
+            self._buckets.popitem(last=False)
+        return allowed, tokens
+
+    def __count(self, group: str, name: str) -> None:
+        counters = self.metrics.setdefault(
+            group, {"allowed": 0, "limited": 0, "errors": 0}
+        )
+        counters[name] += 1
@@ -1,6 +1,74 @@
+from typing import List, Optional
+
+from fastapi import HTTPException, Query, status
+
 from resumes.repositories import ResumesPostgreSQLRepository
+from resumes.schemes import ResumeResponseScheme
 from resumes.services import ResumeService
+from settings import settings
+
+RESUME_FIELDS = list(ResumeResponseScheme.model_fields)
+RESUME_INCLUDES = ["improvements"]
 
 
 def resumes_service():
     return ResumeService(ResumesPostgreSQLRepository)
+
+
+def resume_fields(
+    fields: Optional[str] = Query(
+        default=None,
+        description=(
+            "Поля резюме в ответе через запятую, по умолчанию все: "
+            + ",".join(RESUME_FIELDS)
+        ),
+    ),
+) -> List[str]:
+    if fields is None:
+        return RESUME_FIELDS
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(",")))
+    unknown = [field for field in requested if field not in RESUME_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Неизвестные поля резюме: {', '.join(unknown)}",
+        )
+    return requested
+
+
+def resume_includes(
+    include: Optional[str] = Query(
+        default=None,
+        description=(
+            "Связанные данные в ответе через запятую: " + ",".join(RESUME_INCLUDES)
+        ),
+    ),
+) -> List[str]:
+    if include is None:
+        return []
+    requested = list(dict.fromkeys(elem.strip() for elem in include.split(",")))
+    unknown = [elem for elem in requested if elem not in RESUME_INCLUDES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Неизвестные связанные данные: {', '.join(unknown)}",
+        )
+    return requested
+
+
+def resume_ids(
+    ids: str = Query(description="Идентификаторы резюме через запятую"),
+) -> List[int]:
+    try:
+        parsed = list(dict.fromkeys(int(value) for value in ids.split(",")))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Идентификаторы резюме должны быть целыми числами",
+        )
+    if len(parsed) > settings.RESUMES_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Не больше {settings.RESUMES_BATCH_MAX_IDS} резюме за запрос",
+        )
+    return parsed
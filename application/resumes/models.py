@@ -2,12 +2,22 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from typing import Optional, List
-from sqlmodel import SQLModel, Field, Relationship, text
+from sqlalchemy import DDL, String, event
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import SQLModel, Field, Relationship, Index, CheckConstraint, text
+
+from utils.storage import content_compression_sql, content_storage_params
 
 if TYPE_CHECKING:
     from history_improvements.models import ResumeImprovementHistory
 
 
+# Наибольшая длина заголовка и содержания резюме. Ограничения входят в схему БД
+# (CHECK), поэтому не настраиваются через окружение
+RESUME_TITLE_MAX_LENGTH = 255
+RESUME_CONTENT_MAX_LENGTH = 100_000
+
+
 class Resume(SQLModel, table=True):
     """
     ORM-модель резюме для хранения в базе данных.
@@ -17,11 +27,38 @@ class Resume(SQLModel, table=True):
         improved_content (str): Улучшение.
         title (str): Заголовок резюме
         content (str): Содержание резюме
-        improvements (List[ResumeImprovement]): История улучшений резюме
+        deleted_at (Optional[datetime]): Дата и время мягкого удаления резюме,
+            история которого ещё удаляется в фоне
+        version (int): Номер текущей версии содержания
+        last_version (int): Наибольший выданный номер версии
+        improvements_count (int): Количество улучшений резюме, не зависящее
+            от удаления старых версий и истории при обслуживании
+        word_count (Optional[int]): Количество слов в содержании
+        char_count (Optional[int]): Количество символов в содержании
+        reading_time (Optional[int]): Время чтения содержания в минутах
+        headings (Optional[List[str]]): Заголовки разделов содержания.
+            Статистика содержания None, пока не посчитана для старых резюме
+        improvements (List[ResumeImprovement]): История улучшений резюме, не
+            загружается лениво: нужные улучшения выбираются явным запросом
     """
 
     __tablename__ = "resumes"
-    __table_args__ = {"extend_existing": True}
+    __table_args__ = (
+        Index(
+            "ix_resumes_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        CheckConstraint(
+            f"char_length(title) <= {RESUME_TITLE_MAX_LENGTH}",
+            name="ck_resumes_title_length",
+        ),
+        CheckConstraint(
+            f"char_length(content) <= {RESUME_CONTENT_MAX_LENGTH}",
+            name="ck_resumes_content_length",
+        ),
+        {"extend_existing": True},
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(index=True)
     title: str
@@ -29,10 +66,36 @@ class Resume(SQLModel, table=True):
     created_at: datetime = Field(
         sa_column_kwargs={"server_default": text("TIMEZONE('utc', now())")}
     )
+    deleted_at: Optional[datetime] = None
+    version: int = Field(default=1, sa_column_kwargs={"server_default": text("1")})
+    last_version: int = Field(
+        default=1, sa_column_kwargs={"server_default": text("1")}
+    )
+    improvements_count: int = Field(
+        default=0, sa_column_kwargs={"server_default": text("0")}
+    )
+    word_count: Optional[int] = None
+    char_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    headings: Optional[List[str]] = Field(default=None, sa_type=ARRAY(String))
 
     improvements: List["ResumeImprovementHistory"] = Relationship(
         back_populates="resume",
         sa_relationship_kwargs={
             "cascade": "all, delete",
+            "passive_deletes": True,
+            "lazy": "raise",
         },
     )
+
+
+event.listen(
+    Resume.__table__,
+    "after_create",
+    DDL(content_compression_sql(Resume.__tablename__, "content")),
+)
+event.listen(
+    Resume.__table__,
+    "after_create",
+    DDL(f"ALTER TABLE {Resume.__tablename__} SET ({content_storage_params()})"),
+)
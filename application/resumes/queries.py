@@ -0,0 +1,161 @@
+"""
+Заранее построенные запросы к резюме.
+
+Запрос, собранный один раз на уровне модуля, не строится заново при каждом
+вызове репозитория, а его ключ кэша SQLAlchemy вычисляется один раз и
+запоминается, поэтому скомпилированный SQL сразу берётся из кэша движка.
+Значения передаются через bindparam при выполнении. Запросы с выбором
+полей строятся один раз на набор полей.
+"""
+from functools import lru_cache
+from typing import Tuple
+
+from sqlalchemy import JSON, Integer, Select, any_, bindparam, desc, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.orm import defer
+
+from history_improvements.models import ResumeImprovementHistory
+from resumes.models import Resume
+from versions.models import ResumeVersion
+
+RESUME_BY_USER = select(Resume).where(
+    Resume.id == bindparam("resume_id"),
+    Resume.user_id == bindparam("user_id"),
+    Resume.deleted_at.is_(None),
+)
+
+RESUME_BY_USER_FOR_UPDATE = RESUME_BY_USER.with_for_update()
+
+# Для записи, которая заменяет содержание не читая его: content не
+# распаковывается из TOAST
+RESUME_METADATA_BY_USER_FOR_UPDATE = RESUME_BY_USER.options(
+    defer(Resume.content)
+).with_for_update()
+
+RESUMES_BY_USER = select(Resume).where(
+    Resume.user_id == bindparam("user_id"), Resume.deleted_at.is_(None)
+)
+
+
+@lru_cache(maxsize=256)
+def resume_row_by_user(fields: Tuple[str, ...], versioned: bool = False) -> Select:
+    """Запрос полей резюме по идентификаторам резюме и пользователя
+
+    Args:
+        fields (Tuple[str, ...]): Имена столбцов
+        versioned (bool): Брать content и version из версии с номером
+            из параметра version
+
+    Returns:
+        Select: Запрос с параметрами resume_id, user_id и version
+    """
+    columns = {field: Resume.__table__.c[field] for field in fields}
+    if versioned:
+        for field in ("content", "version"):
+            if field in columns:
+                columns[field] = ResumeVersion.__table__.c[field].label(field)
+    query = select(*columns.values()).where(
+        Resume.id == bindparam("resume_id"),
+        Resume.user_id == bindparam("user_id"),
+        Resume.deleted_at.is_(None),
+    )
+    if versioned:
+        query = query.where(
+            ResumeVersion.resume_id == Resume.id,
+            ResumeVersion.version == bindparam("version"),
+        )
+    return query
+
+
+@lru_cache(maxsize=256)
+def resume_row_with_improvements(
+    fields: Tuple[str, ...], versioned: bool = False
+) -> Select:
+    """Запрос полей резюме вместе с последними улучшениями одним запросом
+
+    Улучшения собираются коррелированным подзапросом в JSON-массив от новых
+    к старым. Условие created_at >= resumes.created_at отсекает секции
+    истории старше резюме.
+
+    Args:
+        fields (Tuple[str, ...]): Имена столбцов
+        versioned (bool): Брать content и version из версии с номером
+            из параметра version
+
+    Returns:
+        Select: Запрос с параметрами resume_id, user_id, version
+            и improvements_limit
+    """
+    history = ResumeImprovementHistory.__table__
+    latest = (
+        select(
+            history.c.id,
+            history.c.resume_id,
+            history.c.improved_content,
+            history.c.created_at,
+        )
+        .where(
+            history.c.resume_id == Resume.id,
+            history.c.created_at >= Resume.created_at,
+        )
+        .order_by(desc(history.c.created_at), desc(history.c.id))
+        .limit(bindparam("improvements_limit"))
+        .correlate(Resume)
+        .subquery("latest")
+    )
+    improvements = (
+        select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            "id", latest.c.id,
+                            "resume_id", latest.c.resume_id,
+                            "improved_content", latest.c.improved_content,
+                            "created_at", latest.c.created_at,
+                        ),
+                        desc(latest.c.created_at),
+                        desc(latest.c.id),
+                    )
+                ),
+                func.json_build_array(),
+                type_=JSON,
+            )
+        )
+        .select_from(latest)
+        .scalar_subquery()
+        .label("improvements")
+    )
+    return resume_row_by_user(fields, versioned).add_columns(improvements)
+
+
+@lru_cache(maxsize=256)
+def resume_rows_by_user(fields: Tuple[str, ...]) -> Select:
+    """Запрос полей всех резюме пользователя
+
+    Args:
+        fields (Tuple[str, ...]): Имена столбцов
+
+    Returns:
+        Select: Запрос с параметром user_id
+    """
+    return select(*(Resume.__table__.c[field] for field in fields)).where(
+        Resume.user_id == bindparam("user_id"), Resume.deleted_at.is_(None)
+    )
+
+
+@lru_cache(maxsize=256)
+def resume_rows_by_ids(fields: Tuple[str, ...]) -> Select:
+    """Запрос полей резюме пользователя по списку идентификаторов
+
+    Args:
+        fields (Tuple[str, ...]): Имена столбцов
+
+    Returns:
+        Select: Запрос с параметрами ids и user_id
+    """
+    return select(*(Resume.__table__.c[field] for field in fields)).where(
+        Resume.id == any_(bindparam("ids", type_=ARRAY(Integer))),
+        Resume.user_id == bindparam("user_id"),
+        Resume.deleted_at.is_(None),
+    )
@@ -1,9 +1,33 @@
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from sqlalchemy import select
+from typing import Dict, Optional, List, Tuple
+from sqlalchemy import select, delete, update, func, DateTime
 
-from database import async_session
+from database import read_session, shards, write_session
+from history_improvements.models import ResumeImprovementHistory
+from outbox.models import (
+    RESUME_CREATED,
+    RESUME_DELETED,
+    RESUME_UPDATED,
+    outbox_event,
+)
+from notifications.repositories import notify_change
 from resumes.models import Resume
+from resumes.queries import (
+    RESUME_BY_USER,
+    RESUME_BY_USER_FOR_UPDATE,
+    RESUMES_BY_USER,
+    resume_row_by_user,
+    resume_row_with_improvements,
+    resume_rows_by_ids,
+    resume_rows_by_user,
+)
+from similarity.repositories import compute_signatures, save_signatures
+from user_stats.repositories import bump_user_stats
+from versions.models import (
+    VERSION_SOURCE_CREATE,
+    VERSION_SOURCE_UPDATE,
+    ResumeVersion,
+)
 
 
 class ResumesAbstractRepository(ABC):
@@ -30,12 +54,15 @@ class ResumesAbstractRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_one_by_user_id(self, resume_id: int, user_id: int) -> Optional[Resume]:
+    async def get_one_by_user_id(
+        self, resume_id: int, user_id: int, primary: bool = False
+    ) -> Optional[Resume]:
         """
         Получает резюме по идентификатору резюме и идентификатору пользователя.
         Args:
             resume_id (int): Идентификатор резюме.
             user_id (int): Идентификатор пользователя.
+            primary (bool): Читать на основном сервере, а не на реплике.
         Returns:
             Optional[Resume]: Резюме или None.
         """
@@ -52,6 +79,66 @@ class ResumesAbstractRepository(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_one_row_by_user_id(
+        self,
+        resume_id: int,
+        user_id: int,
+        fields: List[str],
+        version: Optional[int] = None,
+        improvements_limit: Optional[int] = None,
+    ) -> Optional[dict]:
+        """
+        Получает только указанные поля резюме без создания ORM-объекта.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена столбцов.
+            version (Optional[int]): Номер версии, содержание которой нужно
+                вернуть вместо текущего.
+            improvements_limit (Optional[int]): Количество последних улучшений,
+                которые нужно вернуть тем же запросом в ключе improvements.
+        Returns:
+            Optional[dict]: Поля резюме или None.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_all_rows_by_user_id(
+        self, user_id: int, fields: List[str]
+    ) -> List[dict]:
+        """
+        Получает только указанные поля всех резюме пользователя без создания
+        ORM-объектов.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена столбцов.
+        Returns:
+            List[dict]: Список полей резюме.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_rows_by_ids(
+        self,
+        resume_ids: List[int],
+        user_id: int,
+        fields: List[str],
+        primary: bool = False,
+    ) -> List[dict]:
+        """
+        Получает указанные поля резюме пользователя по списку идентификаторов
+        одним запросом.
+        Args:
+            resume_ids (List[int]): Идентификаторы резюме.
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена столбцов.
+            primary (bool): Читать на основном сервере, а не на реплике.
+        Returns:
+            List[dict]: Поля найденных резюме в произвольном порядке.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def update_one_by_user_id(
         self, resume_id: int, user_id: int, data: dict
@@ -68,17 +155,115 @@ class ResumesAbstractRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def delete_one_by_user_id(self, resume_id: int, user_id: int) -> bool:
+    async def delete_one_by_user_id(
+        self, resume_id: int, user_id: int, soft: bool = False
+    ) -> bool:
         """
         Удаляет резюме.
         Args:
             resume_id (int): Идентификатор резюме.
             user_id (int): Идентификатор пользователя.
+            soft (bool): Пометить резюме удалённым, оставив историю улучшений
+                для фоновой очистки.
         Returns:
             bool: True, если удаление успешно, False если резюме не найдено.
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def count_improvements(self, resume_id: int, user_id: int, limit: int) -> int:
+        """
+        Считает улучшения резюме, но не больше limit.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            limit (int): Максимальное значение счётчика.
+        Returns:
+            int: Количество улучшений, ограниченное limit.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def purge_improvements_batch(
+        self, resume_id: int, user_id: int, batch_size: int
+    ) -> int:
+        """
+        Удаляет пачку улучшений мягко удалённого резюме.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            batch_size (int): Размер пачки.
+        Returns:
+            int: Количество удалённых улучшений.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def purge_versions_batch(
+        self, resume_id: int, user_id: int, batch_size: int
+    ) -> int:
+        """
+        Удаляет пачку версий мягко удалённого резюме.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            batch_size (int): Размер пачки.
+        Returns:
+            int: Количество удалённых версий.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_deleted(self, limit: int, shard: int) -> List[Tuple[int, int]]:
+        """
+        Получает мягко удалённые резюме на шарде.
+        Args:
+            limit (int): Количество резюме.
+            shard (int): Номер шарда.
+        Returns:
+            List[Tuple[int, int]]: Пары (идентификатор резюме, идентификатор
+                пользователя).
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def purge_one(self, resume_id: int, user_id: int) -> bool:
+        """
+        Окончательно удаляет мягко удалённое резюме.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+        Returns:
+            bool: True, если резюме удалено.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_without_stats_batch(
+        self, shard: int, after_id: int, batch_size: int
+    ) -> List[Tuple[int, str]]:
+        """
+        Получает пачку резюме шарда без статистики содержания.
+        Args:
+            shard (int): Номер шарда.
+            after_id (int): Идентификатор, после которого продолжить.
+            batch_size (int): Размер пачки.
+        Returns:
+            List[Tuple[int, str]]: Идентификаторы и содержание резюме по
+                возрастанию идентификатора.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_stats_batch(self, shard: int, stats: Dict[int, dict]) -> None:
+        """
+        Сохраняет статистику содержания пачки резюме шарда.
+        Args:
+            shard (int): Номер шарда.
+            stats (Dict[int, dict]): Статистика по идентификаторам резюме.
+        """
+        raise NotImplementedError
+
 
 class ResumesPostgreSQLRepository(ResumesAbstractRepository):
     """
@@ -87,57 +272,268 @@ class ResumesPostgreSQLRepository(ResumesAbstractRepository):
 
     @staticmethod
     async def add_one(data: dict) -> Resume:
-        async with async_session() as session:
+        (signature,) = await compute_signatures([data["content"]])
+        async with write_session(data["user_id"]) as session:
             resume = Resume(**data)
             session.add(resume)
+            await session.flush()
+            session.add(
+                ResumeVersion(
+                    resume_id=resume.id,
+                    version=resume.version,
+                    content=resume.content,
+                    source=VERSION_SOURCE_CREATE,
+                )
+            )
+            event = outbox_event(
+                RESUME_CREATED, resume.user_id, resume.id, version=resume.version
+            )
+            session.add(event)
+            await notify_change(session, event)
+            await save_signatures(session, {resume.id: signature})
+            await bump_user_stats(session, resume.user_id, resumes=1)
             await session.commit()
             await session.refresh(resume)
             return resume
 
     @staticmethod
-    async def get_one_by_user_id(resume_id: int, user_id: int) -> Optional[Resume]:
-        async with async_session() as session:
-            query = select(Resume).where(
-                Resume.id == resume_id, Resume.user_id == user_id
+    async def get_one_by_user_id(
+        resume_id: int, user_id: int, primary: bool = False
+    ) -> Optional[Resume]:
+        session_factory = write_session if primary else read_session
+        async with session_factory(user_id) as session:
+            result = await session.execute(
+                RESUME_BY_USER, {"resume_id": resume_id, "user_id": user_id}
             )
-            result = await session.execute(query)
             return result.scalar_one_or_none()
 
     @staticmethod
     async def get_all_by_user_id(user_id: int) -> List[Resume]:
-        async with async_session() as session:
-            query = select(Resume).where(Resume.user_id == user_id)
-            result = await session.execute(query)
+        async with read_session(user_id) as session:
+            result = await session.execute(RESUMES_BY_USER, {"user_id": user_id})
             return result.scalars().all()
 
+    @staticmethod
+    async def get_one_row_by_user_id(
+        resume_id: int,
+        user_id: int,
+        fields: List[str],
+        version: Optional[int] = None,
+        improvements_limit: Optional[int] = None,
+    ) -> Optional[dict]:
+        params = {"resume_id": resume_id, "user_id": user_id}
+        if improvements_limit is None:
+            query = resume_row_by_user(tuple(fields), version is not None)
+        else:
+            query = resume_row_with_improvements(tuple(fields), version is not None)
+            params["improvements_limit"] = improvements_limit
+        if version is not None:
+            params["version"] = version
+        async with read_session(user_id) as session:
+            result = await session.execute(query, params)
+            row = result.mappings().one_or_none()
+            return dict(row) if row is not None else None
+
+    @staticmethod
+    async def get_all_rows_by_user_id(user_id: int, fields: List[str]) -> List[dict]:
+        async with read_session(user_id) as session:
+            result = await session.execute(
+                resume_rows_by_user(tuple(fields)), {"user_id": user_id}
+            )
+            keys = list(result.keys())
+            return [dict(zip(keys, row)) for row in result]
+
+    @staticmethod
+    async def get_rows_by_ids(
+        resume_ids: List[int], user_id: int, fields: List[str], primary: bool = False
+    ) -> List[dict]:
+        session_factory = write_session if primary else read_session
+        async with session_factory(user_id) as session:
+            result = await session.execute(
+                resume_rows_by_ids(tuple(fields)),
+                {"ids": resume_ids, "user_id": user_id},
+            )
+            keys = list(result.keys())
+            return [dict(zip(keys, row)) for row in result]
+
     @staticmethod
     async def update_one_by_user_id(
         resume_id: int, user_id: int, data: dict
     ) -> Optional[Resume]:
-        async with async_session() as session:
-            query = select(Resume).where(
-                Resume.id == resume_id, Resume.user_id == user_id
+        # Сигнатура считается до открытия транзакции, даже если содержание
+        # не изменится
+        signatures = await compute_signatures(
+            [data["content"]] if "content" in data else []
+        )
+        async with write_session(user_id) as session:
+            result = await session.execute(
+                RESUME_BY_USER_FOR_UPDATE, {"resume_id": resume_id, "user_id": user_id}
             )
-            result = await session.execute(query)
             resume = result.scalar_one_or_none()
             if not resume:
                 return None
+            content_changed = data.get("content", resume.content) != resume.content
             for key, value in data.items():
                 setattr(resume, key, value)
+            if content_changed:
+                resume.last_version += 1
+                session.add(
+                    ResumeVersion(
+                        resume_id=resume.id,
+                        version=resume.last_version,
+                        parent_version=resume.version,
+                        content=resume.content,
+                        source=VERSION_SOURCE_UPDATE,
+                    )
+                )
+                resume.version = resume.last_version
+                await save_signatures(session, {resume.id: signatures[0]})
+            event = outbox_event(
+                RESUME_UPDATED,
+                user_id,
+                resume.id,
+                fields=list(data),
+                version=resume.version,
+            )
+            session.add(event)
+            await notify_change(session, event)
             await session.commit()
             await session.refresh(resume)
             return resume
 
     @staticmethod
-    async def delete_one_by_user_id(resume_id: int, user_id: int) -> bool:
-        async with async_session() as session:
-            query = select(Resume).where(
-                Resume.id == resume_id, Resume.user_id == user_id
+    async def delete_one_by_user_id(
+        resume_id: int, user_id: int, soft: bool = False
+    ) -> bool:
+        async with write_session(user_id) as session:
+            if soft:
+                query = update(Resume).values(
+                    deleted_at=func.timezone("utc", func.now(), type_=DateTime)
+                )
+            else:
+                query = delete(Resume)
+            query = query.where(
+                Resume.id == resume_id,
+                Resume.user_id == user_id,
+                Resume.deleted_at.is_(None),
+            ).returning(Resume.improvements_count)
+            # Количество улучшений читается из удаляемой строки, поэтому
+            # параллельное улучшение не изменит его до вычитания
+            result = await session.execute(query)
+            improvements = result.scalar_one_or_none()
+            deleted = improvements is not None
+            if deleted:
+                event = outbox_event(RESUME_DELETED, user_id, resume_id)
+                session.add(event)
+                await notify_change(session, event)
+                await bump_user_stats(
+                    session, user_id, resumes=-1, improvements=-improvements
+                )
+            await session.commit()
+            return deleted
+
+    @staticmethod
+    async def count_improvements(resume_id: int, user_id: int, limit: int) -> int:
+        async with write_session(user_id) as session:
+            improvements = (
+                select(ResumeImprovementHistory.id)
+                .where(ResumeImprovementHistory.resume_id == resume_id)
+                .limit(limit)
+                .subquery()
+            )
+            result = await session.execute(
+                select(func.count()).select_from(improvements)
+            )
+            return result.scalar_one()
+
+    @staticmethod
+    async def purge_improvements_batch(
+        resume_id: int, user_id: int, batch_size: int
+    ) -> int:
+        async with write_session(user_id) as session:
+            batch = (
+                select(ResumeImprovementHistory.id)
+                .where(
+                    ResumeImprovementHistory.resume_id == resume_id,
+                    select(Resume.id)
+                    .where(Resume.id == resume_id, Resume.deleted_at.is_not(None))
+                    .exists(),
+                )
+                .limit(batch_size)
             )
+            query = delete(ResumeImprovementHistory).where(
+                ResumeImprovementHistory.id.in_(batch.scalar_subquery())
+            ).execution_options(synchronize_session=False)
             result = await session.execute(query)
-            resume = result.scalar_one_or_none()
-            if not resume:
-                return False
-            await session.delete(resume)
             await session.commit()
-            return True
+            return result.rowcount
+
+    @staticmethod
+    async def purge_versions_batch(
+        resume_id: int, user_id: int, batch_size: int
+    ) -> int:
+        async with write_session(user_id) as session:
+            batch = (
+                select(ResumeVersion.version)
+                .where(
+                    ResumeVersion.resume_id == resume_id,
+                    select(Resume.id)
+                    .where(Resume.id == resume_id, Resume.deleted_at.is_not(None))
+                    .exists(),
+                )
+                .limit(batch_size)
+            )
+            query = delete(ResumeVersion).where(
+                ResumeVersion.resume_id == resume_id,
+                ResumeVersion.version.in_(batch.scalar_subquery()),
+            ).execution_options(synchronize_session=False)
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount
+
+    @staticmethod
+    async def get_deleted(limit: int, shard: int) -> List[Tuple[int, int]]:
+        async with shards[shard].session() as session:
+            query = (
+                select(Resume.id, Resume.user_id)
+                .where(Resume.deleted_at.is_not(None))
+                .order_by(Resume.deleted_at)
+                .limit(limit)
+            )
+            result = await session.execute(query)
+            return result.tuples().all()
+
+    @staticmethod
+    async def purge_one(resume_id: int, user_id: int) -> bool:
+        async with write_session(user_id) as session:
+            query = delete(Resume).where(
+                Resume.id == resume_id,
+                Resume.user_id == user_id,
+                Resume.deleted_at.is_not(None),
+            )
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount > 0
+
+    @staticmethod
+    async def get_without_stats_batch(
+        shard: int, after_id: int, batch_size: int
+    ) -> List[Tuple[int, str]]:
+        async with shards[shard].session() as session:
+            query = (
+                select(Resume.id, Resume.content)
+                .where(Resume.id > after_id, Resume.word_count.is_(None))
+                .order_by(Resume.id)
+                .limit(batch_size)
+            )
+            result = await session.execute(query)
+            return result.tuples().all()
+
+    @staticmethod
+    async def save_stats_batch(shard: int, stats: Dict[int, dict]) -> None:
+        async with shards[shard].session() as session:
+            await session.execute(
+                update(Resume),
+                [{"id": resume_id, **elem} for resume_id, elem in stats.items()],
+            )
+            await session.commit()
@@ -1,9 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import List, Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import ORJSONResponse
 
 from base_dependiences import get_current_user
-from resumes.dependiences import resumes_service
+from idempotency.dependiences import idempotency_service
+from idempotency.services import IdempotencyService
+from rate_limits.dependiences import enforce_rate_limit, rate_limit
+from resumes.dependiences import (
+    resume_fields,
+    resume_ids,
+    resume_includes,
+    resumes_service,
+)
 from resumes.services import ResumeService
-from resumes.schemes import ResumeBaseScheme, ResumeResponseScheme, ResumeUpdateScheme
+from resumes.schemes import (
+    ResumeBaseScheme,
+    ResumeBatchResponseScheme,
+    ResumeResponseScheme,
+    ResumeUpdateScheme,
+    ResumeWithImprovementsResponseScheme,
+)
+from settings import settings
+from utils.compression import compression_level
 
 router = APIRouter(
     prefix="/api/v1/resumes", 
@@ -13,67 +42,162 @@ router = APIRouter(
 
 
 @router.post(
-    "/", response_model=ResumeResponseScheme, status_code=status.HTTP_201_CREATED
+    "/",
+    response_model=ResumeResponseScheme,
+    status_code=status.HTTP_201_CREATED,
 )
 async def create_resume(
     request: Request,
+    response: Response,
     resume: ResumeBaseScheme,
     resume_service: ResumeService = Depends(resumes_service),
+    idempotency: IdempotencyService = Depends(idempotency_service),
+    idempotency_key: Optional[str] = Header(
+        default=None, alias="Idempotency-Key", max_length=255
+    ),
 ):
     """
     Создать новое резюме для пользователя.
+
+    Повторный запрос с тем же заголовком Idempotency-Key не создаёт новое
+    резюме, а возвращает сохранённый ответ, не списывая токены группы write.
+
     Args:
         request (Request): Объект FastAPI Request, используется для извлечения user_id.
+        response (Response): Объект FastAPI Response для заголовков ответа.
         resume (ResumeBaseScheme): Данные резюме для создания.
         resume_service (ResumeService): Сервис для работы с резюме.
+        idempotency (IdempotencyService): Сервис идемпотентности.
+        idempotency_key (Optional[str]): Ключ идемпотентности.
     Returns:
         ResumeResponseScheme: Резюме пользователя.
     """
     user_id = request.state.user_id
-    return await resume_service.add_one(resume, user_id)
+
+    async def create():
+        await enforce_rate_limit(request, "write")
+        return await resume_service.add_one(resume, user_id)
+
+    result, replayed = await idempotency.execute(
+        idempotency_key,
+        user_id,
+        "create_resume",
+        resume.model_dump(),
+        create,
+        ResumeResponseScheme,
+    )
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
 
 
-@router.get("/", response_model=list[ResumeResponseScheme])
+@router.get(
+    "/",
+    response_model=list[ResumeResponseScheme],
+    dependencies=[compression_level(settings.COMPRESSION_LIST_LEVEL)],
+)
 async def list_resumes(
-    request: Request, resume_service: ResumeService = Depends(resumes_service)
+    request: Request,
+    resume_service: ResumeService = Depends(resumes_service),
+    fields: List[str] = Depends(resume_fields),
 ):
     """
     Получить список всех резюме пользователя.
+
+    Из БД выбираются только запрошенные столбцы, которые сериализуются
+    в JSON без создания ORM-объектов и повторной валидации схемой ответа.
+
     Args:
         request (Request): Объект FastAPI Request для извлечения user_id.
         resume_service (ResumeService): Сервис для работы с резюме.
+        fields (List[str]): Поля резюме в ответе.
     Returns:
         list[ResumeResponseScheme]: Список резюме пользователя.
     """
     user_id = request.state.user_id
-    return await resume_service.get_all_by_user_id(user_id)
+    return ORJSONResponse(await resume_service.get_all_rows_by_user_id(user_id, fields))
 
 
-@router.get("/{resume_id}", response_model=ResumeResponseScheme)
+@router.get("/batch", response_model=ResumeBatchResponseScheme)
+async def get_resumes_batch(
+    request: Request,
+    resume_service: ResumeService = Depends(resumes_service),
+    ids: List[int] = Depends(resume_ids),
+    fields: List[str] = Depends(resume_fields),
+):
+    """
+    Получить несколько резюме по списку идентификаторов одним запросом к БД.
+    Args:
+        request (Request): Объект FastAPI Request для извлечения user_id.
+        resume_service (ResumeService): Сервис для работы с резюме.
+        ids (List[int]): Идентификаторы резюме.
+        fields (List[str]): Поля резюме в ответе.
+    Returns:
+        ResumeBatchResponseScheme: Найденные резюме в порядке ids и
+            идентификаторы резюме, которые не найдены.
+    """
+    user_id = request.state.user_id
+    items, missing = await resume_service.get_batch_by_user_id(ids, user_id, fields)
+    return ORJSONResponse({"items": items, "missing": missing})
+
+
+@router.get("/{resume_id}", response_model=ResumeWithImprovementsResponseScheme)
 async def get_resume(
     resume_id: int,
     request: Request,
     resume_service: ResumeService = Depends(resumes_service),
+    fields: List[str] = Depends(resume_fields),
+    includes: List[str] = Depends(resume_includes),
+    version: Optional[int] = Query(
+        default=None, ge=1, description="Номер версии содержания резюме"
+    ),
+    improvements_limit: int = Query(
+        default=settings.RESUME_IMPROVEMENTS_INCLUDE_LIMIT,
+        ge=1,
+        le=settings.RESUME_IMPROVEMENTS_INCLUDE_MAX,
+        description="Количество последних улучшений при include=improvements",
+    ),
+    time_zone: str = "UTC",
 ):
     """
     Получить конкретное резюме по его идентификатору.
+
+    С include=improvements резюме возвращается вместе с последними
+    improvements_limit улучшениями тем же запросом к БД.
     Args:
         resume_id (int): Идентификатор резюме.
         request (Request): Объект FastAPI Request для извлечения user_id.
         resume_service (ResumeService): Сервис для работы с резюме.
+        fields (List[str]): Поля резюме в ответе.
+        includes (List[str]): Связанные данные в ответе.
+        version (Optional[int]): Номер версии, содержание которой нужно
+            вернуть вместо текущего.
+        improvements_limit (int): Количество последних улучшений.
+        time_zone (str): Часовой пояс дат улучшений.
     Returns:
-        ResumeResponseScheme: Данные запрошенного резюме.
+        ResumeWithImprovementsResponseScheme: Данные запрошенного резюме.
     Raises:
         HTTPException: Если резюме с указанным ID не найдено (код 404).
     """
     user_id = request.state.user_id
-    resume = await resume_service.get_one_by_user_id(resume_id, user_id)
+    resume = await resume_service.get_one_row_by_user_id(
+        resume_id,
+        user_id,
+        fields,
+        version,
+        improvements_limit if "improvements" in includes else None,
+        time_zone,
+    )
     if not resume:
         raise HTTPException(status_code=404, detail="Резюме не найдено")
-    return resume
+    return ORJSONResponse(resume)
 
 
-@router.patch("/{resume_id}", response_model=ResumeResponseScheme)
+@router.patch(
+    "/{resume_id}",
+    response_model=ResumeResponseScheme,
+    dependencies=[rate_limit("write")],
+)
 async def update_resume(
     resume_id: int,
     request: Request,
@@ -99,18 +223,27 @@ async def update_resume(
     return updated
 
 
-@router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete(
+    "/{resume_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    dependencies=[rate_limit("write")],
+)
 async def delete_resume(
     resume_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     resume_service: ResumeService = Depends(resumes_service),
 ):
     """
     Удалить резюме пользователя.
 
+    Резюме с большой историей улучшений помечается удалённым сразу,
+    а история удаляется пачками в фоновой задаче.
+
     Args:
         resume_id (int): Идентификатор резюме для удаления.
         request (Request): Объект FastAPI Request для извлечения user_id.
+        background_tasks (BackgroundTasks): Фоновые задачи FastAPI.
         resume_service (ResumeService): Сервис для работы с резюме.
     Returns:
         None
@@ -121,4 +254,5 @@ async def delete_resume(
     deleted = await resume_service.delete_one_by_user_id(resume_id, user_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Резюме не найдено")
+    background_tasks.add_task(resume_service.purge_one, resume_id, user_id)
     return
@@ -1,20 +1,27 @@
-from typing import Optional
+from typing import List, Optional
 
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
+
+from history_improvements.schemes import ResumeImprovementResponseScheme
+from resumes.models import RESUME_CONTENT_MAX_LENGTH, RESUME_TITLE_MAX_LENGTH
 
 
 class ResumeBaseScheme(SQLModel):
     """Базовая схема для резюме."""
 
-    title: str
-    content: str
+    title: str = Field(max_length=RESUME_TITLE_MAX_LENGTH)
+    content: str = Field(max_length=RESUME_CONTENT_MAX_LENGTH)
 
 
 class ResumeUpdateScheme(SQLModel):
     """Схема для обновления резюме."""
 
-    title: Optional[str] = None
-    content: Optional[str] = None
+    title: Optional[str] = Field(
+        default=None, max_length=RESUME_TITLE_MAX_LENGTH
+    )
+    content: Optional[str] = Field(
+        default=None, max_length=RESUME_CONTENT_MAX_LENGTH
+    )
 
 
 class ResumeResponseScheme(ResumeBaseScheme):
@@ -22,6 +29,24 @@ class ResumeResponseScheme(ResumeBaseScheme):
 
     id: int
     user_id: int
+    version: int
+    word_count: Optional[int] = None
+    char_count: Optional[int] = None
+    reading_time: Optional[int] = None
+    headings: Optional[List[str]] = None
 
     class Config:
         from_attributes = True
+
+
+class ResumeWithImprovementsResponseScheme(ResumeResponseScheme):
+    """Схема для отдачи резюме с последними улучшениями по include=improvements."""
+
+    improvements: Optional[List[ResumeImprovementResponseScheme]] = None
+
+
+class ResumeBatchResponseScheme(SQLModel):
+    """Схема для отдачи нескольких резюме по списку идентификаторов."""
+
+    items: List[ResumeResponseScheme]
+    missing: List[int]
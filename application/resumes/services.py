@@ -1,8 +1,14 @@
-from typing import Optional, List
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional, List, Tuple
+from zoneinfo import ZoneInfo
 
+from database import shards
 from resumes.repositories import ResumesAbstractRepository
 from resumes.models import Resume
 from resumes.schemes import ResumeBaseScheme, ResumeUpdateScheme
+from resumes.stats import STATS_FIELDS, text_stats
+from settings import settings
 
 
 class ResumeService:
@@ -10,6 +16,7 @@ class ResumeService:
     Сервис для работы с резюме и историей улучшений.
     Инкапсулирует бизнес-логику:
     - добавление, получение, обновление и удаление резюме;
+    - расчёт статистики содержания при записи;
     - добавление истории улучшения резюме.
 
     Внешние зависимости: ResumesAbstractRepository.
@@ -33,18 +40,23 @@ class ResumeService:
         """
         resume = resume.model_dump()
         resume["user_id"] = user_id
+        resume.update(text_stats(resume["content"]))
         return await self.repo.add_one(resume)
 
-    async def get_one_by_user_id(self, resume_id: int, user_id: int) -> Optional[Resume]:
+    async def get_one_by_user_id(
+        self, resume_id: int, user_id: int, primary: bool = False
+    ) -> Optional[Resume]:
         """
         Получает одно резюме по его id и id пользователю.
         Args:
             resume_id (int): Идентификатор резюме.
             user_id (int): Идентификатор пользователя.
+            primary (bool): Читать на основном сервере, а не на реплике:
+                для данных, по которым затем выполняется запись.
         Returns:
             Optional[Resume]: Резюме или None.
         """
-        return await self.repo.get_one_by_user_id(resume_id, user_id)
+        return await self.repo.get_one_by_user_id(resume_id, user_id, primary)
 
     async def get_all_by_user_id(self, user_id: int) -> List[Resume]:
         """
@@ -56,6 +68,104 @@ class ResumeService:
         """
         return await self.repo.get_all_by_user_id(user_id)
 
+    async def get_one_row_by_user_id(
+        self,
+        resume_id: int,
+        user_id: int,
+        fields: List[str],
+        version: Optional[int] = None,
+        improvements_limit: Optional[int] = None,
+        time_zone: str = "UTC",
+    ) -> Optional[dict]:
+        """
+        Получает указанные поля резюме для отдачи без повторной валидации.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена полей.
+            version (Optional[int]): Номер версии, содержание которой нужно
+                вернуть вместо текущего.
+            improvements_limit (Optional[int]): Количество последних улучшений,
+                которые нужно вернуть вместе с резюме в ключе improvements.
+            time_zone (str): Часовой пояс дат улучшений.
+        Returns:
+            Optional[dict]: Поля резюме или None, если резюме или версия
+                не найдены.
+        """
+        # Статистика хранится только для текущего содержания, поэтому для
+        # версии она считается по её содержанию
+        stats_fields = [] if version is None else [
+            field for field in fields if field in STATS_FIELDS
+        ]
+        columns = fields
+        if stats_fields and "content" not in fields:
+            columns = [*fields, "content"]
+        resume = await self.repo.get_one_row_by_user_id(
+            resume_id, user_id, columns, version, improvements_limit
+        )
+        if resume is not None and stats_fields:
+            stats = text_stats(resume["content"])
+            resume.update((field, stats[field]) for field in stats_fields)
+            if columns is not fields:
+                del resume["content"]
+        if resume is not None and improvements_limit is not None:
+            user_tz = ZoneInfo(time_zone)
+            for elem in resume["improvements"]:
+                elem["created_at"] = (
+                    datetime.fromisoformat(elem["created_at"])
+                    .replace(tzinfo=timezone.utc)
+                    .astimezone(user_tz)
+                )
+        return resume
+
+    async def get_all_rows_by_user_id(
+        self, user_id: int, fields: List[str]
+    ) -> List[dict]:
+        """
+        Получает указанные поля всех резюме пользователя для отдачи без
+        повторной валидации.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена полей.
+        Returns:
+            List[dict]: Список полей резюме.
+        """
+        return await self.repo.get_all_rows_by_user_id(user_id, fields)
+
+    async def get_batch_by_user_id(
+        self,
+        resume_ids: List[int],
+        user_id: int,
+        fields: List[str],
+        primary: bool = False,
+    ) -> Tuple[List[dict], List[int]]:
+        """
+        Получает указанные поля нескольких резюме пользователя одним запросом.
+        Args:
+            resume_ids (List[int]): Идентификаторы резюме.
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена полей.
+            primary (bool): Читать на основном сервере, а не на реплике:
+                для данных, по которым затем выполняется запись.
+        Returns:
+            Tuple[List[dict], List[int]]: Поля найденных резюме в порядке
+                resume_ids и идентификаторы не найденных резюме.
+        """
+        columns = fields if "id" in fields else ["id", *fields]
+        rows = await self.repo.get_rows_by_ids(resume_ids, user_id, columns, primary)
+        found = {row["id"]: row for row in rows}
+        items = []
+        missing = []
+        for resume_id in resume_ids:
+            row = found.get(resume_id)
+            if row is None:
+                missing.append(resume_id)
+                continue
+            if columns is not fields:
+                del row["id"]
+            items.append(row)
+        return items, missing
+
     async def update_one_by_user_id(
         self, resume_id: int, user_id: int, resume: ResumeUpdateScheme
     ) -> Optional[Resume]:
@@ -68,17 +178,105 @@ class ResumeService:
         Returns:
             Optional[Resume]: Обновлённое резюме или None.
         """
-        return await self.repo.update_one_by_user_id(
-            resume_id, user_id, resume.model_dump(exclude_unset=True)
-        )
+        data = resume.model_dump(exclude_unset=True)
+        if data.get("content") is not None:
+            data.update(text_stats(data["content"]))
+        return await self.repo.update_one_by_user_id(resume_id, user_id, data)
 
     async def delete_one_by_user_id(self, resume_id: int, user_id: int) -> bool:
         """
         Удаляет резюме.
+
+        История улучшений удаляется каскадно на стороне БД. Если улучшений
+        больше RESUME_PURGE_THRESHOLD, резюме только помечается удалённым,
+        а история удаляется в фоне методом purge_one.
+
         Args:
             resume_id (int): Идентификатор резюме.
             user_id (int): Идентификатор пользователя.
         Returns:
             bool: True, если удалено, False если резюме не найдено.
         """
-        return await self.repo.delete_one_by_user_id(resume_id, user_id)
+        threshold = settings.RESUME_PURGE_THRESHOLD
+        improvements = await self.repo.count_improvements(
+            resume_id, user_id, threshold + 1
+        )
+        return await self.repo.delete_one_by_user_id(
+            resume_id, user_id, soft=improvements > threshold
+        )
+
+    async def purge_one(self, resume_id: int, user_id: int) -> int:
+        """
+        Удаляет пачками историю улучшений и версии мягко удалённого резюме,
+        а затем само резюме.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+        Returns:
+            int: Количество удалённых улучшений.
+        """
+        purged = 0
+        while True:
+            deleted = await self.repo.purge_improvements_batch(
+                resume_id, user_id, settings.RESUME_PURGE_BATCH_SIZE
+            )
+            purged += deleted
+            if deleted < settings.RESUME_PURGE_BATCH_SIZE:
+                break
+        while True:
+            deleted = await self.repo.purge_versions_batch(
+                resume_id, user_id, settings.RESUME_PURGE_BATCH_SIZE
+            )
+            if deleted < settings.RESUME_PURGE_BATCH_SIZE:
+                break
+        await self.repo.purge_one(resume_id, user_id)
+        return purged
+
+    async def purge_deleted(self) -> int:
+        """
+        Дочищает мягко удалённые резюме, фоновая очистка которых
+        не завершилась (например, из-за перезапуска воркера).
+        Returns:
+            int: Количество удалённых улучшений.
+        """
+        purged = 0
+        for shard in shards:
+            while True:
+                deleted = await self.repo.get_deleted(
+                    settings.RESUME_PURGE_BATCH_SIZE, shard.index
+                )
+                for resume_id, user_id in deleted:
+                    purged += await self.purge_one(resume_id, user_id)
+                if len(deleted) < settings.RESUME_PURGE_BATCH_SIZE:
+                    break
+        return purged
+
+    async def backfill_stats(self, batch_size: int, pause: float) -> int:
+        """
+        Считает статистику содержания резюме, созданных до её появления,
+        пачками на каждом шарде.
+        Args:
+            batch_size (int): Размер пачки.
+            pause (float): Пауза между пачками в секундах.
+        Returns:
+            int: Количество резюме, получивших статистику.
+        """
+        updated = 0
+        for shard in shards:
+            after_id = 0
+            while True:
+                batch = await self.repo.get_without_stats_batch(
+                    shard.index, after_id, batch_size
+                )
+                if not batch:
+                    break
+                await self.repo.save_stats_batch(
+                    shard.index,
+                    {resume_id: text_stats(content) for resume_id, content in batch},
+                )
+                updated += len(batch)
+                after_id = batch[-1][0]
+                if len(batch) < batch_size:
+                    break
+                await asyncio.sleep(pause)
+        return updated
@@ -0,0 +1,58 @@
+import math
+import re
+from typing import List
+
+# Средняя скорость чтения для оценки времени чтения резюме
+READING_WORDS_PER_MINUTE = 200
+# Ограничения на сохраняемые заголовки разделов
+MAX_HEADINGS = 30
+MAX_HEADING_LENGTH = 100
+MAX_HEADING_WORDS = 6
+# Поля резюме, которые считает text_stats
+STATS_FIELDS = ("word_count", "char_count", "reading_time", "headings")
+
+_WORD = re.compile(r"\w+")
+_MARKDOWN_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*#*$")
+
+
+def _headings(content: str) -> List[str]:
+    """Находит заголовки разделов: строки Markdown-заголовков, короткие
+    строки с двоеточием в конце и короткие строки прописными буквами"""
+    headings = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = _MARKDOWN_HEADING.match(line)
+        if match:
+            heading = match.group(1)
+        elif len(_WORD.findall(line)) <= MAX_HEADING_WORDS and (
+            line.endswith(":") or (line.isupper() and any(c.isalpha() for c in line))
+        ):
+            heading = line.rstrip(":").strip()
+        else:
+            continue
+        if heading:
+            headings.append(heading[:MAX_HEADING_LENGTH])
+            if len(headings) == MAX_HEADINGS:
+                break
+    return headings
+
+
+def text_stats(content: str) -> dict:
+    """Считает статистику текста резюме для хранения рядом с ним
+
+    Args:
+        content (str): Содержание резюме
+
+    Returns:
+        dict: Количество слов и символов, время чтения в минутах
+            и заголовки разделов
+    """
+    word_count = len(_WORD.findall(content))
+    return {
+        "word_count": word_count,
+        "char_count": len(content),
+        "reading_time": math.ceil(word_count / READING_WORDS_PER_MINUTE),
+        "headings": _headings(content),
+    }
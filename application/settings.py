@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -28,6 +29,70 @@ class Settings(BaseSettings):
     TEST_ALLOWED_HOSTS_STRING: str
     TEST_ORIGINS_STRING: str
     TESTING: bool = False
+    POSTGRES_TEST_DB: str = "test_resumes"
+    POSTGRES_REPLICA_URLS_STRING: str = ""
+    REPLICA_MAX_STALENESS: float = 1.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 1.0
+    REPLICA_RETRY_INTERVAL: float = 5.0
+    REPLICA_CONNECT_TIMEOUT: float = 2.0
+    POSTGRES_SHARD_URLS_STRING: str = ""
+    SHARD_DIRECTORY_CACHE_TTL: float = 5.0
+    SHARD_DIRECTORY_CACHE_SIZE: int = 100_000
+    SHARD_RING_SIZE: Optional[int] = None
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    AUTH_PUBLIC_KEY_TTL: float = 300
+    AUTH_SERVICE_TIMEOUT: float = 5.0
+    IDEMPOTENCY_KEY_TTL: int = 86400
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 30
+    IDEMPOTENCY_POLL_INTERVAL: float = 0.1
+    IDEMPOTENCY_LEASE_TIMEOUT: float = 60
+    RESUME_PURGE_THRESHOLD: int = 1000
+    RESUME_PURGE_BATCH_SIZE: int = 1000
+    HISTORY_RETENTION_KEEP_LAST: Optional[int] = None
+    HISTORY_RETENTION_MAX_AGE_DAYS: Optional[int] = None
+    HISTORY_PARTITIONS_AHEAD: int = 3
+    VERSIONS_KEEP_LAST: Optional[int] = 50
+    MAINTENANCE_BATCH_SIZE: int = 1000
+    MAINTENANCE_BATCH_PAUSE: float = 0.05
+    MAINTENANCE_INTERVAL: Optional[int] = None
+    MAX_REQUEST_BODY_SIZE: int = 1024 * 1024
+    CONTENT_COMPRESSION: str = "lz4"
+    CONTENT_TOAST_TUPLE_TARGET: int = 256
+    RESUMES_BATCH_MAX_IDS: int = 100
+    RESUME_IMPROVEMENTS_INCLUDE_LIMIT: int = 5
+    RESUME_IMPROVEMENTS_INCLUDE_MAX: int = 50
+    IMPROVE_BATCH_CONCURRENCY: int = 8
+    EXECUTORS: Dict[str, Tuple[str, int, int]] = {
+        "improve": ("thread", 8, 64),
+        "auth": ("thread", 2, 256),
+        "similarity": ("thread", 4, 256),
+        "compression": ("thread", 2, 256),
+    }
+    EXECUTOR_QUEUE_TIMEOUT: float = 5.0
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL: float = 0.1
+    LOOP_SLOW_CALLBACK_THRESHOLD: float = 0.1
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMITS: Dict[str, Tuple[int, float]] = {"improve": (10, 60), "write": (60, 60)}
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100_000
+    OUTBOX_RELAY_SINK: Optional[str] = None
+    OUTBOX_RELAY_INTERVAL: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_RETENTION_DAYS: int = 7
+    CHANGES_CHANNEL: str = "resume_changes"
+    CHANGES_HEARTBEAT_INTERVAL: float = 15.0
+    CHANGES_QUEUE_SIZE: int = 100
+    CHANGES_RECONNECT_INTERVAL: float = 1.0
+    SIMILAR_RESUMES_THRESHOLD: float = 0.5
+    SIMILAR_RESUMES_CANDIDATES: int = 200
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0
+    LOG_SQL_SAMPLE_RATE: float = 1.0
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 5
+    COMPRESSION_LIST_LEVEL: int = 7
+    COMPRESSION_CACHE_SIZE: int = 32 * 1024 * 1024
+    COMPRESSION_EXECUTOR_MIN_SIZE: Optional[int] = 64 * 1024
 
     @property
     def ALLOWED_HOSTS(self):
@@ -45,6 +110,14 @@ class Settings(BaseSettings):
     def TEST_ORIGINS(self):
         return self.TEST_ORIGINS_STRING.split(",")
 
+    @property
+    def POSTGRES_REPLICA_URLS(self):
+        return [url for url in self.POSTGRES_REPLICA_URLS_STRING.split(",") if url]
+
+    @property
+    def POSTGRES_SHARD_URLS(self):
+        return [url for url in self.POSTGRES_SHARD_URLS_STRING.split(",") if url]
+
     @property
     def DB_URL(self):
         return (
@@ -56,7 +129,7 @@ class Settings(BaseSettings):
     def DB_URL_testing(self):
         return (
             f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
-            f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/test_resumes"
+            f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_TEST_DB}"
         )
 
     @property
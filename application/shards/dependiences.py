@@ -0,0 +1,6 @@
+from shards.repositories import UserShardsPostgreSQLRepository
+from shards.services import ShardService
+
+
+def shards_service():
+    return ShardService(UserShardsPostgreSQLRepository)
@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+
+
+class UserShard(SQLModel, table=True):
+    """
+    ORM-модель справочника шардов для пользователей, перенесённых
+    с шарда, выбранного согласованным хэшированием.
+    Attrs:
+        user_id (int): Идентификатор пользователя (Primary Key).
+        shard (int): Номер шарда.
+    """
+
+    __tablename__ = "user_shards"
+    __table_args__ = {"extend_existing": True}
+    user_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    shard: int
@@ -0,0 +1,230 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, List
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from database import SHARD_LOCK_CLASS, shards
+from history_improvements.models import ResumeImprovementHistory
+from resumes.models import Resume
+from shards.models import UserShard
+from similarity.models import ResumeSignature, ResumeSignatureBucket
+from user_stats.models import UserStats
+from versions.models import ResumeVersion
+
+# Таблицы с данными пользователя в порядке переноса: история улучшений,
+# версии и сигнатуры хранятся на том же шарде, что и их резюме, счётчики -
+# на шарде пользователя.
+USER_TABLES = (
+    Resume.__table__,
+    ResumeImprovementHistory.__table__,
+    ResumeVersion.__table__,
+    ResumeSignature.__table__,
+    ResumeSignatureBucket.__table__,
+    UserStats.__table__,
+)
+# Таблицы пользователя с идентификаторами из последовательностей
+SEQUENCE_TABLES = (Resume.__table__, ResumeImprovementHistory.__table__)
+
+
+class UserShardsAbstractRepository(ABC):
+    """
+    Абстрактный репозиторий для распределения пользователей по шардам.
+
+    Определяет интерфейс операций:
+    - перенос данных пользователя на другой шард;
+    - закрепление пользователей в справочнике;
+    - получение максимальных идентификаторов;
+    - перезапуск последовательностей идентификаторов.
+    """
+
+    @abstractmethod
+    async def move_user(
+        self, user_id: int, source: int, target: int, batch_size: int, grace: float
+    ) -> Dict[str, int]:
+        """
+        Переносит резюме пользователя и их историю улучшений на другой шард.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            source (int): Номер исходного шарда.
+            target (int): Номер целевого шарда.
+            batch_size (int): Размер пачки при копировании.
+            grace (float): Пауза в секундах между обновлением справочника и
+                удалением данных с исходного шарда.
+        Returns:
+            Dict[str, int]: Количество перенесённых строк по таблицам.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_user_ids(self, shard: int) -> List[int]:
+        """
+        Получает идентификаторы пользователей с данными на шарде.
+        Args:
+            shard (int): Номер шарда.
+        Returns:
+            List[int]: Идентификаторы пользователей.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def pin_users(self, user_ids: List[int], shard: int, batch_size: int) -> int:
+        """
+        Записывает пользователей без записи в справочнике user_shards на шард.
+        Args:
+            user_ids (List[int]): Идентификаторы пользователей.
+            shard (int): Номер шарда.
+            batch_size (int): Размер пачки при записи.
+        Returns:
+            int: Количество добавленных записей справочника.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_max_ids(self, shard: int) -> Dict[str, int]:
+        """
+        Получает максимальные идентификаторы таблиц пользователя на шарде.
+        Args:
+            shard (int): Номер шарда.
+        Returns:
+            Dict[str, int]: Максимальный идентификатор по таблицам.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def restart_sequences(
+        self, shard: int, start: int, increment: int
+    ) -> List[str]:
+        """
+        Перезапускает последовательности идентификаторов таблиц пользователя.
+        Args:
+            shard (int): Номер шарда.
+            start (int): Следующее значение последовательностей.
+            increment (int): Шаг последовательностей.
+        Returns:
+            List[str]: Имена изменённых последовательностей.
+        """
+        raise NotImplementedError
+
+
+class UserShardsPostgreSQLRepository(UserShardsAbstractRepository):
+    """
+    Реализация репозитория распределения пользователей по шардам
+    с использованием PostgreSQL (SQLModel + AsyncSession).
+    """
+
+    @staticmethod
+    async def move_user(
+        user_id: int, source: int, target: int, batch_size: int, grace: float
+    ) -> Dict[str, int]:
+        resume_ids = select(Resume.id).where(Resume.user_id == user_id)
+        filters = {
+            Resume.__tablename__: Resume.user_id == user_id,
+            ResumeImprovementHistory.__tablename__: (
+                ResumeImprovementHistory.resume_id.in_(resume_ids)
+            ),
+            ResumeVersion.__tablename__: ResumeVersion.resume_id.in_(resume_ids),
+            ResumeSignature.__tablename__: ResumeSignature.resume_id.in_(resume_ids),
+            ResumeSignatureBucket.__tablename__: (
+                ResumeSignatureBucket.resume_id.in_(resume_ids)
+            ),
+            UserStats.__tablename__: UserStats.user_id == user_id,
+        }
+        moved = {}
+        async with shards[source].session() as source_session:
+            # Новые записи ждут на разделяемой блокировке в write_session и
+            # после переноса перепроверяют шард по справочнику
+            await source_session.execute(
+                select(func.pg_advisory_xact_lock(SHARD_LOCK_CLASS, user_id))
+            )
+            async with shards[target].session() as target_session:
+                # Остатки прерванного переноса удаляются, чтобы его можно было
+                # безопасно повторить
+                for table in reversed(USER_TABLES):
+                    await target_session.execute(
+                        delete(table)
+                        .where(filters[table.name])
+                        .execution_options(synchronize_session=False)
+                    )
+                for table in USER_TABLES:
+                    moved[table.name] = 0
+                    result = await source_session.stream(
+                        select(table).where(filters[table.name])
+                    )
+                    async for rows in result.mappings().partitions(batch_size):
+                        await target_session.execute(
+                            insert(table), [dict(row) for row in rows]
+                        )
+                        moved[table.name] += len(rows)
+                await target_session.commit()
+            async with shards[0].session() as directory_session:
+                query = pg_insert(UserShard).values(user_id=user_id, shard=target)
+                await directory_session.execute(
+                    query.on_conflict_do_update(
+                        index_elements=[UserShard.user_id],
+                        set_={"shard": query.excluded.shard},
+                    )
+                )
+                await directory_session.commit()
+            # Чтения по закэшированной записи справочника ещё идут на исходный
+            # шард: данные удаляются после истечения кэша во всех процессах
+            await asyncio.sleep(grace)
+            for table in reversed(USER_TABLES):
+                await source_session.execute(
+                    delete(table)
+                    .where(filters[table.name])
+                    .execution_options(synchronize_session=False)
+                )
+            await source_session.commit()
+        return moved
+
+    @staticmethod
+    async def get_user_ids(shard: int) -> List[int]:
+        async with shards[shard].session() as session:
+            result = await session.execute(
+                select(Resume.user_id).union(select(UserStats.user_id))
+            )
+            return result.scalars().all()
+
+    @staticmethod
+    async def pin_users(user_ids: List[int], shard: int, batch_size: int) -> int:
+        pinned = 0
+        async with shards[0].session() as session:
+            for start in range(0, len(user_ids), batch_size):
+                batch = user_ids[start:start + batch_size]
+                result = await session.execute(
+                    pg_insert(UserShard)
+                    .values([{"user_id": elem, "shard": shard} for elem in batch])
+                    .on_conflict_do_nothing(index_elements=[UserShard.user_id])
+                )
+                pinned += result.rowcount
+            await session.commit()
+        return pinned
+
+    @staticmethod
+    async def get_max_ids(shard: int) -> Dict[str, int]:
+        async with shards[shard].session() as session:
+            return {
+                table.name: await session.scalar(
+                    select(func.coalesce(func.max(table.c.id), 0))
+                )
+                for table in SEQUENCE_TABLES
+            }
+
+    @staticmethod
+    async def restart_sequences(shard: int, start: int, increment: int) -> List[str]:
+        sequences = []
+        async with shards[shard].session() as session:
+            for table in SEQUENCE_TABLES:
+                sequence = await session.scalar(
+                    select(func.pg_get_serial_sequence(table.name, "id"))
+                )
+                await session.execute(
+                    text(
+                        f"ALTER SEQUENCE {sequence} "
+                        f"INCREMENT BY {increment} RESTART WITH {start}"
+                    )
+                )
+                sequences.append(sequence)
+            await session.commit()
+        return sequences
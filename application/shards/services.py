@@ -0,0 +1,94 @@
+from typing import Dict
+
+from database import shard_router, shards
+from settings import settings
+from shards.repositories import UserShardsAbstractRepository
+
+
+class ShardService:
+    """
+    Сервис распределения пользователей по шардам.
+    Инкапсулирует бизнес-логику:
+    - онлайн-перенос пользователя на другой шард;
+    - закрепление пользователей в справочнике перед изменением кольца;
+    - настройку непересекающихся идентификаторов на шардах.
+
+    Внешние зависимости: UserShardsAbstractRepository.
+    """
+
+    def __init__(self, repo: UserShardsAbstractRepository):
+        """
+        Инициализация сервиса шардов.
+        Args:
+            repo (UserShardsAbstractRepository): Репозиторий для работы с БД.
+        """
+        self.repo: UserShardsAbstractRepository = repo
+
+    async def move_user(self, user_id: int, target: int) -> Dict[str, int]:
+        """
+        Переносит данные пользователя на шард target. Запись в данные
+        пользователя на время переноса блокируется, чтение продолжает
+        работать.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            target (int): Номер целевого шарда.
+        Returns:
+            Dict[str, int]: Количество перенесённых строк по таблицам, пустой
+                словарь, если пользователь уже на шарде target.
+        Raises:
+            ValueError: Если шарда target не существует.
+        """
+        if not 0 <= target < len(shards):
+            raise ValueError(f"Шард {target} не настроен")
+        # Шард по справочнику, а без записи - по кольцу из SHARD_RING_SIZE
+        # шардов, которое не меняется при подключении новых
+        source = await shard_router.locate(user_id, fresh=True)
+        if source.index == target:
+            return {}
+        moved = await self.repo.move_user(
+            user_id,
+            source.index,
+            target,
+            settings.MAINTENANCE_BATCH_SIZE,
+            settings.SHARD_DIRECTORY_CACHE_TTL,
+        )
+        shard_router.forget(user_id)
+        return moved
+
+    async def pin_users(self) -> Dict[int, int]:
+        """
+        Закрепляет в справочнике user_shards всех пользователей за шардами,
+        на которых лежат их данные. Выполняется перед изменением состава
+        кольца (SHARD_RING_SIZE), иначе пользователи, размещённые только
+        хэшированием, окажутся на другом шарде, а их данные - невидимы.
+        Returns:
+            Dict[int, int]: Количество закреплённых пользователей по шардам.
+        """
+        pinned = {}
+        for shard in shards:
+            user_ids = await self.repo.get_user_ids(shard.index)
+            pinned[shard.index] = await self.repo.pin_users(
+                user_ids, shard.index, settings.MAINTENANCE_BATCH_SIZE
+            )
+        shard_router.clear()
+        return pinned
+
+    async def init_sequences(self) -> Dict[int, int]:
+        """
+        Перезапускает последовательности идентификаторов так, чтобы шард с
+        номером i выдавал идентификаторы, дающие остаток i + 1 при делении
+        на число шардов. Идентификаторы сохраняются при переносе
+        пользователя, поэтому не должны пересекаться между шардами.
+        Returns:
+            Dict[int, int]: Следующий идентификатор по номерам шардов.
+        """
+        count = len(shards)
+        max_id = 0
+        for shard in shards:
+            max_id = max(max_id, *(await self.repo.get_max_ids(shard.index)).values())
+        base = (max_id // count + 1) * count
+        starts = {}
+        for shard in shards:
+            starts[shard.index] = base + shard.index + 1
+            await self.repo.restart_sequences(shard.index, starts[shard.index], count)
+        return starts
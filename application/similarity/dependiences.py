@@ -0,0 +1,6 @@
+from similarity.repositories import SimilarityPostgreSQLRepository
+from similarity.services import SimilarityService
+
+
+def similarity_service():
+    return SimilarityService(SimilarityPostgreSQLRepository)
@@ -0,0 +1,135 @@
+import re
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+# Параметры сигнатур: их изменение требует пересчёта всех сохранённых сигнатур
+MINHASH_PERMUTATIONS = 128
+MINHASH_BANDS = 32
+SHINGLE_SIZE = 3
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Сколько хэшей шинглов обрабатывается за раз: матрица хэшей занимает
+# MINHASH_PERMUTATIONS * SHINGLES_PER_CHUNK * 8 байт
+SHINGLES_PER_CHUNK = 1 << 15
+
+_TOKEN = re.compile(r"\w+")
+_rng = np.random.default_rng(20_251_019)
+_a = _rng.integers(1, MERSENNE_PRIME, size=(MINHASH_PERMUTATIONS, 1), dtype=np.uint64)
+_b = _rng.integers(0, MERSENNE_PRIME, size=(MINHASH_PERMUTATIONS, 1), dtype=np.uint64)
+
+
+def shingles(content: str) -> np.ndarray:
+    """Хэширует шинглы текста - последовательности из SHINGLE_SIZE слов
+
+    Args:
+        content (str): Текст
+
+    Returns:
+        np.ndarray: Уникальные хэши шинглов, пустой массив для текста без слов
+    """
+    tokens = _TOKEN.findall(content.lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    size = min(SHINGLE_SIZE, len(tokens))
+    hashed = {
+        zlib.crc32(" ".join(tokens[i : i + size]).encode())
+        for i in range(len(tokens) - size + 1)
+    }
+    return np.fromiter(hashed, dtype=np.uint64, count=len(hashed))
+
+
+def signatures(contents: Sequence[str]) -> np.ndarray:
+    """Считает MinHash-сигнатуры пачки текстов
+
+    Хэши шинглов всех текстов пачки обрабатываются одной матрицей
+    (a * x + b) mod p на каждую порцию, минимум по тексту берётся
+    np.minimum.reduceat.
+
+    Args:
+        contents (Sequence[str]): Тексты
+
+    Returns:
+        np.ndarray: Сигнатуры размера (len(contents), MINHASH_PERMUTATIONS),
+            у текста без слов все значения равны MERSENNE_PRIME
+    """
+    result = np.full(
+        (len(contents), MINHASH_PERMUTATIONS), MERSENNE_PRIME, dtype=np.uint32
+    )
+    hashed = [shingles(content) for content in contents]
+    chunk: List[int] = []
+    chunk_size = 0
+    for index, values in enumerate(hashed):
+        if not len(values):
+            continue
+        if chunk and chunk_size + len(values) > SHINGLES_PER_CHUNK:
+            _fill(result, hashed, chunk)
+            chunk, chunk_size = [], 0
+        chunk.append(index)
+        chunk_size += len(values)
+    if chunk:
+        _fill(result, hashed, chunk)
+    return result
+
+
+def _fill(result: np.ndarray, hashed: List[np.ndarray], chunk: List[int]) -> None:
+    values = np.concatenate([hashed[index] for index in chunk]) % MERSENNE_PRIME
+    lengths = [len(hashed[index]) for index in chunk]
+    offsets = np.concatenate(([0], np.cumsum(lengths[:-1]))).astype(np.intp)
+    permuted = (_a * values + _b) % MERSENNE_PRIME
+    result[chunk] = np.minimum.reduceat(permuted, offsets, axis=1).T
+
+
+def bands(signature_rows: np.ndarray) -> np.ndarray:
+    """Считает хэши полос LSH: сигнатура делится на MINHASH_BANDS полос,
+    тексты с совпавшей хотя бы одной полосой становятся кандидатами
+
+    Args:
+        signature_rows (np.ndarray): Сигнатуры (n, MINHASH_PERMUTATIONS)
+
+    Returns:
+        np.ndarray: Хэши полос (n, MINHASH_BANDS) типа int64
+    """
+    rows = signature_rows.reshape(len(signature_rows), MINHASH_BANDS, -1).astype(
+        np.uint64
+    )
+    hashed = np.full(rows.shape[:2], 0xCBF29CE484222325, dtype=np.uint64)
+    for column in range(rows.shape[2]):
+        hashed = (hashed ^ rows[:, :, column]) * np.uint64(0x100000001B3)
+    return hashed.view(np.int64)
+
+
+def is_empty(signature_rows: np.ndarray) -> np.ndarray:
+    """Отмечает сигнатуры текстов без слов
+
+    Args:
+        signature_rows (np.ndarray): Сигнатуры (n, MINHASH_PERMUTATIONS)
+
+    Returns:
+        np.ndarray: Булев массив длины n
+    """
+    return signature_rows[:, 0] == MERSENNE_PRIME
+
+
+def similarity(signature: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Оценивает коэффициент Жаккара по доле совпавших значений сигнатур
+
+    Args:
+        signature (np.ndarray): Сигнатура (MINHASH_PERMUTATIONS,)
+        others (np.ndarray): Сигнатуры (n, MINHASH_PERMUTATIONS)
+
+    Returns:
+        np.ndarray: Оценки сходства длины n
+    """
+    return (others == signature).mean(axis=1)
+
+
+def to_bytes(signature: np.ndarray) -> bytes:
+    """Упаковывает сигнатуру для хранения в БД"""
+    return signature.astype("<u4").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    """Распаковывает сигнатуру, сохранённую в БД"""
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
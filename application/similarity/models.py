@@ -0,0 +1,44 @@
+from sqlalchemy import BigInteger, Column, LargeBinary, SmallInteger
+from sqlmodel import SQLModel, Field
+
+
+class ResumeSignature(SQLModel, table=True):
+    """
+    ORM-модель MinHash-сигнатуры содержания резюме.
+    Attrs:
+        resume_id (int): Идентификатор резюме (Primary Key).
+        signature (bytes): Сигнатура - MINHASH_PERMUTATIONS значений uint32.
+    """
+
+    __tablename__ = "resume_signatures"
+    __table_args__ = {"extend_existing": True}
+    resume_id: int = Field(
+        foreign_key="resumes.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False},
+    )
+    signature: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+
+
+class ResumeSignatureBucket(SQLModel, table=True):
+    """
+    ORM-модель корзины LSH: хэш полосы сигнатуры резюме. Резюме с общей
+    корзиной в той же полосе - кандидаты в почти дубликаты.
+    Attrs:
+        band (int): Номер полосы сигнатуры (Primary Key).
+        bucket (int): Хэш полосы (Primary Key).
+        resume_id (int): Идентификатор резюме (Primary Key).
+    """
+
+    __tablename__ = "resume_signature_buckets"
+    __table_args__ = {"extend_existing": True}
+    band: int = Field(sa_column=Column(SmallInteger, primary_key=True))
+    bucket: int = Field(sa_column=Column(BigInteger, primary_key=True))
+    resume_id: int = Field(
+        foreign_key="resumes.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        index=True,
+        sa_column_kwargs={"autoincrement": False},
+    )
@@ -0,0 +1,228 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import delete, desc, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import read_session, shards
+from resumes.models import Resume
+from similarity import minhash
+from similarity.models import ResumeSignature, ResumeSignatureBucket
+from utils.executors import run_in_executor
+
+
+def signature_rows(contents: List[str]) -> List[Tuple[bytes, List[int]]]:
+    """Считает MinHash-сигнатуры и корзины LSH текстов
+
+    Args:
+        contents (List[str]): Тексты
+
+    Returns:
+        List[Tuple[bytes, List[int]]]: Сигнатура и корзины полос каждого
+            текста, у текста без слов корзин нет
+    """
+    signatures = minhash.signatures(contents)
+    band_rows = minhash.bands(signatures)
+    empty = minhash.is_empty(signatures)
+    return [
+        (minhash.to_bytes(signature), [] if skip else [int(elem) for elem in row])
+        for signature, row, skip in zip(signatures, band_rows, empty)
+    ]
+
+
+async def compute_signatures(contents: List[str]) -> List[Tuple[bytes, List[int]]]:
+    """Считает сигнатуры в пуле similarity, не блокируя цикл событий.
+    Вызывается до открытия транзакции, чтобы не удерживать её на время
+    вычислений
+
+    Args:
+        contents (List[str]): Новое содержание резюме
+
+    Returns:
+        List[Tuple[bytes, List[int]]]: Сигнатура и корзины полос каждого
+            текста
+    """
+    if not contents:
+        return []
+    return await run_in_executor("similarity", signature_rows, contents)
+
+
+async def save_signatures(
+    session: AsyncSession, signatures: Dict[int, Tuple[bytes, List[int]]]
+) -> None:
+    """Сохраняет сигнатуры и корзины LSH резюме в переданной сессии,
+    чтобы они сохранялись в одной транзакции с содержанием
+
+    Args:
+        session (AsyncSession): Сессия, изменяющая содержание резюме
+        signatures (Dict[int, Tuple[bytes, List[int]]]): Результаты
+            compute_signatures по идентификаторам резюме
+    """
+    if not signatures:
+        return
+    resume_ids = list(signatures)
+    query = insert(ResumeSignature).values(
+        [
+            {"resume_id": resume_id, "signature": signature}
+            for resume_id, (signature, _) in signatures.items()
+        ]
+    )
+    await session.execute(
+        query.on_conflict_do_update(
+            index_elements=[ResumeSignature.resume_id],
+            set_={"signature": query.excluded.signature},
+        )
+    )
+    await session.execute(
+        delete(ResumeSignatureBucket)
+        .where(ResumeSignatureBucket.resume_id.in_(resume_ids))
+        .execution_options(synchronize_session=False)
+    )
+    buckets = [
+        {"band": band, "bucket": bucket, "resume_id": resume_id}
+        for resume_id, (_, row) in signatures.items()
+        for band, bucket in enumerate(row)
+    ]
+    if buckets:
+        await session.execute(insert(ResumeSignatureBucket), buckets)
+
+
+class SimilarityAbstractRepository(ABC):
+    """
+    Абстрактный репозиторий для поиска похожих резюме.
+
+    Определяет интерфейс операций:
+    - получение сигнатуры резюме;
+    - поиск кандидатов среди резюме пользователя по корзинам LSH;
+    - получение резюме без сигнатур и сохранение их сигнатур.
+    """
+
+    @abstractmethod
+    async def get_signature(self, resume_id: int, user_id: int) -> Optional[bytes]:
+        """
+        Получает сигнатуру резюме пользователя.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+        Returns:
+            Optional[bytes]: Сигнатура или None, если её ещё нет.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_candidates(
+        self,
+        user_id: int,
+        resume_id: int,
+        buckets: List[Tuple[int, int]],
+        limit: int,
+    ) -> List[dict]:
+        """
+        Получает резюме пользователя с общими корзинами, начиная с резюме
+        с наибольшим числом совпавших полос.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            resume_id (int): Идентификатор исходного резюме.
+            buckets (List[Tuple[int, int]]): Корзины (band, bucket) исходного
+                резюме.
+            limit (int): Максимальное количество кандидатов.
+        Returns:
+            List[dict]: Кандидаты с полями resume_id и signature.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_unsigned_batch(
+        self, shard: int, after_id: int, batch_size: int
+    ) -> List[Tuple[int, str]]:
+        """
+        Получает пачку резюме шарда без сигнатур.
+        Args:
+            shard (int): Номер шарда.
+            after_id (int): Идентификатор, после которого продолжить.
+            batch_size (int): Размер пачки.
+        Returns:
+            List[Tuple[int, str]]: Идентификаторы и содержание резюме по
+                возрастанию идентификатора.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def save_batch(self, shard: int, contents: Dict[int, str]) -> None:
+        """
+        Сохраняет сигнатуры пачки резюме шарда.
+        Args:
+            shard (int): Номер шарда.
+            contents (Dict[int, str]): Содержание по идентификаторам резюме.
+        """
+        raise NotImplementedError
+
+
+class SimilarityPostgreSQLRepository(SimilarityAbstractRepository):
+    """
+    Реализация репозитория поиска похожих резюме с использованием
+    PostgreSQL (SQLModel + AsyncSession).
+    """
+
+    @staticmethod
+    async def get_signature(resume_id: int, user_id: int) -> Optional[bytes]:
+        async with read_session(user_id) as session:
+            query = select(ResumeSignature.signature).where(
+                ResumeSignature.resume_id == resume_id,
+                Resume.id == ResumeSignature.resume_id,
+                Resume.user_id == user_id,
+                Resume.deleted_at.is_(None),
+            )
+            return await session.scalar(query)
+
+    @staticmethod
+    async def get_candidates(
+        user_id: int, resume_id: int, buckets: List[Tuple[int, int]], limit: int
+    ) -> List[dict]:
+        async with read_session(user_id) as session:
+            matches = (
+                select(
+                    ResumeSignatureBucket.resume_id,
+                    func.count().label("bands"),
+                )
+                .where(
+                    tuple_(
+                        ResumeSignatureBucket.band, ResumeSignatureBucket.bucket
+                    ).in_(buckets),
+                    ResumeSignatureBucket.resume_id != resume_id,
+                    Resume.id == ResumeSignatureBucket.resume_id,
+                    Resume.user_id == user_id,
+                    Resume.deleted_at.is_(None),
+                )
+                .group_by(ResumeSignatureBucket.resume_id)
+                .order_by(desc("bands"))
+                .limit(limit)
+                .subquery()
+            )
+            query = select(matches.c.resume_id, ResumeSignature.signature).where(
+                ResumeSignature.resume_id == matches.c.resume_id,
+            )
+            result = await session.execute(query)
+            return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    async def get_unsigned_batch(
+        shard: int, after_id: int, batch_size: int
+    ) -> List[Tuple[int, str]]:
+        async with shards[shard].session() as session:
+            query = (
+                select(Resume.id, Resume.content)
+                .outerjoin(ResumeSignature, ResumeSignature.resume_id == Resume.id)
+                .where(Resume.id > after_id, ResumeSignature.resume_id.is_(None))
+                .order_by(Resume.id)
+                .limit(batch_size)
+            )
+            result = await session.execute(query)
+            return [tuple(row) for row in result]
+
+    @staticmethod
+    async def save_batch(shard: int, contents: Dict[int, str]) -> None:
+        signatures = await compute_signatures(list(contents.values()))
+        async with shards[shard].session() as session:
+            await save_signatures(session, dict(zip(contents, signatures)))
+            await session.commit()
@@ -0,0 +1,50 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
+
+from base_dependiences import get_current_user
+from resumes.dependiences import resumes_service
+from resumes.services import ResumeService
+from similarity.dependiences import similarity_service
+from similarity.schemes import SimilarResumeScheme
+from similarity.services import SimilarityService
+
+router = APIRouter(
+    prefix="/api/v1/resumes",
+    tags=["Resume"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/{resume_id}/similar", response_model=List[SimilarResumeScheme])
+async def get_similar_resumes(
+    resume_id: int,
+    request: Request,
+    resume_service: ResumeService = Depends(resumes_service),
+    service: SimilarityService = Depends(similarity_service),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """
+    Найти почти одинаковые резюме среди резюме пользователя.
+
+    Сходство - оценка коэффициента Жаккара шинглов содержания по
+    MinHash-сигнатурам. Кандидаты выбираются по корзинам LSH, поэтому
+    резюме не сравниваются попарно со всеми остальными.
+
+    Args:
+        resume_id (int): Идентификатор резюме.
+        request (Request): Объект FastAPI Request для извлечения user_id.
+        resume_service (ResumeService): Сервис для работы с резюме.
+        service (SimilarityService): Сервис поиска похожих резюме.
+        limit (int): Максимальное количество похожих резюме.
+    Returns:
+        List[SimilarResumeScheme]: Похожие резюме, начиная с самых похожих.
+    Raises:
+        HTTPException: Если резюме с указанным ID не найдено (код 404).
+    """
+    user_id = request.state.user_id
+    resume = await resume_service.get_one_row_by_user_id(resume_id, user_id, ["id"])
+    if not resume:
+        raise HTTPException(status_code=404, detail="Резюме не найдено")
+    return ORJSONResponse(await service.get_similar(resume_id, user_id, limit))
@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel
+
+
+class SimilarResumeScheme(SQLModel):
+    """
+    Схема похожего резюме.
+    Attrs:
+        resume_id (int): Идентификатор резюме.
+        similarity (float): Оценка коэффициента Жаккара шинглов содержания.
+    """
+
+    resume_id: int
+    similarity: float
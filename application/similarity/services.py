@@ -0,0 +1,95 @@
+import asyncio
+from typing import List
+
+import numpy as np
+
+from database import shards
+from settings import settings
+from similarity import minhash
+from similarity.repositories import SimilarityAbstractRepository
+
+
+class SimilarityService:
+    """
+    Сервис поиска почти одинаковых резюме.
+    Инкапсулирует бизнес-логику:
+    - поиск похожих резюме пользователя по корзинам LSH без попарного
+      сравнения;
+    - заполнение сигнатур резюме, созданных до их появления.
+
+    Внешние зависимости: SimilarityAbstractRepository.
+    """
+
+    def __init__(self, repo: SimilarityAbstractRepository):
+        """
+        Инициализация сервиса поиска похожих резюме.
+        Args:
+            repo (SimilarityAbstractRepository): Репозиторий для работы с БД.
+        """
+        self.repo: SimilarityAbstractRepository = repo
+
+    async def get_similar(self, resume_id: int, user_id: int, limit: int) -> List[dict]:
+        """
+        Находит резюме пользователя, похожие на его резюме. Кандидаты
+        берутся из общих корзин LSH на шарде пользователя, сходство
+        оценивается только для них по сигнатурам.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            limit (int): Максимальное количество похожих резюме.
+        Returns:
+            List[dict]: Похожие резюме со сходством не ниже
+                SIMILAR_RESUMES_THRESHOLD, начиная с самых похожих.
+        """
+        data = await self.repo.get_signature(resume_id, user_id)
+        if data is None:
+            return []
+        signature = minhash.from_bytes(data)
+        if minhash.is_empty(signature[None])[0]:
+            return []
+        buckets = list(enumerate(minhash.bands(signature[None])[0].tolist()))
+        candidates = await self.repo.get_candidates(
+            user_id, resume_id, buckets, settings.SIMILAR_RESUMES_CANDIDATES
+        )
+        if not candidates:
+            return []
+        scores = minhash.similarity(
+            signature,
+            np.stack([minhash.from_bytes(elem["signature"]) for elem in candidates]),
+        )
+        similar = [
+            {
+                "resume_id": elem["resume_id"],
+                "similarity": round(float(score), 4),
+            }
+            for elem, score in zip(candidates, scores)
+            if score >= settings.SIMILAR_RESUMES_THRESHOLD
+        ]
+        similar.sort(key=lambda elem: elem["similarity"], reverse=True)
+        return similar[:limit]
+
+    async def backfill(self, batch_size: int, pause: float) -> int:
+        """
+        Считает сигнатуры резюме без них пачками на каждом шарде.
+        Args:
+            batch_size (int): Размер пачки.
+            pause (float): Пауза между пачками в секундах.
+        Returns:
+            int: Количество резюме, получивших сигнатуры.
+        """
+        signed = 0
+        for shard in shards:
+            after_id = 0
+            while True:
+                batch = await self.repo.get_unsigned_batch(
+                    shard.index, after_id, batch_size
+                )
+                if not batch:
+                    break
+                await self.repo.save_batch(shard.index, dict(batch))
+                signed += len(batch)
+                after_id = batch[-1][0]
+                if len(batch) < batch_size:
+                    break
+                await asyncio.sleep(pause)
+        return signed
@@ -0,0 +1,6 @@
+from user_stats.repositories import UserStatsPostgreSQLRepository
+from user_stats.services import UserStatsService
+
+
+def user_stats_service():
+    return UserStatsService(UserStatsPostgreSQLRepository)
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, text
+
+
+class UserStats(SQLModel, table=True):
+    """
+    ORM-модель счётчиков пользователя, изменяемых в тех же транзакциях,
+    что и данные пользователя. Хранится на шарде пользователя.
+    Attrs:
+        user_id (int): Идентификатор пользователя (Primary Key).
+        resumes_count (int): Количество резюме.
+        improvements_count (int): Количество улучшений существующих резюме.
+        last_improved_at (Optional[datetime]): Дата и время последнего
+            улучшения.
+    """
+
+    __tablename__ = "user_stats"
+    __table_args__ = {"extend_existing": True}
+    user_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    resumes_count: int = Field(default=0, sa_column_kwargs={"server_default": text("0")})
+    improvements_count: int = Field(
+        default=0, sa_column_kwargs={"server_default": text("0")}
+    )
+    last_improved_at: Optional[datetime] = None
@@ -0,0 +1,228 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from sqlalchemy import DateTime, Integer, bindparam, func, select, union
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import read_session, shards
+from history_improvements.models import ResumeImprovementHistory
+from resumes.models import Resume
+from user_stats.models import UserStats
+
+
+async def bump_user_stats(
+    session: AsyncSession,
+    user_id: int,
+    resumes: int = 0,
+    improvements: int = 0,
+    improved: bool = False,
+) -> None:
+    """Изменяет счётчики пользователя в переданной сессии, чтобы они
+    сохранялись в одной транзакции с данными
+
+    Args:
+        session (AsyncSession): Сессия, изменяющая данные пользователя
+        user_id (int): Идентификатор пользователя
+        resumes (int): Изменение количества резюме
+        improvements (int): Изменение количества улучшений
+        improved (bool): Обновить время последнего улучшения
+    """
+    query = insert(UserStats).values(
+        user_id=user_id,
+        resumes_count=resumes,
+        improvements_count=improvements,
+        last_improved_at=(
+            func.timezone("utc", func.now(), type_=DateTime) if improved else None
+        ),
+    )
+    table = UserStats.__table__
+    await session.execute(
+        query.on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                "resumes_count": table.c.resumes_count + query.excluded.resumes_count,
+                "improvements_count": (
+                    table.c.improvements_count + query.excluded.improvements_count
+                ),
+                "last_improved_at": func.greatest(
+                    table.c.last_improved_at, query.excluded.last_improved_at
+                ),
+            },
+        )
+    )
+
+
+class UserStatsAbstractRepository(ABC):
+    """
+    Абстрактный репозиторий для работы со счётчиками пользователей.
+
+    Определяет интерфейс операций:
+    - получение счётчиков пользователя;
+    - пересчёт счётчиков по данным пользователей.
+    """
+
+    @abstractmethod
+    async def get_one(self, user_id: int, fields: List[str]) -> Optional[dict]:
+        """
+        Получает счётчики пользователя.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена столбцов.
+        Returns:
+            Optional[dict]: Счётчики или None, если у пользователя ещё
+                не было данных.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_user_ids_after(
+        self, shard: int, after_user_id: int, batch_size: int
+    ) -> List[int]:
+        """
+        Получает пачку пользователей шарда с резюме или счётчиками.
+        Args:
+            shard (int): Номер шарда.
+            after_user_id (int): Идентификатор, после которого продолжить.
+            batch_size (int): Размер пачки.
+        Returns:
+            List[int]: Идентификаторы пользователей по возрастанию.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def rebuild_batch(self, shard: int, user_ids: List[int]) -> int:
+        """
+        Пересчитывает счётчики пачки пользователей шарда с нуля.
+        Args:
+            shard (int): Номер шарда.
+            user_ids (List[int]): Идентификаторы пользователей.
+        Returns:
+            int: Количество пользователей, счётчики которых изменились.
+        """
+        raise NotImplementedError
+
+
+class UserStatsPostgreSQLRepository(UserStatsAbstractRepository):
+    """
+    Реализация репозитория счётчиков пользователей с использованием
+    PostgreSQL (SQLModel + AsyncSession).
+    """
+
+    @staticmethod
+    async def get_one(user_id: int, fields: List[str]) -> Optional[dict]:
+        table = UserStats.__table__
+        async with read_session(user_id) as session:
+            query = select(*(table.c[field] for field in fields)).where(
+                table.c.user_id == user_id
+            )
+            result = await session.execute(query)
+            row = result.mappings().one_or_none()
+            return dict(row) if row is not None else None
+
+    @staticmethod
+    async def get_user_ids_after(
+        shard: int, after_user_id: int, batch_size: int
+    ) -> List[int]:
+        async with shards[shard].session() as session:
+            users = union(
+                select(Resume.user_id.label("user_id")),
+                select(UserStats.user_id),
+            ).subquery()
+            query = (
+                select(users.c.user_id)
+                .where(users.c.user_id > after_user_id)
+                .order_by(users.c.user_id)
+                .limit(batch_size)
+            )
+            return list(await session.scalars(query))
+
+    @staticmethod
+    async def rebuild_batch(shard: int, user_ids: List[int]) -> int:
+        async with shards[shard].session() as session:
+            # Блокируются только строки счётчиков пачки: изменения счётчиков
+            # этих пользователей ждут пересчёта, а ещё не зафиксированные
+            # изменения данных не видны в нём и применят своё приращение
+            # к пересчитанным значениям. Недостающие строки создаются
+            # заранее, чтобы параллельная вставка тоже ждала блокировки.
+            user_ids = sorted(user_ids)
+            await session.execute(
+                insert(UserStats)
+                .values([{"user_id": user_id} for user_id in user_ids])
+                .on_conflict_do_nothing(index_elements=[UserStats.user_id])
+            )
+            await session.execute(
+                select(UserStats.user_id)
+                .where(UserStats.user_id.in_(user_ids))
+                .order_by(UserStats.user_id)
+                .with_for_update()
+            )
+            resumes = (
+                select(
+                    Resume.user_id,
+                    func.count().label("resumes_count"),
+                    func.sum(Resume.improvements_count).label("improvements_count"),
+                )
+                .where(Resume.user_id.in_(user_ids), Resume.deleted_at.is_(None))
+                .group_by(Resume.user_id)
+                .subquery()
+            )
+            improvements = (
+                select(
+                    Resume.user_id,
+                    func.max(ResumeImprovementHistory.created_at).label(
+                        "last_improved_at"
+                    ),
+                )
+                .where(
+                    Resume.user_id.in_(user_ids),
+                    Resume.deleted_at.is_(None),
+                    ResumeImprovementHistory.resume_id == Resume.id,
+                )
+                .group_by(Resume.user_id)
+                .subquery()
+            )
+            users = select(
+                func.unnest(
+                    bindparam("user_ids", user_ids, type_=ARRAY(Integer))
+                ).label("user_id")
+            ).subquery()
+            actual = (
+                select(
+                    users.c.user_id,
+                    func.coalesce(resumes.c.resumes_count, 0),
+                    func.coalesce(resumes.c.improvements_count, 0),
+                    improvements.c.last_improved_at,
+                )
+                .select_from(users)
+                .outerjoin(resumes, resumes.c.user_id == users.c.user_id)
+                .outerjoin(improvements, improvements.c.user_id == users.c.user_id)
+            )
+            table = UserStats.__table__
+            query = insert(UserStats).from_select(
+                ["user_id", "resumes_count", "improvements_count", "last_improved_at"],
+                actual,
+            )
+            query = query.on_conflict_do_update(
+                index_elements=[UserStats.user_id],
+                set_={
+                    "resumes_count": query.excluded.resumes_count,
+                    "improvements_count": query.excluded.improvements_count,
+                    "last_improved_at": func.greatest(
+                        table.c.last_improved_at, query.excluded.last_improved_at
+                    ),
+                },
+                where=(
+                    table.c.resumes_count.is_distinct_from(query.excluded.resumes_count)
+                    | table.c.improvements_count.is_distinct_from(
+                        query.excluded.improvements_count
+                    )
+                    | table.c.last_improved_at.is_distinct_from(
+                        func.greatest(
+                            table.c.last_improved_at, query.excluded.last_improved_at
+                        )
+                    )
+                ),
+            )
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse
+
+from base_dependiences import get_current_user
+from user_stats.dependiences import user_stats_service
+from user_stats.schemes import UserStatsResponseScheme
+from user_stats.services import UserStatsService
+
+router = APIRouter(
+    prefix="/api/v1/stats",
+    tags=["Stats"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/", response_model=UserStatsResponseScheme)
+async def get_user_stats(
+    request: Request,
+    service: UserStatsService = Depends(user_stats_service),
+    time_zone: str = "UTC"
+):
+    """
+    Получить счётчики пользователя: количество резюме, количество их
+    улучшений и время последнего улучшения.
+
+    Счётчики хранятся в отдельной строке и изменяются в тех же транзакциях,
+    что и данные, поэтому чтение не зависит от размера истории.
+
+    Args:
+        request (Request): Объект FastAPI Request для извлечения user_id.
+        service (UserStatsService): Сервис счётчиков пользователей.
+        time_zone (str): Часовой пояс
+    Returns:
+        UserStatsResponseScheme: Счётчики пользователя.
+    """
+    return ORJSONResponse(await service.get_one(request.state.user_id, time_zone))
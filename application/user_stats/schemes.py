@@ -0,0 +1,12 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel
+
+
+class UserStatsResponseScheme(SQLModel):
+    """Схема для отдачи счётчиков пользователя наружу."""
+
+    resumes_count: int
+    improvements_count: int
+    last_improved_at: Optional[datetime] = None
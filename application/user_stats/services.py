@@ -0,0 +1,77 @@
+import asyncio
+from datetime import timezone
+from zoneinfo import ZoneInfo
+
+from database import shards
+from user_stats.repositories import UserStatsAbstractRepository
+from user_stats.schemes import UserStatsResponseScheme
+
+
+class UserStatsService:
+    """
+    Сервис счётчиков пользователей.
+    Инкапсулирует бизнес-логику:
+    - получение счётчиков пользователя;
+    - пересчёт счётчиков по данным пользователей.
+
+    Внешние зависимости: UserStatsAbstractRepository.
+    """
+
+    def __init__(self, repo: UserStatsAbstractRepository):
+        """
+        Инициализация сервиса счётчиков.
+        Args:
+            repo (UserStatsAbstractRepository): Репозиторий для работы с БД.
+        """
+        self.repo: UserStatsAbstractRepository = repo
+
+    async def get_one(self, user_id: int, time_zone: str) -> dict:
+        """
+        Получает счётчики пользователя одним чтением строки.
+        Args:
+            user_id (int): Идентификатор пользователя.
+            time_zone (str): Часовой пояс
+        Returns:
+            dict: Счётчики, нулевые для пользователя без данных.
+        """
+        stats = await self.repo.get_one(
+            user_id, list(UserStatsResponseScheme.model_fields)
+        )
+        if stats is None:
+            return {
+                "resumes_count": 0,
+                "improvements_count": 0,
+                "last_improved_at": None,
+            }
+        if stats["last_improved_at"] is not None:
+            stats["last_improved_at"] = (
+                stats["last_improved_at"]
+                .replace(tzinfo=timezone.utc)
+                .astimezone(ZoneInfo(time_zone))
+            )
+        return stats
+
+    async def reconcile(self, batch_size: int, pause: float) -> int:
+        """
+        Пересчитывает счётчики всех пользователей пачками на каждом шарде.
+        Args:
+            batch_size (int): Количество пользователей в пачке.
+            pause (float): Пауза между пачками в секундах.
+        Returns:
+            int: Количество пользователей, счётчики которых были исправлены.
+        """
+        fixed = 0
+        for shard in shards:
+            after_user_id = 0
+            while True:
+                user_ids = await self.repo.get_user_ids_after(
+                    shard.index, after_user_id, batch_size
+                )
+                if not user_ids:
+                    break
+                fixed += await self.repo.rebuild_batch(shard.index, user_ids)
+                after_user_id = user_ids[-1]
+                if len(user_ids) < batch_size:
+                    break
+                await asyncio.sleep(pause)
+        return fixed
@@ -1,3 +1,8 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
 import aiohttp
 
 from settings import settings
@@ -7,8 +12,17 @@ class AuthClient:
     """
     Клиент для обращения к Auth-сервису.
     Использует aiohttp для асинхронных запросов.
+
+    Сессия aiohttp и публичный ключ общие для всех экземпляров в воркере:
+    сессия создаётся при первом запросе (уже после fork), ключ кэшируется
+    на AUTH_PUBLIC_KEY_TTL секунд.
     """
 
+    _session: Optional[aiohttp.ClientSession] = None
+    _public_key: Optional[str] = None
+    _fetched_at: float = 0.0
+    _lock = asyncio.Lock()
+
     def __init__(self):
         """
         Инициализация клиента.
@@ -17,18 +31,65 @@ class AuthClient:
         """
         self.base_url = settings.AUTH_SERVICE_URL
 
+    @classmethod
+    def session(cls) -> aiohttp.ClientSession:
+        """Возвращает общую сессию aiohttp, создавая её при необходимости."""
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=settings.AUTH_SERVICE_TIMEOUT)
+            )
+        return cls._session
+
+    @classmethod
+    async def close(cls) -> None:
+        """Закрывает общую сессию aiohttp."""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+
     async def get_public_key(self) -> str:
         """
-        Получает публичный ключ от Auth-сервиса.
+        Получает публичный ключ от Auth-сервиса, используя кэш. Если ключ
+        не удалось обновить, возвращается устаревший ключ.
+        Returns:
+            str: Публичный ключ в формате PEM.
+        Raises:
+            RuntimeError: Если ключ ни разу не был получен.
+        """
+        cls = type(self)
+        if self.__is_fresh():
+            return cls._public_key
+        async with cls._lock:
+            if self.__is_fresh():
+                return cls._public_key
+            try:
+                cls._public_key = await self.fetch_public_key()
+                cls._fetched_at = time.monotonic()
+            except (RuntimeError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if cls._public_key is None:
+                    if isinstance(e, RuntimeError):
+                        raise
+                    raise RuntimeError(f"Auth-сервис недоступен: {e!r}") from e
+                logging.warning("Используется устаревший public key: %s", e)
+            return cls._public_key
+
+    async def fetch_public_key(self) -> str:
+        """
+        Запрашивает публичный ключ у Auth-сервиса.
         Returns:
             str: Публичный ключ в формате PEM.
         Raises:
             RuntimeError: Если запрос завершился ошибкой.
         """
         url = f"{self.base_url}{settings.PUBLIC_KEY_PATH}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                if resp.status != 200:
-                    raise RuntimeError(f"Ошибка при получении public key: {resp.status}")
-                data = await resp.json()
-                return data["public_key"]
+        async with self.session().get(url) as resp:
+            if resp.status != 200:
+                raise RuntimeError(f"Ошибка при получении public key: {resp.status}")
+            data = await resp.json()
+            return data["public_key"]
+
+    def __is_fresh(self) -> bool:
+        return (
+            type(self)._public_key is not None
+            and time.monotonic() - type(self)._fetched_at < settings.AUTH_PUBLIC_KEY_TTL
+        )
@@ -0,0 +1,158 @@
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from database import async_engine
+from resumes.models import Resume
+from resumes.queries import RESUME_BY_USER
+from utils.storage import content_compression_sql, content_storage_params
+
+
+async def _per_call(
+    engine: AsyncEngine,
+    iterations: int,
+    call: Callable[[AsyncSession, int], Awaitable],
+) -> float:
+    """Среднее время вызова на одном соединении в микросекундах"""
+    async with engine.connect() as connection:
+        session = AsyncSession(bind=connection)
+        for elem in range(min(iterations, 100)):
+            await call(session, elem)
+        started = time.perf_counter()
+        for elem in range(iterations):
+            await call(session, elem)
+        elapsed = time.perf_counter() - started
+        await session.close()
+    return round(elapsed / iterations * 1_000_000, 1)
+
+
+async def benchmark_statements(iterations: int) -> List[dict]:
+    """
+    Сравнивает накладные расходы на поиск резюме по первичному ключу:
+    сборку запроса при каждом вызове без кэша prepared statements asyncpg
+    (как было), сборку при каждом вызове с кэшем и заранее построенный
+    запрос с кэшем (как сейчас).
+    Args:
+        iterations (int): Количество вызовов в каждом варианте.
+    Returns:
+        List[dict]: Среднее время вызова по вариантам в микросекундах.
+    """
+
+    async def adhoc(session: AsyncSession, elem: int):
+        query = select(Resume).where(
+            Resume.id == -elem,
+            Resume.user_id == elem,
+            Resume.deleted_at.is_(None),
+        )
+        return (await session.execute(query)).scalar_one_or_none()
+
+    async def cached(session: AsyncSession, elem: int):
+        result = await session.execute(
+            RESUME_BY_USER, {"resume_id": -elem, "user_id": elem}
+        )
+        return result.scalar_one_or_none()
+
+    unprepared = create_async_engine(
+        async_engine.url,
+        poolclass=NullPool,
+        connect_args={"prepared_statement_cache_size": 0},
+    )
+    try:
+        cases = [
+            ("adhoc_unprepared", unprepared, adhoc),
+            ("adhoc", async_engine, adhoc),
+            ("cached", async_engine, cached),
+        ]
+        return [
+            {"case": name, "us_per_call": await _per_call(engine, iterations, call)}
+            for name, engine, call in cases
+        ]
+    finally:
+        await unprepared.dispose()
+
+
+async def benchmark_storage(rows: int, iterations: int) -> List[dict]:
+    """
+    Сравнивает запросы к резюме при хранении по умолчанию (как было:
+    содержание, сжатое до ~2 КБ, остаётся в строке таблицы) и с настроенным
+    хранением (как сейчас: сжатие CONTENT_COMPRESSION и вынос в TOAST до
+    CONTENT_TOAST_TUPLE_TARGET байт). Данные создаются во временных таблицах
+    и удаляются вместе с соединением.
+    Args:
+        rows (int): Количество резюме в каждой таблице, по 20 на пользователя.
+        iterations (int): Количество выполнений каждого запроса.
+    Returns:
+        List[dict]: Размер основной таблицы и среднее время запросов
+            по вариантам хранения в микросекундах.
+    """
+    queries = {
+        "list_metadata": (
+            "SELECT id, title, version FROM {table} WHERE user_id = :user_id"
+        ),
+        "list_content": (
+            "SELECT id, title, version, content FROM {table} WHERE user_id = :user_id"
+        ),
+        "scan_metadata": "SELECT count(*), max(version) FROM {table}",
+    }
+    users = max(rows // 20, 1)
+    report = []
+    async with async_engine.connect() as connection:
+        for storage, table in (("default", "bench_default"), ("tuned", "bench_tuned")):
+            await connection.execute(
+                text(
+                    f"CREATE TEMP TABLE {table} (id serial PRIMARY KEY, "
+                    "user_id integer NOT NULL, title text NOT NULL, "
+                    "content text NOT NULL, version integer NOT NULL DEFAULT 1)"
+                )
+            )
+            if storage == "tuned":
+                await connection.execute(
+                    text(content_compression_sql(table, "content"))
+                )
+                await connection.execute(
+                    text(f"ALTER TABLE {table} SET ({content_storage_params()})")
+                )
+            # Содержание ~4 КБ из 40 повторяющихся слов сжимается до ~1.2 КБ
+            # и по умолчанию остаётся в строке таблицы
+            await connection.execute(
+                text(
+                    f"INSERT INTO {table} (user_id, title, content) "
+                    "SELECT elem % :users, 'Резюме ' || elem, "
+                    "(SELECT string_agg("
+                    "substr(md5(floor(random() * 40)::int::text), 1, 7), ' ') "
+                    "FROM generate_series(1, 500) WHERE elem > 0) "
+                    "FROM generate_series(1, :rows) AS elem"
+                ),
+                {"users": users, "rows": rows},
+            )
+            await connection.execute(text(f"CREATE INDEX ON {table} (user_id)"))
+            await connection.execute(text(f"ANALYZE {table}"))
+            heap_bytes = await connection.scalar(
+                text(f"SELECT pg_relation_size('{table}')")
+            )
+            report.append(
+                {"case": "heap_size", "storage": storage, "bytes": heap_bytes}
+            )
+            for name, query in queries.items():
+                statement = text(query.format(table=table))
+                for elem in range(min(iterations, 100)):
+                    await connection.execute(statement, {"user_id": elem % users})
+                started = time.perf_counter()
+                for elem in range(iterations):
+                    result = await connection.execute(
+                        statement, {"user_id": elem % users}
+                    )
+                    result.all()
+                elapsed = time.perf_counter() - started
+                report.append(
+                    {
+                        "case": name,
+                        "storage": storage,
+                        "us_per_call": round(elapsed / iterations * 1_000_000, 1),
+                    }
+                )
+        await connection.rollback()
+    return report
@@ -0,0 +1,280 @@
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from fastapi import Depends, Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.executors import ExecutorOverloadedError, run_in_executor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Ключ в request.state с уровнем сжатия, заданным для маршрута
+COMPRESSION_LEVEL_STATE = "compression_level"
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=level)
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+# Доступные кодировки в порядке предпочтения при одинаковом q
+ENCODERS: Dict[str, Callable[[bytes, int], bytes]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = _zstd
+if brotli is not None:
+    ENCODERS["br"] = _brotli
+ENCODERS["gzip"] = _gzip
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Выбирает кодировку сжатия по заголовку Accept-Encoding
+
+    Args:
+        accept_encoding (str): Значение заголовка Accept-Encoding
+
+    Returns:
+        Optional[str]: Кодировка или None, если клиент не принимает ни одну
+            из доступных
+    """
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    best, best_quality = None, 0.0
+    for encoding in ENCODERS:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Проверяет, имеет ли смысл сжимать ответ с таким Content-Type
+
+    Args:
+        content_type (str): Значение заголовка Content-Type
+
+    Returns:
+        bool: True для текстовых и JSON ответов, кроме потоков событий
+    """
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "text/event-stream":
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type == "application/json"
+        or media_type.endswith(("+json", "+xml", "/javascript", "/xml"))
+    )
+
+
+class CompressedBodyCache:
+    """
+    LRU-кэш сжатых тел ответов: повторный ответ с тем же телом, например
+    неизменённое резюме, не сжимается заново.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Инициализация кэша.
+        Args:
+            max_bytes (int): Максимальный суммарный размер сжатых тел.
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[Tuple[bytes, str, int], bytes]" = OrderedDict()
+
+    @staticmethod
+    def key(body: bytes, encoding: str, level: int) -> Tuple[bytes, str, int]:
+        """Ключ кэша: хэш тела ответа, кодировка и уровень сжатия"""
+        return hashlib.blake2b(body, digest_size=16).digest(), encoding, level
+
+    def get(self, key: Tuple[bytes, str, int]) -> Optional[bytes]:
+        """Возвращает сжатое тело или None"""
+        compressed = self._items.get(key)
+        if compressed is not None:
+            self._items.move_to_end(key)
+        return compressed
+
+    def put(self, key: Tuple[bytes, str, int], compressed: bytes) -> None:
+        """Сохраняет сжатое тело, вытесняя давно не использованные"""
+        if len(compressed) > self.max_bytes or key in self._items:
+            return
+        self._items[key] = compressed
+        self.size += len(compressed)
+        while self.size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware сжатия ответов (zstd и brotli, если установлены
+    соответствующие пакеты, иначе gzip).
+
+    Сжимаются текстовые и JSON ответы с известной длиной не меньше
+    minimum_size байт. Потоковые ответы без Content-Length (в том числе
+    text/event-stream) передаются без изменений. Уровень сжатия маршрута
+    задаётся зависимостью compression_level, 0 отключает сжатие. Ответы,
+    которые могли быть сжаты, получают Vary: Accept-Encoding, даже если
+    отданы без сжатия. Тела от executor_min_size байт сжимаются в пуле
+    compression, чтобы не блокировать цикл событий.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        level: int,
+        cache_size: int = 0,
+        executor_min_size: Optional[int] = None,
+    ):
+        """
+        Инициализация middleware.
+        Args:
+            app (ASGIApp): ASGI-приложение.
+            minimum_size (int): Минимальный размер тела для сжатия в байтах.
+            level (int): Уровень сжатия по умолчанию.
+            cache_size (int): Размер кэша сжатых тел в байтах, 0 отключает кэш.
+            executor_min_size (Optional[int]): Минимальный размер тела для
+                сжатия в пуле compression, None - сжимать в цикле событий.
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.cache = CompressedBodyCache(cache_size) if cache_size else None
+        self.executor_min_size = executor_min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        state = scope.setdefault("state", {})
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        passthrough = False
+        level = self.level
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough, level
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                headers = MutableHeaders(raw=message["headers"])
+                length = headers.get("content-length")
+                level = state.get(COMPRESSION_LEVEL_STATE, self.level)
+                compressible = not (
+                    not level
+                    or message["status"] in (204, 304)
+                    or "content-encoding" in headers
+                    or length is None
+                    or not is_compressible(headers.get("content-type", ""))
+                )
+                if compressible:
+                    # Другому клиенту или с другим телом ответ отдаётся сжатым,
+                    # поэтому кэши должны различать его по Accept-Encoding
+                    headers.add_vary_header("Accept-Encoding")
+                passthrough = (
+                    not compressible
+                    or encoding is None
+                    or int(length) < self.minimum_size
+                )
+                if passthrough:
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            try:
+                body = await self.compress(body, encoding, level)
+            except ExecutorOverloadedError:
+                # Пул сжатия перегружен: ответ отдаётся без сжатия
+                pass
+            else:
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    async def compress(self, body: bytes, encoding: str, level: int) -> bytes:
+        """Сжимает тело ответа, используя кэш сжатых тел. Тела от
+        executor_min_size байт сжимаются в пуле compression
+
+        Args:
+            body (bytes): Тело ответа
+            encoding (str): Кодировка сжатия
+            level (int): Уровень сжатия
+
+        Returns:
+            bytes: Сжатое тело
+
+        Raises:
+            ExecutorOverloadedError: Если очередь пула compression переполнена
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(body, encoding, level)
+            compressed = self.cache.get(key)
+            if compressed is not None:
+                return compressed
+        if self.executor_min_size is not None and len(body) >= self.executor_min_size:
+            compressed = await run_in_executor(
+                "compression", ENCODERS[encoding], body, level
+            )
+        else:
+            compressed = ENCODERS[encoding](body, level)
+        if key is not None:
+            self.cache.put(key, compressed)
+        return compressed
+
+
+def compression_level(level: int):
+    """Зависимость маршрута, задающая уровень сжатия его ответов
+
+    Args:
+        level (int): Уровень сжатия, 0 отключает сжатие
+
+    Returns:
+        Зависимость FastAPI
+    """
+
+    def dependency(request: Request) -> None:
+        setattr(request.state, COMPRESSION_LEVEL_STATE, level)
+
+    return Depends(dependency)
@@ -0,0 +1,160 @@
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from settings import settings
+from utils.logs import request_id
+
+EXECUTOR_KIND_THREAD = "thread"
+EXECUTOR_KIND_PROCESS = "process"
+
+
+class ExecutorOverloadedError(Exception):
+    """Очередь пула переполнена дольше EXECUTOR_QUEUE_TIMEOUT секунд."""
+
+
+def _run_with_request_id(
+    current_request_id: Optional[str], func: Callable, *args: Any
+) -> Any:
+    """Выполняет функцию в процессе пула с идентификатором запроса для
+    журналов (контекст не передаётся в другой процесс)"""
+    request_id.set(current_request_id)
+    return func(*args)
+
+
+class BoundedExecutor:
+    """
+    Пул потоков или процессов для блокирующих и CPU-bound вызовов с
+    ограниченной очередью: одновременно выполняется не больше max_workers
+    вызовов и ждёт не больше queue_size. Вызов, не получивший места за
+    EXECUTOR_QUEUE_TIMEOUT секунд, отклоняется, а не копится в памяти.
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int, queue_size: int):
+        """
+        Инициализация пула.
+        Args:
+            name (str): Имя пула для журналов и метрик.
+            kind (str): thread или process.
+            max_workers (int): Количество потоков или процессов.
+            queue_size (int): Количество вызовов, ожидающих свободного
+                потока или процесса.
+        """
+        if kind not in (EXECUTOR_KIND_THREAD, EXECUTOR_KIND_PROCESS):
+            raise ValueError(f"Неизвестный тип пула {name}: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self.rejected = 0
+        self.completed = 0
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def executor(self) -> Executor:
+        """Пул создаётся при первом вызове, то есть уже в воркере, а не в
+        главном процессе gunicorn при preload_app."""
+        if self._executor is None:
+            if self.kind == EXECUTOR_KIND_PROCESS:
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix=f"executor-{self.name}"
+                )
+        return self._executor
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_workers + self.queue_size)
+        return self._semaphore
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Выполняет функцию в пуле, не блокируя цикл событий.
+        Args:
+            func (Callable): Функция, для пула процессов - доступная по
+                импорту вместе с аргументами.
+            *args (Any): Аргументы функции.
+        Returns:
+            Any: Результат функции.
+        Raises:
+            ExecutorOverloadedError: Если очередь пула переполнена.
+        """
+        semaphore = self.semaphore
+        try:
+            await asyncio.wait_for(
+                semaphore.acquire(), settings.EXECUTOR_QUEUE_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            logging.warning("Очередь пула %s переполнена", self.name)
+            raise ExecutorOverloadedError from None
+        self.in_flight += 1
+        try:
+            if self.kind == EXECUTOR_KIND_PROCESS:
+                call = functools.partial(
+                    _run_with_request_id, request_id.get(), func, *args
+                )
+            else:
+                call = functools.partial(
+                    contextvars.copy_context().run, func, *args
+                )
+            return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            semaphore.release()
+
+    def metrics(self) -> dict:
+        """Состояние пула"""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Останавливает потоки или процессы пула."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+executors: Dict[str, BoundedExecutor] = {
+    name: BoundedExecutor(name, *params) for name, params in settings.EXECUTORS.items()
+}
+
+
+async def run_in_executor(name: str, func: Callable, *args: Any) -> Any:
+    """Выполняет блокирующую функцию в пуле с именем из EXECUTORS
+
+    Args:
+        name (str): Имя пула
+        func (Callable): Функция
+        *args (Any): Аргументы функции
+
+    Returns:
+        Any: Результат функции
+
+    Raises:
+        ExecutorOverloadedError: Если очередь пула переполнена
+    """
+    return await executors[name].run(func, *args)
+
+
+def shutdown_executors() -> None:
+    """Останавливает все пулы при остановке воркера."""
+    for executor in executors.values():
+        executor.shutdown()
@@ -1,3 +1,9 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
 class ImproveClient:
     """
     Клиент для обращения к сервису,
@@ -7,10 +13,23 @@ class ImproveClient:
     def improve_resume(self, text: str) -> str:
         """Функция для улучшения содержания резюме
 
+        Записи журнала получают X-Request-ID текущего запроса, в том числе
+        при вызове в пуле utils.executors. HTTP-запрос к сервису улучшения
+        должен передавать заголовки utils.logs.request_headers().
+
         Args:
             text (str): Содержание резюме
 
         Returns:
             str: Улучшенное содержание резюме
         """
-        return text + " [Improved]"
\ No newline at end of file
+        started = time.perf_counter()
+        improved = text + " [Improved]"
+        logger.info(
+            "Резюме улучшено",
+            extra={
+                "chars": len(text),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            },
+        )
+        return improved
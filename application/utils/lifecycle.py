@@ -0,0 +1,72 @@
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from database import dispose_engines, warm_up
+from settings import settings
+from utils.auth_service import AuthClient
+from utils.executors import shutdown_executors
+
+
+async def startup() -> None:
+    """
+    Подготовка воркера к приёму запросов: открывает соединения пулов
+    и заранее получает публичный ключ Auth-сервиса.
+    """
+    started = time.perf_counter()
+    opened = await warm_up(settings.DB_POOL_WARMUP_CONNECTIONS)
+    if not settings.TESTING:
+        try:
+            await AuthClient().get_public_key()
+        except RuntimeError as e:
+            logging.warning("Public key не получен при запуске: %s", e)
+    logging.info(
+        "Воркер готов за %.3f с, открыто соединений с БД: %s",
+        time.perf_counter() - started,
+        opened,
+    )
+
+
+async def shutdown() -> None:
+    """Закрывает HTTP-клиенты, пулы потоков и процессов и соединения с БД
+    при остановке воркера."""
+    await AuthClient.close()
+    shutdown_executors()
+    await dispose_engines()
+
+
+def import_report(module: str = "main", top: int = 20) -> List[dict]:
+    """
+    Замеряет время импорта модуля в отдельном процессе (python -X importtime).
+    Args:
+        module (str): Импортируемый модуль.
+        top (int): Количество модулей в отчёте.
+    Returns:
+        List[dict]: Модули с наибольшим суммарным временем импорта
+            (cumulative_ms включает вложенные импорты).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        modules.append(
+            {
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    modules.sort(key=lambda elem: elem["cumulative_ms"], reverse=True)
+    return modules[:top]
@@ -0,0 +1,69 @@
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_TOO_LARGE_DETAIL = "Размер запроса превышает допустимый"
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware ограничения размера тела запроса.
+
+    Запрос с Content-Length больше max_size отклоняется с кодом 413 до
+    чтения тела. Тело без Content-Length (chunked) считается по мере
+    поступления: как только лимит превышен, чтение прекращается и
+    возвращается 413, остаток тела не читается и не буферизуется.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        """
+        Инициализация middleware.
+        Args:
+            app (ASGIApp): ASGI-приложение.
+            max_size (int): Максимальный размер тела запроса в байтах.
+        """
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        length = Headers(scope=scope).get("content-length")
+        if length is not None and length.isdigit() and int(length) > self.max_size:
+            await self.reject(scope, receive, send)
+            return
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    raise HTTPException(413, REQUEST_TOO_LARGE_DETAIL)
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except HTTPException as e:
+            if e.status_code != 413 or response_started:
+                raise
+            await self.reject(scope, receive, send)
+
+    @staticmethod
+    async def reject(scope: Scope, receive: Receive, send: Send) -> None:
+        response = JSONResponse(
+            status_code=413,
+            content={"detail": REQUEST_TOO_LARGE_DETAIL},
+            headers={"Connection": "close"},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,175 @@
+import copy
+import logging
+import queue
+import random
+import sys
+import uuid
+import zlib
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from settings import settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Идентификатор обрабатываемого запроса: переходит в задачи и потоки
+# asyncio.to_thread вместе с контекстом
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Стандартные атрибуты LogRecord, не попадающие в JSON как доп. поля
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "request_id"}
+
+
+class RequestIdFilter(logging.Filter):
+    """Добавляет в запись идентификатор текущего запроса."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Пропускает часть записей журналов доступа и SQL. Доля задаётся
+    настройками LOG_ACCESS_SAMPLE_RATE и LOG_SQL_SAMPLE_RATE; решение
+    принимается по идентификатору запроса, поэтому все SQL-запросы одного
+    HTTP-запроса либо пишутся, либо отбрасываются вместе.
+    """
+
+    RATES = {
+        "uvicorn.access": "LOG_ACCESS_SAMPLE_RATE",
+        "sqlalchemy.engine": "LOG_SQL_SAMPLE_RATE",
+    }
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for prefix, setting in self.RATES.items():
+            if record.name.startswith(prefix):
+                rate = getattr(settings, setting)
+                break
+        else:
+            return True
+        if rate >= 1:
+            return True
+        key = getattr(record, "request_id", None)
+        if key is None:
+            return random.random() < rate
+        return zlib.crc32(key.encode()) % 10_000 < rate * 10_000
+
+
+class JSONFormatter(logging.Formatter):
+    """Форматирует запись в одну строку JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            data["request_id"] = record.request_id
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        return orjson.dumps(data, default=str).decode()
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Обработчик, который только кладёт запись в очередь: запись в поток
+    вывода и форматирование выполняются фоновым потоком QueueListener,
+    поэтому цикл событий не блокируется на stdout.
+
+    Идентификатор запроса и выборка применяются до постановки в очередь,
+    пока запись ещё в контексте запроса.
+    """
+
+    def __init__(self, stream=None, json: bool = True):
+        """
+        Инициализация обработчика.
+        Args:
+            stream: Поток вывода, по умолчанию sys.stdout.
+            json (bool): Писать записи в формате JSON.
+        """
+        super().__init__(queue.SimpleQueue())
+        self.addFilter(RequestIdFilter())
+        self.addFilter(SamplingFilter())
+        target = logging.StreamHandler(stream or sys.stdout)
+        target.setFormatter(
+            JSONFormatter()
+            if json
+            else logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        )
+        self.listener = QueueListener(self.queue, target, respect_handler_level=True)
+        self.listener.start()
+        self.stopped = False
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self) -> None:
+        # Вызывается и logging.shutdown при выходе: остаток очереди
+        # записывается до завершения процесса
+        if not self.stopped:
+            self.stopped = True
+            self.listener.stop()
+        super().close()
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware идентификатора запроса: берёт его из заголовка
+    X-Request-ID или создаёт новый, делает доступным журналам через
+    request_id и возвращает в ответе.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Инициализация middleware.
+        Args:
+            app (ASGIApp): ASGI-приложение.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        value = Headers(scope=scope).get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        token = request_id.set(value[:64])
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id.get()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
+
+
+def request_headers() -> Dict[str, str]:
+    """Заголовки для исходящих запросов к другим сервисам
+
+    Returns:
+        Dict[str, str]: X-Request-ID текущего запроса, если он есть
+    """
+    value = request_id.get()
+    return {REQUEST_ID_HEADER: value} if value else {}
@@ -0,0 +1,132 @@
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional
+
+from settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограммы задержки цикла событий в миллисекундах
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class LagHistogram:
+    """Гистограмма задержек цикла событий."""
+
+    def __init__(self, buckets: tuple = LAG_BUCKETS_MS):
+        """
+        Инициализация гистограммы.
+        Args:
+            buckets (tuple): Верхние границы корзин в миллисекундах.
+        """
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, lag_ms: float) -> None:
+        """Учитывает одно измерение задержки"""
+        self.counts[bisect.bisect_left(self.buckets, lag_ms)] += 1
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    def snapshot(self) -> dict:
+        """Накопительные значения корзин в формате гистограммы Prometheus"""
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "buckets_ms": buckets,
+            "count": self.count,
+            "sum_ms": round(self.total_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class LoopLagMonitor:
+    """
+    Монитор задержки цикла событий воркера.
+
+    Корутина монитора просыпается каждые LOOP_LAG_INTERVAL секунд и
+    записывает в гистограмму, насколько позже она проснулась. Сторожевой
+    поток следит за отметкой корутины: если цикл не обновлял её дольше
+    LOOP_SLOW_CALLBACK_THRESHOLD секунд, поток записывает в журнал стек
+    потока цикла, то есть код, который его блокирует.
+    """
+
+    def __init__(self):
+        self.histogram = LagHistogram()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+
+    def start(self) -> None:
+        """Запускает монитор в текущем цикле событий."""
+        self._stopped.clear()
+        self._beat = time.monotonic()
+        self._loop_thread_id = threading.get_ident()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Останавливает монитор."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        interval = settings.LOOP_LAG_INTERVAL
+        while True:
+            started = time.monotonic()
+            self._beat = started
+            await asyncio.sleep(interval)
+            lag = time.monotonic() - started - interval
+            self.histogram.observe(max(lag, 0.0) * 1000)
+
+    def _watch(self) -> None:
+        threshold = settings.LOOP_SLOW_CALLBACK_THRESHOLD
+        # Отметка обновляется раз в LOOP_LAG_INTERVAL, это время не задержка
+        limit = settings.LOOP_LAG_INTERVAL + threshold
+        reported = None
+        while not self._stopped.wait(threshold / 2):
+            beat = self._beat
+            blocked = time.monotonic() - beat
+            if blocked < limit or beat == reported:
+                continue
+            reported = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            logger.warning(
+                "Цикл событий заблокирован дольше %.0f мс",
+                threshold * 1000,
+                extra={
+                    "blocked_ms": round((blocked - settings.LOOP_LAG_INTERVAL) * 1000),
+                    "stack": "".join(traceback.format_stack(frame)),
+                },
+            )
+
+
+loop_monitor = LoopLagMonitor()
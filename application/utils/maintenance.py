@@ -0,0 +1,121 @@
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from database import async_engine
+from history_improvements.dependiences import history_improvement_resume_service
+from idempotency.dependiences import idempotency_service
+from outbox.dependiences import outbox_service
+from resumes.dependiences import resumes_service
+from settings import settings
+from versions.dependiences import resume_versions_service
+
+# Ключ advisory lock, чтобы обслуживание одновременно выполнял один воркер.
+MAINTENANCE_LOCK_ID = 7_310_428
+
+
+@asynccontextmanager
+async def maintenance_lock(lock_id: int = MAINTENANCE_LOCK_ID) -> AsyncIterator[bool]:
+    """Удерживает advisory lock фоновой задачи
+
+    Args:
+        lock_id (int): Ключ блокировки, по умолчанию блокировка обслуживания БД
+
+    Yields:
+        bool: True, если блокировка получена
+    """
+    async with async_engine.connect() as connection:
+        locked = await connection.scalar(select(func.pg_try_advisory_lock(lock_id)))
+        if not locked:
+            logging.info("Задача %s уже выполняется другим процессом", lock_id)
+        try:
+            yield locked
+        finally:
+            if locked:
+                await connection.scalar(select(func.pg_advisory_unlock(lock_id)))
+            await connection.commit()
+
+
+async def create_partitions(months_ahead: Optional[int] = None) -> List[str]:
+    """Создаёт месячные секции истории улучшений заранее.
+
+    Args:
+        months_ahead (Optional[int]): Количество месяцев вперёд,
+            по умолчанию HISTORY_PARTITIONS_AHEAD.
+
+    Returns:
+        List[str]: Имена созданных секций.
+    """
+    if months_ahead is None:
+        months_ahead = settings.HISTORY_PARTITIONS_AHEAD
+    async with maintenance_lock() as locked:
+        if not locked:
+            return []
+        created = await history_improvement_resume_service().create_partitions(
+            months_ahead
+        )
+    if created:
+        logging.info("Созданы секции истории улучшений: %s", ", ".join(created))
+    return created
+
+
+async def run_maintenance(
+    keep_last: Optional[int] = None,
+    max_age_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    versions_keep_last: Optional[int] = None,
+) -> Dict[str, int]:
+    """Выполняет обслуживание БД пачками небольшого размера:
+    - создаёт месячные секции истории улучшений заранее;
+    - применяет политику хранения истории улучшений;
+    - дочищает мягко удалённые резюме;
+    - удаляет устаревшие версии резюме;
+    - удаляет истёкшие ключи идемпотентности;
+    - удаляет события изменений старше OUTBOX_RETENTION_DAYS дней.
+
+    Args:
+        keep_last (Optional[int]): Количество последних улучшений резюме,
+            по умолчанию HISTORY_RETENTION_KEEP_LAST.
+        max_age_days (Optional[int]): Срок хранения улучшений в днях,
+            по умолчанию HISTORY_RETENTION_MAX_AGE_DAYS.
+        batch_size (Optional[int]): Размер пачки, по умолчанию
+            MAINTENANCE_BATCH_SIZE.
+        versions_keep_last (Optional[int]): Количество последних версий
+            резюме, по умолчанию VERSIONS_KEEP_LAST.
+
+    Returns:
+        Dict[str, int]: Количество удалённых строк по таблицам, пустой словарь,
+            если обслуживание уже выполняется другим процессом.
+    """
+    if keep_last is None:
+        keep_last = settings.HISTORY_RETENTION_KEEP_LAST
+    if max_age_days is None:
+        max_age_days = settings.HISTORY_RETENTION_MAX_AGE_DAYS
+    if versions_keep_last is None:
+        versions_keep_last = settings.VERSIONS_KEEP_LAST
+    batch_size = batch_size or settings.MAINTENANCE_BATCH_SIZE
+    pause = settings.MAINTENANCE_BATCH_PAUSE
+    await create_partitions()
+    async with maintenance_lock() as locked:
+        if not locked:
+            return {}
+        history_service = history_improvement_resume_service()
+        report = {
+            "resume_improvement_history": await history_service.apply_retention(
+                keep_last, max_age_days, batch_size, pause
+            ),
+            "resumes_soft_deleted": await resumes_service().purge_deleted(),
+            "resume_versions": await resume_versions_service().prune(
+                versions_keep_last, batch_size, pause
+            ),
+            "idempotency_keys": await idempotency_service().purge_expired(
+                batch_size, pause
+            ),
+            "outbox_events": await outbox_service().purge_expired(
+                settings.OUTBOX_RETENTION_DAYS, batch_size, pause
+            ),
+        }
+    logging.info("Обслуживание БД завершено, удалено строк: %s", report)
+    return report
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+
+class PeriodicTask:
+    """
+    Фоновая задача, периодически выполняемая в цикле событий воркера.
+    """
+
+    def __init__(self, func: Callable[[], Awaitable], interval: float):
+        """
+        Инициализация задачи.
+        Args:
+            func (Callable[[], Awaitable]): Выполняемая корутина.
+            interval (float): Интервал между запусками в секундах.
+        """
+        self.func = func
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Запускает задачу в текущем цикле событий."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает задачу и дожидается её завершения."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.func()
+            except Exception:
+                logging.exception("Ошибка периодической задачи %s", self.func.__name__)
@@ -0,0 +1,43 @@
+"""
+Хранение больших текстовых столбцов (содержание резюме и улучшений).
+
+Строка длиннее ~2 КБ сжимается, и по умолчанию сжатое содержание остаётся
+в строке таблицы, если укладывается в ~2 КБ. С CONTENT_TOAST_TUPLE_TARGET
+содержание выносится в TOAST, пока строка не станет короче этого размера,
+и в основной таблице остаётся указатель. Строки с метаданными узкие:
+выборки по ix_resumes_user_id и списки без содержания читают меньше
+страниц, а содержание распаковывается, только если оно выбрано в запросе.
+Сжатие CONTENT_COMPRESSION (lz4) быстрее pglz при чтении и записи.
+"""
+from settings import settings
+
+
+def content_compression_sql(table: str, column: str) -> str:
+    """SQL, задающий метод сжатия столбца. Если сервер собран без
+    поддержки метода, остаётся метод по умолчанию (pglz)
+
+    Args:
+        table (str): Имя таблицы
+        column (str): Имя столбца
+
+    Returns:
+        str: Блок DO
+    """
+    return (
+        "DO $$ BEGIN "
+        f"ALTER TABLE {table} ALTER COLUMN {column} "
+        f"SET COMPRESSION {settings.CONTENT_COMPRESSION}; "
+        "EXCEPTION WHEN feature_not_supported THEN "
+        f"RAISE NOTICE 'Сжатие {settings.CONTENT_COMPRESSION} не поддерживается'; "
+        "END $$"
+    )
+
+
+def content_storage_params() -> str:
+    """Параметры хранения таблицы с содержанием для WITH (...) и SET (...).
+    Для секционированной таблицы задаются у каждой секции
+
+    Returns:
+        str: Параметры хранения
+    """
+    return f"toast_tuple_target = {settings.CONTENT_TOAST_TUPLE_TARGET}"
@@ -0,0 +1,6 @@
+from versions.repositories import ResumeVersionsPostgreSQLRepository
+from versions.services import ResumeVersionService
+
+
+def resume_versions_service():
+    return ResumeVersionService(ResumeVersionsPostgreSQLRepository)
@@ -0,0 +1,42 @@
+from typing import Optional
+from datetime import datetime
+from sqlmodel import SQLModel, Field, text
+
+# Изменения содержания резюме, создающие версию
+VERSION_SOURCE_CREATE = "create"
+VERSION_SOURCE_UPDATE = "update"
+VERSION_SOURCE_IMPROVE = "improve"
+
+
+class ResumeVersion(SQLModel, table=True):
+    """
+    ORM-модель версии содержания резюме для хранения в базе данных.
+
+    Версии образуют дерево: после отката к старой версии следующее изменение
+    получает новый номер и ссылается на неё как на родителя.
+
+    Attrs:
+        resume_id (int): Идентификатор резюме (Primary Key).
+        version (int): Номер версии в пределах резюме (Primary Key).
+        parent_version (Optional[int]): Номер версии, из которой получена
+            эта версия, None для первой версии.
+        content (str): Содержание резюме в этой версии.
+        source (str): Изменение, создавшее версию: create, update или improve.
+        created_at (datetime): Дата и время создания версии.
+    """
+
+    __tablename__ = "resume_versions"
+    __table_args__ = {"extend_existing": True}
+    resume_id: int = Field(
+        foreign_key="resumes.id",
+        ondelete="CASCADE",
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": False},
+    )
+    version: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    parent_version: Optional[int] = None
+    content: str
+    source: str
+    created_at: datetime = Field(
+        sa_column_kwargs={"server_default": text("TIMEZONE('utc', now())")}
+    )
@@ -0,0 +1,249 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from sqlalchemy import delete, desc, func, or_, select, tuple_, update
+
+from database import read_session, shards, write_session
+from outbox.models import RESUME_REVERTED, outbox_event
+from notifications.repositories import notify_change
+from resumes.models import Resume
+from similarity.repositories import compute_signatures, save_signatures
+from versions.models import ResumeVersion
+
+
+class ResumeVersionsAbstractRepository(ABC):
+    """
+    Абстрактный репозиторий для работы с версиями резюме.
+
+    Определяет интерфейс операций с версиями:
+    - получение списка версий резюме;
+    - получение содержания версии;
+    - откат резюме к версии;
+    - удаление устаревших версий.
+    """
+
+    @abstractmethod
+    async def get_all_by_resume_id(
+        self, resume_id: int, user_id: int, fields: List[str]
+    ) -> List[dict]:
+        """
+        Получает указанные поля всех версий резюме пользователя, начиная
+        с последней.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            fields (List[str]): Имена столбцов.
+        Returns:
+            List[dict]: Список полей версий, пустой если резюме не найдено.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_content(
+        self, resume_id: int, user_id: int, version: int
+    ) -> Optional[str]:
+        """
+        Получает содержание версии резюме пользователя.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            version (int): Номер версии.
+        Returns:
+            Optional[str]: Содержание версии или None, если резюме или версия
+                не найдены.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def revert(
+        self,
+        resume_id: int,
+        user_id: int,
+        version: int,
+        content: str,
+        stats: dict,
+        fields: List[str],
+    ) -> Optional[dict]:
+        """
+        Делает версию текущей: переносит на неё указатель текущей версии
+        и копирует её содержание в резюме на стороне БД.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            version (int): Номер версии.
+            content (str): Содержание версии, прочитанное до отката.
+            stats (dict): Статистика содержания версии.
+            fields (List[str]): Имена столбцов резюме в результате.
+        Returns:
+            Optional[dict]: Поля резюме или None, если резюме или версия
+                не найдены.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_resume_ids_after(
+        self, after_id: int, limit: int, shard: int
+    ) -> List[int]:
+        """
+        Получает идентификаторы резюме с версиями на шарде по возрастанию.
+        Args:
+            after_id (int): Идентификатор, после которого продолжить.
+            limit (int): Количество резюме.
+            shard (int): Номер шарда.
+        Returns:
+            List[int]: Идентификаторы резюме.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_outdated_batch(
+        self, resume_ids: List[int], keep_last: int, batch_size: int, shard: int
+    ) -> int:
+        """
+        Удаляет пачку версий, не входящих в keep_last последних версий
+        резюме. Текущая версия резюме не удаляется, а версии мягко
+        удалённых резюме удаляются целиком.
+        Args:
+            resume_ids (List[int]): Идентификаторы резюме.
+            keep_last (int): Количество последних версий резюме.
+            batch_size (int): Размер пачки.
+            shard (int): Номер шарда.
+        Returns:
+            int: Количество удалённых версий.
+        """
+        raise NotImplementedError
+
+
+class ResumeVersionsPostgreSQLRepository(ResumeVersionsAbstractRepository):
+    """
+    Реализация репозитория версий резюме с использованием
+    PostgreSQL (SQLModel + AsyncSession).
+    """
+
+    @staticmethod
+    async def get_all_by_resume_id(
+        resume_id: int, user_id: int, fields: List[str]
+    ) -> List[dict]:
+        table = ResumeVersion.__table__
+        async with read_session(user_id) as session:
+            query = (
+                select(*(table.c[field] for field in fields))
+                .where(
+                    table.c.resume_id == resume_id,
+                    Resume.id == table.c.resume_id,
+                    Resume.user_id == user_id,
+                    Resume.deleted_at.is_(None),
+                )
+                .order_by(desc(table.c.version))
+            )
+            result = await session.execute(query)
+            keys = list(result.keys())
+            return [dict(zip(keys, row)) for row in result]
+
+    @staticmethod
+    async def get_content(resume_id: int, user_id: int, version: int) -> Optional[str]:
+        # Версия могла быть создана только что и ещё не дойти до реплики
+        async with write_session(user_id) as session:
+            query = select(ResumeVersion.content).where(
+                ResumeVersion.resume_id == resume_id,
+                ResumeVersion.version == version,
+                Resume.id == ResumeVersion.resume_id,
+                Resume.user_id == user_id,
+                Resume.deleted_at.is_(None),
+            )
+            return await session.scalar(query)
+
+    @staticmethod
+    async def revert(
+        resume_id: int,
+        user_id: int,
+        version: int,
+        content: str,
+        stats: dict,
+        fields: List[str],
+    ) -> Optional[dict]:
+        # Сигнатура считается в пуле до транзакции, чтобы не держать
+        # блокировку строки резюме во время вычислений
+        (signature,) = await compute_signatures([content])
+        async with write_session(user_id) as session:
+            # Версии не изменяются, поэтому существование строки версии
+            # под блокировкой UPDATE означает, что её содержание, статистика
+            # и сигнатура совпадают с посчитанными заранее
+            query = (
+                update(Resume)
+                .where(
+                    Resume.id == resume_id,
+                    Resume.user_id == user_id,
+                    Resume.deleted_at.is_(None),
+                    ResumeVersion.resume_id == Resume.id,
+                    ResumeVersion.version == version,
+                )
+                .values(
+                    version=ResumeVersion.version,
+                    content=ResumeVersion.content,
+                    **stats,
+                )
+                .returning(*(Resume.__table__.c[field] for field in fields))
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.execute(query)
+            row = result.mappings().one_or_none()
+            if row is None:
+                return None
+            await save_signatures(session, {resume_id: signature})
+            event = outbox_event(RESUME_REVERTED, user_id, resume_id, version=version)
+            session.add(event)
+            await notify_change(session, event)
+            await session.commit()
+            return dict(row)
+
+    @staticmethod
+    async def get_resume_ids_after(after_id: int, limit: int, shard: int) -> List[int]:
+        async with shards[shard].session() as session:
+            query = (
+                select(ResumeVersion.resume_id)
+                .where(ResumeVersion.resume_id > after_id)
+                .group_by(ResumeVersion.resume_id)
+                .order_by(ResumeVersion.resume_id)
+                .limit(limit)
+            )
+            result = await session.execute(query)
+            return result.scalars().all()
+
+    @staticmethod
+    async def delete_outdated_batch(
+        resume_ids: List[int], keep_last: int, batch_size: int, shard: int
+    ) -> int:
+        async with shards[shard].session() as session:
+            ranked = (
+                select(
+                    ResumeVersion.resume_id,
+                    ResumeVersion.version,
+                    func.row_number()
+                    .over(
+                        partition_by=ResumeVersion.resume_id,
+                        order_by=desc(ResumeVersion.version),
+                    )
+                    .label("position"),
+                )
+                .where(ResumeVersion.resume_id.in_(resume_ids))
+                .subquery()
+            )
+            outdated = (
+                select(ranked.c.resume_id, ranked.c.version)
+                .join(Resume, Resume.id == ranked.c.resume_id)
+                .where(
+                    or_(
+                        Resume.deleted_at.is_not(None),
+                        (ranked.c.position > keep_last)
+                        & (ranked.c.version != Resume.version),
+                    )
+                )
+                .limit(batch_size)
+            )
+            query = delete(ResumeVersion).where(
+                ResumeVersion.resume_id.in_(resume_ids),
+                tuple_(ResumeVersion.resume_id, ResumeVersion.version).in_(outdated),
+            ).execution_options(synchronize_session=False)
+            result = await session.execute(query)
+            await session.commit()
+            return result.rowcount
@@ -0,0 +1,84 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+
+from base_dependiences import get_current_user
+from rate_limits.dependiences import rate_limit
+from resumes.dependiences import RESUME_FIELDS
+from resumes.schemes import ResumeResponseScheme
+from versions.dependiences import resume_versions_service
+from versions.schemes import ResumeRevertScheme, ResumeVersionResponseScheme
+from versions.services import ResumeVersionService
+
+router = APIRouter(
+    prefix="/api/v1/resumes",
+    tags=["Resume"],
+    dependencies=[Depends(get_current_user)]
+)
+
+
+@router.get("/{resume_id}/versions", response_model=List[ResumeVersionResponseScheme])
+async def get_resume_versions(
+    resume_id: int,
+    request: Request,
+    version_service: ResumeVersionService = Depends(resume_versions_service),
+    time_zone: str = "UTC"
+):
+    """
+    Получить список версий содержания резюме, начиная с последней.
+
+    Содержание версии можно получить запросом
+    GET /api/v1/resumes/{resume_id}?version=N.
+
+    Args:
+        resume_id (int): Идентификатор резюме.
+        request (Request): Объект FastAPI Request для извлечения user_id.
+        version_service (ResumeVersionService): Сервис для работы с версиями.
+        time_zone (str): Часовой пояс
+    Returns:
+        List[ResumeVersionResponseScheme]: Список версий резюме.
+    Raises:
+        HTTPException: Если резюме с указанным ID не найдено (код 404).
+    """
+    user_id = request.state.user_id
+    versions = await version_service.get_all_by_resume_id(resume_id, user_id, time_zone)
+    if not versions:
+        raise HTTPException(status_code=404, detail="Резюме не найдено")
+    return ORJSONResponse(versions)
+
+
+@router.post(
+    "/{resume_id}/revert",
+    response_model=ResumeResponseScheme,
+    dependencies=[rate_limit("write")],
+)
+async def revert_resume(
+    resume_id: int,
+    revert: ResumeRevertScheme,
+    request: Request,
+    version_service: ResumeVersionService = Depends(resume_versions_service),
+):
+    """
+    Откатить содержание резюме к версии.
+
+    Указатель текущей версии переносится на указанную версию, содержание
+    копируется из неё на стороне БД. История версий не изменяется.
+
+    Args:
+        resume_id (int): Идентификатор резюме.
+        revert (ResumeRevertScheme): Номер версии.
+        request (Request): Объект FastAPI Request для извлечения user_id.
+        version_service (ResumeVersionService): Сервис для работы с версиями.
+    Returns:
+        ResumeResponseScheme: Резюме пользователя.
+    Raises:
+        HTTPException: Если резюме или версия не найдены (код 404).
+    """
+    user_id = request.state.user_id
+    resume = await version_service.revert(
+        resume_id, user_id, revert.version, RESUME_FIELDS
+    )
+    if not resume:
+        raise HTTPException(status_code=404, detail="Версия резюме не найдена")
+    return ORJSONResponse(resume)
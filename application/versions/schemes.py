@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import Field, SQLModel
+
+
+class ResumeVersionResponseScheme(SQLModel):
+    """Схема для отображения версии резюме без содержания."""
+
+    version: int
+    parent_version: Optional[int]
+    source: str
+    created_at: datetime
+
+
+class ResumeRevertScheme(SQLModel):
+    """Схема для отката резюме к версии."""
+
+    version: int = Field(ge=1)
@@ -0,0 +1,122 @@
+import asyncio
+from datetime import timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+
+from database import shards
+from resumes.models import RESUME_CONTENT_MAX_LENGTH
+from resumes.stats import text_stats
+from versions.repositories import ResumeVersionsAbstractRepository
+from versions.schemes import ResumeVersionResponseScheme
+
+
+class ResumeVersionTooLargeError(Exception):
+    """Содержание версии резюме длиннее RESUME_CONTENT_MAX_LENGTH."""
+
+
+class ResumeVersionService:
+    """
+    Сервис для работы с версиями резюме.
+    Инкапсулирует бизнес-логику:
+    - получение списка версий резюме;
+    - откат резюме к версии;
+    - удаление устаревших версий.
+
+    Внешние зависимости: ResumeVersionsAbstractRepository.
+    """
+
+    def __init__(self, repo: ResumeVersionsAbstractRepository):
+        """
+        Инициализация сервиса версий резюме.
+        Args:
+            repo (ResumeVersionsAbstractRepository): Репозиторий для работы с БД.
+        """
+        self.repo: ResumeVersionsAbstractRepository = repo
+
+    async def get_all_by_resume_id(
+        self, resume_id: int, user_id: int, time_zone: str
+    ) -> List[dict]:
+        """
+        Получает список версий резюме без их содержания.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            time_zone (str): Часовой пояс
+        Returns:
+            List[dict]: Список версий, начиная с последней.
+        """
+        versions = await self.repo.get_all_by_resume_id(
+            resume_id, user_id, list(ResumeVersionResponseScheme.model_fields)
+        )
+        user_tz = ZoneInfo(time_zone)
+        for elem in versions:
+            elem["created_at"] = (
+                elem["created_at"].replace(tzinfo=timezone.utc).astimezone(user_tz)
+            )
+        return versions
+
+    async def revert(
+        self, resume_id: int, user_id: int, version: int, fields: List[str]
+    ) -> Optional[dict]:
+        """
+        Откатывает резюме к версии. Новая версия не создаётся: следующее
+        изменение получит новый номер и будет ссылаться на эту версию.
+        Args:
+            resume_id (int): Идентификатор резюме.
+            user_id (int): Идентификатор пользователя.
+            version (int): Номер версии.
+            fields (List[str]): Поля резюме в результате.
+        Returns:
+            Optional[dict]: Поля резюме или None, если резюме или версия
+                не найдены.
+        Raises:
+            ResumeVersionTooLargeError: Если содержание версии длиннее
+                RESUME_CONTENT_MAX_LENGTH (версии, созданные до введения
+                ограничения).
+        """
+        content = await self.repo.get_content(resume_id, user_id, version)
+        if content is None:
+            return None
+        if len(content) > RESUME_CONTENT_MAX_LENGTH:
+            raise ResumeVersionTooLargeError
+        return await self.repo.revert(
+            resume_id, user_id, version, content, text_stats(content), fields
+        )
+
+    async def prune(
+        self, keep_last: Optional[int], batch_size: int, pause: float
+    ) -> int:
+        """
+        Удаляет пачками на каждом шарде версии, не входящие в keep_last
+        последних версий резюме, и все версии мягко удалённых резюме.
+        Текущая версия резюме сохраняется, даже если она старше.
+        Args:
+            keep_last (Optional[int]): Количество последних версий резюме,
+                None - хранить все.
+            batch_size (int): Размер пачки.
+            pause (float): Пауза между пачками в секундах.
+        Returns:
+            int: Количество удалённых версий.
+        """
+        if keep_last is None:
+            return 0
+        deleted = 0
+        for shard in shards:
+            last_resume_id = 0
+            while True:
+                resume_ids = await self.repo.get_resume_ids_after(
+                    last_resume_id, batch_size, shard.index
+                )
+                if not resume_ids:
+                    break
+                while True:
+                    batch = await self.repo.delete_outdated_batch(
+                        resume_ids, keep_last, batch_size, shard.index
+                    )
+                    deleted += batch
+                    if batch < batch_size:
+                        break
+                    await asyncio.sleep(pause)
+                last_resume_id = resume_ids[-1]
+                await asyncio.sleep(pause)
+        return deleted
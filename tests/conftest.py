@@ -1,9 +1,39 @@
 import asyncio
+import os
 from typing import Any, Generator
 
 import pytest
 
 
+def _is_controller(config: pytest.Config) -> bool:
+    return not hasattr(config, "workerinput")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Каждый воркер pytest-xdist работает со своей копией шаблона БД. Имя
+    # задаётся до импорта приложения, которое создаёт движок при импорте.
+    name = os.environ.setdefault("POSTGRES_TEST_DB", "test_resumes")
+    if not _is_controller(config):
+        os.environ["POSTGRES_TEST_DB"] = f"{name}_{config.workerinput['workerid']}"
+    config.addinivalue_line(
+        "markers", "commits: тест фиксирует данные, без отката транзакции"
+    )
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    if _is_controller(session.config):
+        from tests.integrations.fixtures.base import create_template_database
+
+        asyncio.run(create_template_database())
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    if _is_controller(session.config):
+        from tests.integrations.fixtures.base import TEMPLATE_DB, drop_database
+
+        asyncio.run(drop_database(TEMPLATE_DB))
+
+
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, Any, None]:
     loop = asyncio.get_event_loop()
@@ -1,12 +1,24 @@
+import asyncio
+
 import pytest_asyncio
+from asyncpg.exceptions import ObjectInUseError
 from httpx import AsyncClient
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import SQLModel
 
 from application.main import app
-from application.database import async_engine
+import database
+from rate_limits.dependiences import rate_limit_service
+from settings import settings
+
+# Шаблон схемы, из которого каждый воркер pytest-xdist клонирует свою БД
+TEMPLATE_DB = "test_resumes_template"
 
 
 class FakeAuthMiddleware(BaseHTTPMiddleware):
@@ -24,30 +36,113 @@ class FakeAuthMiddleware(BaseHTTPMiddleware):
 app.add_middleware(FakeAuthMiddleware)
 
 
+def database_url(name: str) -> str:
+    """DSN тестовой БД с указанным именем"""
+    return (
+        f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@"
+        f"{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{name}"
+    )
+
+
+async def execute_admin(*statements: str) -> None:
+    """Выполняет команды CREATE/DROP DATABASE вне транзакции"""
+    engine = create_async_engine(
+        database_url("postgres"), poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+    try:
+        async with engine.connect() as conn:
+            for statement in statements:
+                await conn.execute(text(statement))
+    finally:
+        await engine.dispose()
+
+
+async def drop_database(name: str) -> None:
+    """Удаляет тестовую БД, в том числе шаблон"""
+    await execute_admin(
+        f"UPDATE pg_database SET datistemplate = false WHERE datname = '{name}'",
+        f"DROP DATABASE IF EXISTS {name} WITH (FORCE)",
+    )
+
+
+async def create_template_database() -> None:
+    """
+    Создаёт шаблон тестовой БД: таблицы моделей создаются один раз на запуск
+    тестов, а не в каждом воркере.
+    """
+    await drop_database(TEMPLATE_DB)
+    await execute_admin(f"CREATE DATABASE {TEMPLATE_DB}")
+    engine = create_async_engine(database_url(TEMPLATE_DB), poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+    finally:
+        await engine.dispose()
+    await execute_admin(
+        f"ALTER DATABASE {TEMPLATE_DB} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false"
+    )
+
+
+async def clone_database(name: str) -> None:
+    """
+    Создаёт БД воркера копированием шаблона. Пока шаблон копирует другой
+    воркер, CREATE DATABASE может завершиться ошибкой, поэтому повторяется.
+    """
+    await drop_database(name)
+    for attempt in range(50):
+        try:
+            await execute_admin(f"CREATE DATABASE {name} TEMPLATE {TEMPLATE_DB}")
+            return
+        except DBAPIError as e:
+            if not isinstance(e.orig.__cause__, ObjectInUseError) or attempt == 49:
+                raise
+            await asyncio.sleep(0.1)
+
+
 @pytest_asyncio.fixture(scope="session", autouse=True)
 async def setup_test_db():
     """
     Фикстура для настройки тестовой базы данных.
-    - Создаёт таблицы для моделей.
-    - После тестов удаляет таблицы.
+    - Копирует шаблон в БД воркера (settings.POSTGRES_TEST_DB).
+    - После тестов удаляет БД воркера.
     """
-    async with async_engine.begin() as conn:
-        await conn.run_sync(
-            lambda sync_conn: SQLModel.metadata.create_all(
-                bind=sync_conn, checkfirst=True
-            )
-        )
+    await clone_database(settings.POSTGRES_TEST_DB)
 
     yield
 
-    async with async_engine.begin() as conn:
-        await conn.run_sync(
-            lambda sync_conn: SQLModel.metadata.drop_all(bind=sync_conn, checkfirst=True)
-        )
+    await drop_database(settings.POSTGRES_TEST_DB)
+
+
+@pytest_asyncio.fixture(scope="function")
+async def db_transaction(request):
+    """
+    Изолирует тест в транзакции, которая откатывается после теста: сессии
+    приложения работают в одном соединении, а их commit фиксирует только
+    точку сохранения. Тесты с маркером commits работают без изоляции,
+    например когда данные должны быть видны другим соединениям.
+    """
+    if request.node.get_closest_marker("commits"):
+        yield None
+        return
+    connection = await database.async_engine.connect()
+    transaction = await connection.begin()
+    makers = [database.async_session] + [shard.session for shard in database.shards]
+    saved = [dict(maker.kw) for maker in makers]
+    for maker in makers:
+        maker.configure(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield connection
+    finally:
+        for maker, kw in zip(makers, saved):
+            maker.kw.clear()
+            maker.kw.update(kw)
+        await transaction.rollback()
+        await connection.close()
 
 
 @pytest_asyncio.fixture(scope="function")
-async def ac():
+async def ac(db_transaction):
     """Асинхронный HTTP-клиент для тестов"""
+    rate_limit_service().reset()
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
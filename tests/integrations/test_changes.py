@@ -0,0 +1,81 @@
+from httpx import AsyncClient
+import pytest
+
+from .fixtures.base import ac, db_transaction, setup_test_db
+from notifications.routers import change_stream
+from notifications.services import RESYNC_EVENT, ChangeSubscriber, change_listener
+from settings import settings
+
+
+@pytest.mark.asyncio
+@pytest.mark.commits
+async def test_change_notifications_delivered_to_subscriber(ac: AsyncClient):
+    headers = {"Authorization": "Bearer"}
+    try:
+        async with change_listener.subscribe(1) as subscriber:
+            assert await change_listener.wait_ready(5)
+            create_resp = await ac.post(
+                "/api/v1/resumes/", json={"title": "N", "content": "n1"}, headers=headers
+            )
+            resume_id = create_resp.json()["id"]
+            await ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+            events = [await subscriber.get(5), await subscriber.get(5)]
+        assert [(e["type"], e["resume_id"]) for e in events] == [
+            ("resume.created", resume_id),
+            ("resume.improved", resume_id),
+        ]
+        assert change_listener.metrics()["subscribers"] == 0
+    finally:
+        await change_listener.stop()
+    await ac.delete(f"/api/v1/resumes/{resume_id}", headers=headers)
+
+
+@pytest.mark.asyncio
+@pytest.mark.commits
+async def test_batch_improve_notifications_delivered_to_subscriber(ac: AsyncClient):
+    headers = {"Authorization": "Bearer"}
+    ids = []
+    for _ in range(2):
+        response = await ac.post(
+            "/api/v1/resumes/", json={"title": "N", "content": "n"}, headers=headers
+        )
+        ids.append(response.json()["id"])
+    improved = {}
+    try:
+        async with change_listener.subscribe(1) as subscriber:
+            assert await change_listener.wait_ready(5)
+            await ac.post("/api/v1/resumes/improve", json={"ids": ids}, headers=headers)
+            # Уведомления других тестов пользователя пропускаются
+            while len(improved) < len(ids):
+                event = await subscriber.get(5)
+                assert event is not None
+                if event["type"] == "resume.improved" and event["resume_id"] in ids:
+                    improved[event["resume_id"]] = event["version"]
+        assert improved == {resume_id: 2 for resume_id in ids}
+    finally:
+        await change_listener.stop()
+        for resume_id in ids:
+            await ac.delete(f"/api/v1/resumes/{resume_id}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_change_stream_heartbeat_and_overflow(monkeypatch):
+    subscriber = ChangeSubscriber(1, queue_size=2)
+    assert subscriber.push({"type": "resume.updated"})
+    assert subscriber.push({"type": "resume.updated"})
+    assert not subscriber.push({"type": "resume.updated"})
+    assert await subscriber.get(0.1) == RESYNC_EVENT
+    assert await subscriber.get(0.01) is None
+
+    monkeypatch.setattr(settings, "CHANGES_HEARTBEAT_INTERVAL", 0.01)
+    monkeypatch.setattr(change_listener, "start", lambda: None)
+    stream = change_stream(1)
+    assert (await anext(stream)).startswith(b"retry: ")
+    assert await anext(stream) == b": ping\n\n"
+    change_listener.broadcast({"type": "resume.deleted", "user_id": 1, "resume_id": 7})
+    assert await anext(stream) == (
+        b'event: resume.deleted\ndata: {"type":"resume.deleted","user_id":1,'
+        b'"resume_id":7}\n\n'
+    )
+    await stream.aclose()
+    assert change_listener.metrics()["subscribers"] == 0
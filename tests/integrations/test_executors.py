@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import time
+
+from httpx import AsyncClient
+import pytest
+
+from .fixtures.base import ac, db_transaction, setup_test_db
+from settings import settings
+from utils.executors import BoundedExecutor, ExecutorOverloadedError
+from utils.loop_monitor import LoopLagMonitor
+
+
+@pytest.mark.asyncio
+async def test_bounded_executor_rejects_when_full(ac: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "EXECUTOR_QUEUE_TIMEOUT", 0.05)
+    executor = BoundedExecutor("test", "thread", 1, 0)
+    try:
+        results = await asyncio.gather(
+            executor.run(time.sleep, 0.2),
+            executor.run(time.sleep, 0),
+            return_exceptions=True,
+        )
+    finally:
+        executor.shutdown()
+    assert results[0] is None
+    assert isinstance(results[1], ExecutorOverloadedError)
+    assert executor.metrics()["rejected"] == 1
+
+    headers = {"Authorization": "Bearer"}
+    create_resp = await ac.post(
+        "/api/v1/resumes/", json={"title": "E", "content": "e"}, headers=headers
+    )
+    await ac.post(f"/api/v1/resumes/{create_resp.json()['id']}/improve", headers=headers)
+    response = await ac.get("/api/v1/monitoring/worker", headers=headers)
+    assert response.json()["executors"]["improve"]["completed"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_logs_blocking_stack(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "LOOP_LAG_INTERVAL", 0.02)
+    monkeypatch.setattr(settings, "LOOP_SLOW_CALLBACK_THRESHOLD", 0.05)
+    monitor = LoopLagMonitor()
+    with caplog.at_level(logging.WARNING, logger="utils.loop_monitor"):
+        monitor.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.3)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+    snapshot = monitor.histogram.snapshot()
+    assert snapshot["max_ms"] >= 200
+    assert snapshot["buckets_ms"]["+Inf"] == snapshot["count"]
+    records = [r for r in caplog.records if r.name == "utils.loop_monitor"]
+    assert len(records) == 1
+    assert "test_loop_lag_monitor_logs_blocking_stack" in records[0].stack
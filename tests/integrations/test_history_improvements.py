@@ -1,7 +1,19 @@
+import asyncio
+from datetime import datetime, timezone
+
 from httpx import AsyncClient
 import pytest
+from sqlalchemy import delete, text
+from sqlalchemy.exc import InvalidRequestError
 
-from .fixtures.base import ac, setup_test_db
+from .fixtures.base import ac, db_transaction, setup_test_db
+import database
+from database import async_session
+from history_improvements import routers
+from history_improvements.models import history_partition_name
+from resumes.models import Resume
+from settings import settings
+from utils.maintenance import create_partitions, run_maintenance
 
 
 @pytest.mark.asyncio
@@ -55,7 +67,218 @@ async def test_improve_nonexistent_resume(ac: AsyncClient):
     assert data["detail"] == "Резюме не найдено"
 
 
+@pytest.mark.asyncio
+async def test_improve_resume_deleted_during_improve(ac: AsyncClient, monkeypatch):
+    headers = {"Authorization": "Bearer"}
+    create_resp = await ac.post(
+        "/api/v1/resumes/", json={"title": "D", "content": "d"}, headers=headers
+    )
+    resume_id = create_resp.json()["id"]
+
+    async def improve_and_delete(name, func, *args):
+        async with async_session() as session:
+            await session.execute(delete(Resume).where(Resume.id == resume_id))
+            await session.commit()
+        return func(*args)
+
+    monkeypatch.setattr(routers, "run_in_executor", improve_and_delete)
+    response = await ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Резюме не найдено"
+
+
+@pytest.mark.asyncio
+async def test_improve_reads_resume_on_primary(ac: AsyncClient, monkeypatch):
+    headers = {"Authorization": "Bearer"}
+    create_resp = await ac.post(
+        "/api/v1/resumes/", json={"title": "P", "content": "p"}, headers=headers
+    )
+    resume_id = create_resp.json()["id"]
+    replica_reads = []
+
+    async def open_replica():
+        replica_reads.append(True)
+        return None
+
+    monkeypatch.setattr(database.shards[0], "open_replica", open_replica)
+    response = await ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+    assert response.status_code == 200
+    response = await ac.post(
+        "/api/v1/resumes/improve", json={"ids": [resume_id]}, headers=headers
+    )
+    assert response.json()[0]["status"] == "improved"
+    assert replica_reads == []
+
+
 @pytest.mark.asyncio
 async def test_improve_resume_without_token(ac: AsyncClient):
     response = await ac.post("/api/v1/resumes/1/improve")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_improve_resume_idempotency_key(ac: AsyncClient):
+    payload = {"title": "Test Resume", "content": "Original content"}
+    create_resp = await ac.post(
+        "/api/v1/resumes/", json=payload, headers={"Authorization": "Bearer"}
+    )
+    resume_id = create_resp.json()["id"]
+    headers = {"Authorization": "Bearer", "Idempotency-Key": f"improve-{resume_id}"}
+    responses = await asyncio.gather(
+        *[
+            ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+            for _ in range(3)
+        ]
+    )
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.json()["id"] for response in responses}) == 1
+    history = await ac.get(
+        f"/api/v1/resumes/{resume_id}/history_improvements",
+        headers={"Authorization": "Bearer"},
+    )
+    assert len(history.json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_history_retention_keeps_last_improvements(ac: AsyncClient):
+    payload = {"title": "Test Resume", "content": "Original content"}
+    create_resp = await ac.post(
+        "/api/v1/resumes/", json=payload, headers={"Authorization": "Bearer"}
+    )
+    resume_id = create_resp.json()["id"]
+    for _ in range(5):
+        await ac.post(
+            f"/api/v1/resumes/{resume_id}/improve", headers={"Authorization": "Bearer"}
+        )
+    before = await ac.get(
+        f"/api/v1/resumes/{resume_id}/history_improvements",
+        headers={"Authorization": "Bearer"},
+    )
+    report = await run_maintenance(keep_last=2, batch_size=2)
+    after = await ac.get(
+        f"/api/v1/resumes/{resume_id}/history_improvements",
+        headers={"Authorization": "Bearer"},
+    )
+    assert report["resume_improvement_history"] >= 3
+    assert [item["id"] for item in after.json()] == [
+        item["id"] for item in before.json()[:2]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_partitions_moves_rows_from_default(ac: AsyncClient):
+    payload = {"title": "Test Resume", "content": "Original content"}
+    create_resp = await ac.post(
+        "/api/v1/resumes/", json=payload, headers={"Authorization": "Bearer"}
+    )
+    resume_id = create_resp.json()["id"]
+    improve_resp = await ac.post(
+        f"/api/v1/resumes/{resume_id}/improve", headers={"Authorization": "Bearer"}
+    )
+    await create_partitions(months_ahead=1)
+    async with async_session() as session:
+        result = await session.execute(
+            text(
+                "SELECT tableoid::regclass::text FROM resume_improvement_history "
+                "WHERE id = :id"
+            ),
+            {"id": improve_resp.json()["id"]},
+        )
+    month = datetime.now(timezone.utc).date().replace(day=1)
+    assert result.scalar_one() == history_partition_name(month)
+
+
+@pytest.mark.asyncio
+async def test_content_storage_applied_to_partitions(ac: AsyncClient):
+    await create_partitions(months_ahead=1)
+    month = datetime.now(timezone.utc).date().replace(day=1)
+    target = f"toast_tuple_target={settings.CONTENT_TOAST_TUPLE_TARGET}"
+    async with async_session() as session:
+        options = await session.execute(
+            text(
+                "SELECT relname, reloptions FROM pg_class WHERE relname = "
+                "ANY(ARRAY['resumes', :partition, 'resume_improvement_history_default'])"
+            ),
+            {"partition": history_partition_name(month)},
+        )
+        compression = await session.execute(
+            text(
+                "SELECT DISTINCT attcompression FROM pg_attribute "
+                "WHERE attname = 'improved_content' AND attrelid IN ("
+                "'resume_improvement_history'::regclass, "
+                "CAST(:partition AS regclass))"
+            ),
+            {"partition": history_partition_name(month)},
+        )
+    assert {name: target in opts for name, opts in options.all()} == {
+        "resumes": True,
+        history_partition_name(month): True,
+        "resume_improvement_history_default": True,
+    }
+    assert len(compression.all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_improve_resumes_batch(ac: AsyncClient):
+    ids = []
+    for content in ("First content", "Second content"):
+        create_resp = await ac.post(
+            "/api/v1/resumes/",
+            json={"title": "Batch", "content": content},
+            headers={"Authorization": "Bearer"},
+        )
+        ids.append(create_resp.json()["id"])
+    response = await ac.post(
+        "/api/v1/resumes/improve",
+        json={"ids": [ids[1], 999999, ids[0]]},
+        headers={"Authorization": "Bearer"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [(item["resume_id"], item["status"]) for item in data] == [
+        (ids[1], "improved"),
+        (999999, "not_found"),
+        (ids[0], "improved"),
+    ]
+    assert data[0]["improvement"]["improved_content"] == "Second content [Improved]"
+    resume = await ac.get(
+        f"/api/v1/resumes/{ids[0]}", headers={"Authorization": "Bearer"}
+    )
+    assert resume.json()["content"] == "First content [Improved]"
+
+
+@pytest.mark.asyncio
+async def test_get_resume_include_improvements(ac: AsyncClient):
+    create_resp = await ac.post(
+        "/api/v1/resumes/",
+        json={"title": "Test Resume", "content": "Original content"},
+        headers={"Authorization": "Bearer"},
+    )
+    resume_id = create_resp.json()["id"]
+    for _ in range(3):
+        await ac.post(
+            f"/api/v1/resumes/{resume_id}/improve", headers={"Authorization": "Bearer"}
+        )
+    history = await ac.get(
+        f"/api/v1/resumes/{resume_id}/history_improvements",
+        headers={"Authorization": "Bearer"},
+    )
+    response = await ac.get(
+        f"/api/v1/resumes/{resume_id}?include=improvements&improvements_limit=2",
+        headers={"Authorization": "Bearer"},
+    )
+    assert response.status_code == 200
+    assert response.json()["improvements"] == history.json()[:2]
+    plain = await ac.get(
+        f"/api/v1/resumes/{resume_id}", headers={"Authorization": "Bearer"}
+    )
+    assert "improvements" not in plain.json()
+    unknown = await ac.get(
+        f"/api/v1/resumes/{resume_id}?include=versions",
+        headers={"Authorization": "Bearer"},
+    )
+    assert unknown.status_code == 422
+    async with async_session() as session:
+        resume = await session.get(Resume, resume_id)
+        with pytest.raises(InvalidRequestError):
+            resume.improvements
@@ -0,0 +1,76 @@
+import io
+import json
+import logging
+
+from httpx import AsyncClient
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from .fixtures.base import ac, db_transaction, setup_test_db
+from application.main import app
+import database
+from settings import settings
+from utils.auth_service import AuthClient
+from utils.logs import QueueLogHandler
+
+
+@pytest.mark.asyncio
+async def test_public_key_cached_between_requests(monkeypatch):
+    calls = []
+
+    async def fetch_public_key(self):
+        calls.append(1)
+        if len(calls) > 1:
+            raise RuntimeError("Ошибка при получении public key: 503")
+        return "PEM"
+
+    monkeypatch.setattr(AuthClient, "_public_key", None)
+    monkeypatch.setattr(AuthClient, "fetch_public_key", fetch_public_key)
+    assert await AuthClient().get_public_key() == "PEM"
+    assert await AuthClient().get_public_key() == "PEM"
+    assert len(calls) == 1
+    monkeypatch.setattr(settings, "AUTH_PUBLIC_KEY_TTL", 0)
+    assert await AuthClient().get_public_key() == "PEM"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_lifespan_warms_up_and_disposes_engines(ac: AsyncClient, monkeypatch):
+    engine = create_async_engine(settings.DB_URL_testing, pool_size=3)
+    monkeypatch.setattr(database.shards[0], "engine", engine)
+    monkeypatch.setattr(settings, "DB_POOL_WARMUP_CONNECTIONS", 2)
+    async with app.router.lifespan_context(app):
+        assert engine.pool.checkedin() == 2
+    assert engine.pool.checkedin() == 0
+    response = await ac.get("/api/v1/resumes/", headers={"Authorization": "Bearer"})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_request_id_in_structured_logs(ac: AsyncClient, monkeypatch):
+    stream = io.StringIO()
+    handler = QueueLogHandler(stream=stream)
+    logger = logging.getLogger("utils.improve_service")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    monkeypatch.setattr(settings, "LOG_SQL_SAMPLE_RATE", 0.0)
+    try:
+        headers = {"Authorization": "Bearer", "X-Request-ID": "req-42"}
+        create_resp = await ac.post(
+            "/api/v1/resumes/", json={"title": "L", "content": "l"}, headers=headers
+        )
+        assert create_resp.headers["X-Request-ID"] == "req-42"
+        resume_id = create_resp.json()["id"]
+        await ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+        logging.getLogger("sqlalchemy.engine.Engine").warning("SELECT 1")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(r["message"], r["request_id"]) for r in records] == [
+        ("Резюме улучшено", "req-42")
+    ]
+    assert records[0]["chars"] == 1
+
+    response = await ac.get("/api/v1/resumes/", headers={"Authorization": "Bearer"})
+    assert len(response.headers["X-Request-ID"]) == 32
@@ -0,0 +1,82 @@
+from httpx import AsyncClient
+import pytest
+
+from .fixtures.base import ac, db_transaction, setup_test_db
+from rate_limits.repositories import RateLimitsPostgreSQLRepository
+from rate_limits.services import RateLimitExceededError, RateLimitService
+from settings import settings
+
+
+@pytest.mark.asyncio
+async def test_rate_limits(ac: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMITS", {"improve": (2, 60), "write": (60, 60)})
+    headers = {"Authorization": "Bearer"}
+    create_resp = await ac.post(
+        "/api/v1/resumes/", json={"title": "R", "content": "r"}, headers=headers
+    )
+    assert create_resp.headers["RateLimit-Remaining"] == "59"
+    resume_id = create_resp.json()["id"]
+
+    response = await ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Policy"] == "2;w=60"
+    assert response.headers["RateLimit-Limit"] == "2"
+    assert response.headers["RateLimit-Remaining"] == "1"
+    assert response.headers["RateLimit-Reset"] == "30"
+    response = await ac.post(
+        "/api/v1/resumes/improve", json={"ids": [resume_id, 0]}, headers=headers
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+    response = await ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Remaining"] == "0"
+    response = await ac.post(f"/api/v1/resumes/{resume_id}/improve", headers=headers)
+    assert response.status_code == 429
+    ids = [resume_id, resume_id + 1, resume_id + 2]
+    response = await ac.post(
+        "/api/v1/resumes/improve", json={"ids": ids}, headers=headers
+    )
+    assert response.status_code == 422
+    assert "2" in response.json()["detail"]
+
+    response = await ac.get("/api/v1/rate-limits/metrics", headers=headers)
+    assert response.json() == {
+        "backend": "memory",
+        "groups": {
+            "write": {"allowed": 1, "limited": 0, "errors": 0},
+            "improve": {"allowed": 2, "limited": 2, "errors": 0},
+        },
+    }
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", "postgres")
+    workers = [RateLimitService(RateLimitsPostgreSQLRepository) for _ in range(2)]
+    await workers[0].take(1, "improve")
+    decision = await workers[1].take(1, "improve")
+    assert decision.remaining == 0
+    with pytest.raises(RateLimitExceededError):
+        await workers[0].take(1, "improve")
+
+
+@pytest.mark.asyncio
+async def test_idempotent_replay_not_rate_limited(ac: AsyncClient, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMITS", {"improve": (1, 60), "write": (1, 60)})
+    headers = {"Authorization": "Bearer", "Idempotency-Key": "rate-limit-replay"}
+    payload = {"title": "R", "content": "r"}
+    create_resp = await ac.post("/api/v1/resumes/", json=payload, headers=headers)
+    assert create_resp.status_code == 201
+    response = await ac.post("/api/v1/resumes/", json=payload, headers=headers)
+    assert response.status_code == 201
+    assert response.headers["Idempotent-Replayed"] == "true"
+
+    resume_id = create_resp.json()["id"]
+    for _ in range(2):
+        response = await ac.post(
+            f"/api/v1/resumes/{resume_id}/improve", headers=headers
+        )
+        assert response.status_code == 200
+    assert response.headers["Idempotent-Replayed"] == "true"
+    response = await ac.post(
+        f"/api/v1/resumes/{resume_id}/improve", headers={"Authorization": "Bearer"}
+    )
+    assert response.status_code == 429